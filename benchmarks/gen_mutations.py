@@ -0,0 +1,56 @@
+"""
+Times mutation generation on synthetic modules of growing size.
+
+    python benchmarks/gen_mutations.py [--trees]
+
+The time per line should stay flat as modules grow, `--trees` also builds
+the mutated tree of every mutation.
+"""
+import argparse
+import time
+from pathlib import Path
+
+from radiation import Radiation
+from radiation.config import Config
+from radiation.runners import TempDirRunner
+
+FUNCTION = """
+def function_{index}(a, b):
+    if a > {index} and not b:
+        return a * 2 + b - {index}
+    return [a, b, "{index}"]
+"""
+
+
+def _make_module(functions: int) -> str:
+    return "".join(FUNCTION.format(index=index) for index in range(functions))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--trees", action="store_true", help="build mutated trees")
+    args = parser.parse_args()
+
+    radiation = Radiation(
+        config=Config(project_root=Path.cwd()),
+        runner=TempDirRunner(run_command=""),
+    )
+
+    print(f"{'lines':>8} {'mutations':>10} {'seconds':>9} {'us/line':>9}")
+    for functions in (100, 200, 400, 800, 1600):
+        code = _make_module(functions)
+        lines = code.count("\n")
+
+        start = time.perf_counter()
+        count = 0
+        for mutation in radiation.gen_mutations_str(code, "module.py"):
+            if args.trees:
+                mutation.tree
+            count += 1
+        elapsed = time.perf_counter() - start
+
+        print(f"{lines:>8} {count:>10} {elapsed:>9.3f} {elapsed / lines * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
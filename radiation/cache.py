@@ -0,0 +1,129 @@
+import datetime as dt
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from .config import Config
+from .mutation import Mutation, get_mutation_source, get_original_source
+from .source import hash_text
+from .types import ResultStatus, TestsResult
+
+DEFAULT_CACHE_PATH = Path(".radiation") / "results.json"
+
+# timeouts depend on the load of the machine, so they are always retested
+_CACHED_STATUSES = ("survived", "killed", "uncovered")
+
+
+def hash_files(paths: Iterable[Union[str, Path]]) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(map(str, paths)):
+        digest.update(path.encode())
+        digest.update(hashlib.sha256(Path(path).read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def _hash_salt(salt: str) -> str:
+    return hashlib.sha256(salt.encode()).hexdigest()
+
+
+@dataclass
+class ResultCache:
+    """
+    Stores the results of mutations by a hash of the mutated file's content,
+    the mutation's location and replacement, and a salt which should cover
+    whatever else the results depend on (e.g. the tests and the run command).
+    """
+
+    salt: str = ""
+    # key -> (status, duration in seconds, path of the mutated file relative
+    # to the project root, hash of its content)
+    results: Dict[str, Tuple[ResultStatus, float, str, str]] = field(
+        default_factory=dict
+    )
+    _lock: Lock = field(init=False, default_factory=Lock, repr=False, compare=False)
+
+    def get_key(self, mutation: Mutation, *, config: Config) -> str:
+        path = mutation.context.file.path
+        node = mutation.context.node
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    self.salt,
+                    str(path.relative_to(config.project_root)),
+                    get_original_source(mutation).digest,
+                    [
+                        node.lineno,
+                        node.end_lineno,
+                        node.col_offset,
+                        node.end_col_offset,
+                    ],
+                    get_mutation_source(mutation),
+                ]
+            ).encode()
+        ).hexdigest()
+
+    def get(self, mutation: Mutation, *, config: Config) -> Optional[TestsResult]:
+        key = self.get_key(mutation, config=config)
+        with self._lock:
+            if key not in self.results:
+                return None
+            status, duration, *_ = self.results[key]
+        return TestsResult(
+            duration=dt.timedelta(seconds=duration), status=status, cached=True
+        )
+
+    def set(self, mutation: Mutation, result: TestsResult, *, config: Config) -> None:
+        if result.status not in _CACHED_STATUSES:
+            return
+        key = self.get_key(mutation, config=config)
+        path = mutation.context.file.path
+        value = (
+            result.status,
+            result.duration.total_seconds(),
+            str(path.relative_to(config.project_root)),
+            get_original_source(mutation).digest,
+        )
+        with self._lock:
+            self.results[key] = value
+
+    def prune(self, *, config: Config) -> None:
+        """
+        Drops the results of mutations of files which changed or were removed
+        since they were tested, as they can't be reused.
+        """
+        with self._lock:
+            results = dict(self.results)
+        current: Dict[str, Optional[str]] = {}
+        for _, _, path, digest in results.values():
+            if path not in current:
+                file = config.project_root / path
+                current[path] = hash_text(file.read_text()) if file.is_file() else None
+        with self._lock:
+            self.results = {
+                key: value
+                for key, value in results.items()
+                if current[value[2]] == value[3]
+            }
+
+    @classmethod
+    def load(cls, path: Union[str, Path], *, salt: str = "") -> "ResultCache":
+        if not Path(path).exists():
+            return cls(salt=salt)
+        data = json.loads(Path(path).read_text())
+        # results stored with another salt (e.g. before the tests changed)
+        # can't be reused, so they are dropped rather than kept forever
+        if data.get("salt") != _hash_salt(salt):
+            return cls(salt=salt)
+        return cls(
+            salt=salt,
+            results={key: tuple(value) for key, value in data["results"].items()},
+        )
+
+    def save(self, path: Union[str, Path]) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {"salt": _hash_salt(self.salt), "results": self.results}
+            Path(path).write_text(json.dumps(data, sort_keys=True))
@@ -1,4 +1,5 @@
 from ast import AST
+from dataclasses import replace
 
 from .types import Context, NodeContext
 
@@ -15,3 +16,18 @@ def get_context(node: AST, parent_context: Context) -> Context:
             ),
         ),
     )
+
+
+def get_subtree_context(node: AST, context: Context) -> Context:
+    # decorators come before the line their definition starts on
+    decorators = getattr(node, "decorator_list", None)
+    if not decorators:
+        return context
+    return replace(
+        context,
+        node=replace(
+            context.node,
+            lineno=decorators[0].lineno,
+            col_offset=decorators[0].col_offset,
+        ),
+    )
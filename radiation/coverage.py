@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from .config import Config
+from .mutation import Mutation
+
+# appended to the run command (which must be a pytest invocation)
+# to record which tests execute each line
+COVERAGE_ARGS = ("--cov=.", "--cov-context=test", "--cov-report=")
+COVERAGE_FILE = ".radiation.coverage"
+
+
+def _get_test_id(context: str) -> str:
+    # pytest-cov contexts look like "tests/test_a.py::test_b|run"
+    return context.rsplit("|", maxsplit=1)[0]
+
+
+@dataclass
+class CoverageMap:
+    # relative path -> line -> ids of the tests executing it
+    tests: Dict[str, Dict[int, Set[str]]] = field(default_factory=dict)
+    # relative path -> lines executed outside of any test (e.g. on import)
+    outside_tests: Dict[str, Set[int]] = field(default_factory=dict)
+
+    def add(self, path: str, lineno: int, contexts: Iterable[str]) -> None:
+        for context in contexts:
+            if context:
+                self.tests.setdefault(path, {}).setdefault(lineno, set()).add(
+                    _get_test_id(context)
+                )
+            else:
+                self.outside_tests.setdefault(path, set()).add(lineno)
+
+    def get_tests(self, mutation: Mutation, *, config: Config) -> Optional[List[str]]:
+        """
+        Returns the ids of the tests covering the mutation,
+        or None if it may affect any test (e.g. code that runs on import).
+        """
+        path = str(mutation.context.file.path.relative_to(config.project_root))
+        lineno = mutation.context.node.lineno
+        lines = range(lineno, (mutation.context.node.end_lineno or lineno) + 1)
+
+        if any(line in self.outside_tests.get(path, ()) for line in lines):
+            return None
+
+        file_tests = self.tests.get(path, {})
+        return sorted({test for line in lines for test in file_tests.get(line, ())})
+
+    @classmethod
+    def from_data_file(
+        cls, path: Union[str, Path], *, root: Union[str, Path]
+    ) -> CoverageMap:
+        try:
+            from coverage import CoverageData
+        except ImportError as e:
+            raise ImportError(
+                "test selection requires coverage and pytest-cov to be installed"
+            ) from e
+
+        root = Path(root).resolve()
+        data = CoverageData(basename=str(path))
+        data.read()
+
+        coverage_map = cls()
+        for filename in data.measured_files():
+            file_path = Path(filename).resolve()
+            if root not in file_path.parents:
+                continue
+            rel_path = str(file_path.relative_to(root))
+            for lineno, contexts in data.contexts_by_lineno(filename).items():
+                coverage_map.add(rel_path, lineno, contexts)
+        return coverage_map
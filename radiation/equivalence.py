@@ -0,0 +1,117 @@
+import ast
+import warnings
+from ast import AST
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from types import CodeType
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .mutation import Mutation, apply_mutation_on_string, get_original_source
+
+_WITH_DOCSTRING = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+# what a code object does, line tables and positions left out
+_CODE_ATTRS = (
+    "co_argcount",
+    "co_posonlyargcount",
+    "co_kwonlyargcount",
+    "co_nlocals",
+    "co_stacksize",
+    "co_flags",
+    "co_code",
+    "co_names",
+    "co_varnames",
+    "co_freevars",
+    "co_cellvars",
+    "co_name",
+    "co_qualname",
+    "co_exceptiontable",
+)
+
+
+def strip_docstrings(tree: AST) -> None:
+    """
+    Replaces the docstrings in `tree` with `pass`, in place.
+    """
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, _WITH_DOCSTRING)
+            and ast.get_docstring(node, clean=False) is not None
+        ):
+            node.body[0] = ast.copy_location(ast.Pass(), node.body[0])
+
+
+def _get_const_signature(value: Any) -> Hashable:
+    # constants equal to each other (e.g. 1, 1.0 and True, or 0.0 and -0.0)
+    # are compiled to different code
+    if isinstance(value, CodeType):
+        return get_code_signature(value)
+    if isinstance(value, (tuple, frozenset)):
+        return type(value), type(value)(map(_get_const_signature, value))
+    if isinstance(value, (float, complex)):
+        return type(value), repr(value)
+    return type(value), value
+
+
+def get_code_signature(code: CodeType) -> Hashable:
+    """
+    Returns a value that is equal for code objects compiling to the same
+    bytecode, recursively, wherever their source is.
+    """
+    return (
+        tuple(getattr(code, attr, None) for attr in _CODE_ATTRS),
+        tuple(map(_get_const_signature, code.co_consts)),
+    )
+
+
+def get_module_signature(text: str, filename: str) -> Optional[Hashable]:
+    """
+    Returns the signature of the module compiled from `text` with its docstrings
+    stripped, or None if it doesn't compile.
+    """
+    try:
+        tree = ast.parse(text, filename)
+        strip_docstrings(tree)
+        with warnings.catch_warnings():
+            # e.g. SyntaxWarnings, which are reported when the tests run anyway
+            warnings.simplefilter("ignore")
+            # asserts and `if __debug__:` would be compiled out under -O
+            code = compile(tree, filename, "exec", optimize=0)
+            return get_code_signature(code)
+    except (SyntaxError, ValueError):
+        return None
+
+
+@dataclass
+class EquivalenceChecker:
+    """
+    Finds mutations which can't be killed since the mutated module compiles to
+    the same bytecode as the original one, e.g. changes to docstrings or to
+    expressions the compiler folds into the same constant.
+    """
+
+    # path -> (source, signature) of the original files
+    _originals: Dict[Path, Tuple[str, Optional[Hashable]]] = field(
+        init=False, default_factory=dict, repr=False, compare=False
+    )
+    _lock: Lock = field(init=False, default_factory=Lock, repr=False, compare=False)
+
+    def _get_original_signature(self, path: Path, text: str) -> Optional[Hashable]:
+        with self._lock:
+            cached = self._originals.get(path)
+        if cached and cached[0] == text:
+            return cached[1]
+        signature = get_module_signature(text, str(path))
+        with self._lock:
+            self._originals[path] = (text, signature)
+        return signature
+
+    def is_equivalent(self, mutation: Mutation) -> bool:
+        path = mutation.context.file.path
+        source = get_original_source(mutation)
+        original = self._get_original_signature(path, source.text)
+        if original is None:
+            return False
+        mutated = apply_mutation_on_string(source, mutation)
+        return get_module_signature(mutated, str(path)) == original
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Pattern, Sequence, Union
+
+
+def _translate_segment(segment: str) -> str:
+    parts = []
+    index = 0
+    while index < len(segment):
+        char = segment[index]
+        if char == "\\" and index + 1 < len(segment):
+            parts.append(re.escape(segment[index + 1]))
+            index += 1
+        elif char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[" and (end := segment.find("]", index + 2)) != -1:
+            content = segment[index + 1 : end]
+            if content[0] == "!":
+                content = "^" + content[1:]
+            parts.append(f"[{content}]")
+            index = end
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return "".join(parts)
+
+
+@dataclass(frozen=True)
+class IgnorePattern:
+    """
+    A `.gitignore`-style pattern, matched against paths relative to the root.
+    """
+
+    regex: Pattern[str]
+    negated: bool = False
+    dir_only: bool = False
+
+    @classmethod
+    def parse(cls, pattern: str) -> Optional[IgnorePattern]:
+        pattern = pattern.rstrip()
+        if not pattern or pattern.startswith("#"):
+            return None
+        negated = pattern.startswith("!")
+        pattern = pattern[1:] if negated else pattern
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        # patterns with a slash are relative to the root, others match at any depth
+        anchored = "/" in pattern
+        segments = pattern.lstrip("/").split("/")
+
+        body = "" if anchored else "(?:.*/)?"
+        for index, segment in enumerate(segments):
+            last = index == len(segments) - 1
+            if segment == "**":
+                body += ".*" if last else "(?:.*/)?"
+            else:
+                body += _translate_segment(segment) + ("" if last else "/")
+        return cls(re.compile(f"^{body}$"), negated=negated, dir_only=dir_only)
+
+
+@dataclass(frozen=True)
+class IgnorePatterns:
+    patterns: Sequence[IgnorePattern] = ()
+
+    @classmethod
+    def parse(cls, patterns: Sequence[str]) -> IgnorePatterns:
+        return cls([parsed for p in patterns if (parsed := IgnorePattern.parse(p))])
+
+    def match(self, path: str, *, is_dir: bool) -> bool:
+        """
+        Whether `path` itself is ignored, the last matching pattern wins.
+        """
+        ignored = False
+        for pattern in self.patterns:
+            if pattern.dir_only and not is_dir:
+                continue
+            if pattern.regex.match(path):
+                ignored = not pattern.negated
+        return ignored
+
+    def match_with_parents(self, path: str, *, is_dir: bool) -> bool:
+        parts = path.split("/")
+        return any(
+            self.match("/".join(parts[:index]), is_dir=True)
+            for index in range(1, len(parts))
+        ) or self.match(path, is_dir=is_dir)
+
+
+def escape(path: str, *, glob: bool = False) -> str:
+    """
+    Returns a pattern matching `path` relative to the root, and so everything
+    under it. Unless `glob` is set, wildcards in `path` are taken literally.
+    """
+    path = os.path.normpath(path).replace(os.sep, "/").strip("/")
+    if path == ".":
+        return "*"
+    return "/" + (path if glob else re.sub(r"([*?\[\\])", r"\\\1", path))
+
+
+def _walk(
+    directory: str, prefix: str, extension: str, ignore: IgnorePatterns
+) -> Iterator[Path]:
+    with os.scandir(directory) as entries:
+        sorted_entries = sorted(entries, key=lambda entry: entry.name)
+
+    for entry in sorted_entries:
+        if entry.name.startswith("."):
+            continue
+        relative = prefix + entry.name
+        is_dir = entry.is_dir()
+        if ignore.match(relative, is_dir=is_dir):
+            continue
+        if is_dir:
+            yield from _walk(entry.path, relative + "/", extension, ignore)
+        elif entry.name.endswith(extension):
+            yield Path(entry.path)
+
+
+def walk_files(
+    directory: Union[str, Path],
+    *,
+    root: Union[str, Path],
+    extension: str = ".py",
+    ignore: IgnorePatterns = IgnorePatterns(),
+) -> Iterator[Path]:
+    """
+    Yields the files under `directory` in a depth-first walk, sorted by name
+    within each directory. Hidden entries are skipped, and ignored directories
+    are not entered.
+    """
+    prefix = os.path.relpath(directory, root).replace(os.sep, "/")
+    yield from _walk(
+        str(directory), "" if prefix == "." else prefix + "/", extension, ignore
+    )
+
+
+def git_ls_files(root: Union[str, Path]) -> List[str]:
+    """
+    Returns the files git knows about under `root`, tracked or untracked and
+    not ignored, relative to `root` and in the order `walk_files` visits them.
+    """
+    completed_process = subprocess.run(
+        ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=root,
+    )
+    # a file is listed once per stage when it has merge conflicts
+    paths = set(filter(None, completed_process.stdout.split("\0")))
+    return sorted(paths, key=lambda path: path.split("/"))
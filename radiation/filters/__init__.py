@@ -1,12 +1,27 @@
-from typing import Callable, List, Sequence
+from typing import Callable, Iterable, List, Sequence
 
 from ..config import Config
 from ..mutation import Mutation
+from ..types import Context
 
 MutantFilter = Callable[[Mutation, Config], bool]
+SubtreePredicate = Callable[[Context, Config], bool]
 
 builtin_filters: List[MutantFilter] = []
 
 
 def get_default_filters() -> Sequence[MutantFilter]:
     return builtin_filters.copy()
+
+
+def get_subtree_predicates(filters: Iterable[MutantFilter]) -> List[SubtreePredicate]:
+    """
+    Returns the `may_contain` methods of the filters that have one. Given the
+    context of a node, it tells whether the filter may accept any of the node's
+    mutations or its descendants', so the node is skipped when it doesn't.
+    """
+    return [
+        filter_fn.may_contain  # type: ignore
+        for filter_fn in filters
+        if hasattr(filter_fn, "may_contain")
+    ]
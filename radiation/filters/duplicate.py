@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+from dataclasses import dataclass, field
+from textwrap import dedent
+from typing import Set
+
+from ..config import Config
+from ..mutation import Mutation, get_mutation_source
+
+
+def normalize_source(source: str) -> str:
+    """
+    Returns a dump of the AST of `source`, the same for any formatting of it,
+    or `source` itself if it doesn't parse on its own.
+    """
+    # parenthesized so expressions spanning several lines parse
+    for text, mode in [(f"(\n{source}\n)", "eval"), (dedent(source), "exec")]:
+        try:
+            return ast.dump(ast.parse(text, mode=mode))
+        except SyntaxError:
+            continue
+    return source
+
+
+def get_mutation_hash(mutation: Mutation, config: Config) -> bytes:
+    """
+    Returns a hash of the mutation's file, span and normalized replacement,
+    which is the same for mutations making the same change.
+    """
+    node = mutation.context.node
+    return hashlib.sha256(
+        json.dumps(
+            [
+                mutation.context.file.path.relative_to(config.project_root).as_posix(),
+                [node.lineno, node.end_lineno, node.col_offset, node.end_col_offset],
+                normalize_source(get_mutation_source(mutation)),
+            ]
+        ).encode()
+    ).digest()
+
+
+@dataclass
+class DuplicateFilter:
+    """
+    Keeps the first of the mutations making the same change, e.g. different
+    mutators rewriting a node into the same source.
+    """
+
+    removed: int = field(init=False, default=0)
+    _seen: Set[bytes] = field(init=False, default_factory=set, repr=False)
+
+    def __call__(self, mutation: Mutation, config: Config) -> bool:
+        key = get_mutation_hash(mutation, config)
+        if key in self._seen:
+            self.removed += 1
+            return False
+        self._seen.add(key)
+        return True
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from ..config import Config
+from ..mutation import Mutation
+from ..types import Context
+
+# sorted, disjoint (first, last) ranges of lines
+LineIntervals = List[Tuple[int, int]]
+
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> LineIntervals:
+    merged: LineIntervals = []
+    for first, last in sorted(intervals):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(last, merged[-1][1]))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def overlaps(intervals: LineIntervals, lineno: int, end_lineno: int) -> bool:
+    # the first interval that doesn't end before `lineno`
+    index = bisect_left(intervals, (lineno, lineno))
+    if index > 0 and intervals[index - 1][1] >= lineno:
+        index -= 1
+    return index < len(intervals) and intervals[index][0] <= end_lineno
+
+
+def context_overlaps(
+    context: Context, files: Dict[str, LineIntervals], config: Config
+) -> bool:
+    path = str(context.file.path.relative_to(config.project_root))
+    intervals = files.get(path)
+    lineno = context.node.lineno
+    end_lineno = context.node.end_lineno or lineno
+    return intervals is not None and overlaps(intervals, lineno, end_lineno)
+
+
+@dataclass
+class LineRangeFilter:
+    """
+    Only keeps mutations on the given lines,
+    by path relative to the project root.
+    """
+
+    ranges: Dict[str, LineIntervals]
+
+    def __post_init__(self) -> None:
+        self.ranges = {
+            path: merge_intervals(intervals) for path, intervals in self.ranges.items()
+        }
+
+    def __call__(self, mutation: Mutation, config: Config) -> bool:
+        return self.may_contain(mutation.context, config)
+
+    def may_contain(self, context: Context, config: Config) -> bool:
+        return context_overlaps(context, self.ranges, config)
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[str]) -> LineRangeFilter:
+        """
+        Takes ranges written as `path:first-last` or `path:line`.
+        """
+        ranges: Dict[str, LineIntervals] = {}
+        for spec in specs:
+            match = re.fullmatch(r"(.+):(\d+)(?:-(\d+))?", spec)
+            if match is None:
+                raise ValueError(f"invalid line range: {spec!r}")
+            path, first, last = match.groups()
+            ranges.setdefault(path, []).append((int(first), int(last or first)))
+        return cls(ranges)
@@ -1,43 +1,53 @@
 from __future__ import annotations
 
 import subprocess
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, Iterable, Optional, Union
 
 from whatthepatch import parse_patch
 from whatthepatch.patch import Change
 
 from ..config import Config
 from ..mutation import Mutation
+from ..types import Context
+from .line_range import LineIntervals, context_overlaps, merge_intervals, overlaps
 
 
-def is_mutation_in_diff(mutation: Mutation, file_changes: List[Change]) -> bool:
-    lineno = mutation.context.node.lineno
-    end_lineno = mutation.context.node.end_lineno or lineno
-
-    return any(
-        lineno <= change.new <= end_lineno
+def get_added_lines(file_changes: Iterable[Change]) -> LineIntervals:
+    return merge_intervals(
+        (change.new, change.new)
         for change in file_changes
         if change.new is not None and change.old is None
     )
 
 
+def is_mutation_in_diff(mutation: Mutation, intervals: LineIntervals) -> bool:
+    lineno = mutation.context.node.lineno
+    end_lineno = mutation.context.node.end_lineno or lineno
+    return overlaps(intervals, lineno, end_lineno)
+
+
 @dataclass
 class PatchFilter:
     patch: str
+    # the added lines of each file in the patch, by path
+    _files: Dict[str, LineIntervals] = field(
+        init=False, default_factory=dict, repr=False, compare=False
+    )
 
-    def __call__(self, mutation: Mutation, config: Config) -> bool:
-        mutation_path = str(mutation.context.file.path.relative_to(config.project_root))
-
+    def __post_init__(self) -> None:
         for diff in parse_patch(self.patch):
             if diff.header is None or diff.changes is None:
                 continue
-            if diff.header.new_path != mutation_path:
-                continue
-            return is_mutation_in_diff(mutation, diff.changes)
+            # only the first diff of a file counts
+            self._files.setdefault(diff.header.new_path, get_added_lines(diff.changes))
+
+    def __call__(self, mutation: Mutation, config: Config) -> bool:
+        return self.may_contain(mutation.context, config)
 
-        return False
+    def may_contain(self, context: Context, config: Config) -> bool:
+        return context_overlaps(context, self._files, config)
 
     @classmethod
     def from_shell_command(
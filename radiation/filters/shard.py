@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable, List
+
+from ..config import Config
+from ..mutation import Mutation
+
+
+def get_shard_key(mutation: Mutation, config: Config) -> str:
+    node = mutation.context.node
+    path = mutation.context.file.path.relative_to(config.project_root).as_posix()
+    span = f"{node.lineno}:{node.col_offset}-{node.end_lineno}:{node.end_col_offset}"
+    return f"{path}\0{span}\0{mutation.mutator}"
+
+
+@dataclass(frozen=True)
+class ShardFilter:
+    """
+    Keeps the mutations of one of `count` shards, chosen by a hash of their
+    file, span and mutator so every machine agrees on it without coordinating.
+    Shards are numbered from 1.
+    """
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.index <= self.count:
+            raise ValueError(f"shard {self.index} is not between 1 and {self.count}")
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def __call__(self, mutation: Mutation, config: Config) -> bool:
+        digest = hashlib.sha256(get_shard_key(mutation, config).encode()).digest()
+        return int.from_bytes(digest[:8], "big") % self.count == self.index - 1
+
+    @classmethod
+    def parse(cls, spec: str) -> ShardFilter:
+        """
+        Takes a shard written as `index/count`, e.g. `1/8`.
+        """
+        index, _, count = spec.partition("/")
+        if not index.isdigit() or not count.isdigit():
+            raise ValueError(f"invalid shard: {spec!r}, expected e.g. 1/8")
+        return cls(int(index), int(count))
+
+
+def get_missing_shards(shards: Iterable[ShardFilter]) -> List[ShardFilter]:
+    """
+    Returns the shards missing from `shards`, for each shard count in it.
+    """
+    present = set(shards)
+    return [
+        ShardFilter(index, count)
+        for count in sorted({shard.count for shard in present})
+        for index in range(1, count + 1)
+        if ShardFilter(index, count) not in present
+    ]
@@ -1,39 +1,59 @@
 from ast import AST, boolop, cmpop, expr_context, iter_fields, operator, unaryop
-from copy import copy, deepcopy
-from typing import Iterator, Sequence
+from typing import Callable, Iterator, Optional, Sequence, Union
 
-from .context import get_context
+from .context import get_context, get_subtree_context
 from .mutation import Mutation
-from .mutators import Mutator
+from .mutators import Mutator, MutatorTable, get_mutator_id
 from .types import Context
 
 SKIP_CLASSES = (operator, boolop, cmpop, unaryop, expr_context)
 
 
 def gen_mutations(
-    node: AST, *, parent_context: Context, mutators: Sequence[Mutator]
+    node: AST,
+    *,
+    parent_context: Context,
+    mutators: Union[Sequence[Mutator], MutatorTable],
+    may_contain: Optional[Callable[[Context], bool]] = None,
 ) -> Iterator[Mutation]:
+    """
+    Yields the mutations of `node` and its descendants. Nodes whose context
+    `may_contain` rejects are skipped along with their descendants.
+    """
+    if not isinstance(mutators, MutatorTable):
+        mutators = MutatorTable(mutators)
+
     context = get_context(node, parent_context)
+    if (
+        may_contain is not None
+        and hasattr(node, "lineno")
+        and not may_contain(get_subtree_context(node, context))
+    ):
+        return
     for name, field in iter_fields(node):
         if isinstance(field, SKIP_CLASSES):
             continue
         if isinstance(field, AST):
             for mutation in gen_mutations(
-                field, parent_context=context, mutators=mutators
+                field,
+                parent_context=context,
+                mutators=mutators,
+                may_contain=may_contain,
             ):
-                new_node = copy(node)
-                setattr(new_node, name, mutation.tree)
-                yield mutation.with_tree(new_node)
+                yield mutation.within(node, name)
         elif isinstance(field, list):
             for index, item in enumerate(field):
                 if isinstance(item, SKIP_CLASSES):
                     continue
                 if isinstance(item, AST):
                     for mutation in gen_mutations(
-                        item, parent_context=context, mutators=mutators
+                        item,
+                        parent_context=context,
+                        mutators=mutators,
+                        may_contain=may_contain,
                     ):
-                        new_node = deepcopy(node)
-                        getattr(new_node, name)[index] = mutation.tree
-                        yield mutation.with_tree(new_node)
-    for mutator in mutators:
-        yield from mutator(node, context)
+                        yield mutation.within(node, name, index)
+    for mutator in mutators.get(type(node)):
+        for mutation in mutator(node, context):
+            mutation.mutator = mutation.mutator or get_mutator_id(mutator)
+            yield mutation
@@ -0,0 +1,84 @@
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from .config import Config
+from .mutation import Mutation
+
+DEFAULT_HISTORY_PATH = Path(".radiation") / "history.json"
+
+# kills recorded up to this many lines away from a mutation count towards it,
+# weighted by how close they are
+NEARBY_LINES = 5
+
+# pytest's short test summary, e.g. "FAILED test_a.py::test_b - assert 1 == 2"
+_FAILED_TEST = re.compile(r"^(?:FAILED|ERROR) (\S+?)(?: - .*)?$", re.MULTILINE)
+
+
+def get_failed_tests(output: Optional[str]) -> List[str]:
+    return list(dict.fromkeys(_FAILED_TEST.findall(output or "")))
+
+
+@dataclass
+class KillHistory:
+    # relative path -> line -> test id -> number of mutants it killed there
+    kills: Dict[str, Dict[int, Dict[str, int]]] = field(default_factory=dict)
+    _lock: Lock = field(init=False, default_factory=Lock, repr=False, compare=False)
+
+    def record(
+        self, mutation: Mutation, tests: Iterable[str], *, config: Config
+    ) -> None:
+        path = str(mutation.context.file.path.relative_to(config.project_root))
+        with self._lock:
+            line_kills = self.kills.setdefault(path, {}).setdefault(
+                mutation.context.node.lineno, {}
+            )
+            for test in tests:
+                line_kills[test] = line_kills.get(test, 0) + 1
+
+    def get_scores(self, mutation: Mutation, *, config: Config) -> Dict[str, float]:
+        path = str(mutation.context.file.path.relative_to(config.project_root))
+        lineno = mutation.context.node.lineno
+        scores: Dict[str, float] = {}
+        with self._lock:
+            file_kills = self.kills.get(path, {})
+            for line in range(lineno - NEARBY_LINES, lineno + NEARBY_LINES + 1):
+                for test, count in file_kills.get(line, {}).items():
+                    scores[test] = scores.get(test, 0) + count / (
+                        1 + abs(line - lineno)
+                    )
+        return scores
+
+    def get_killers(self, mutation: Mutation, *, config: Config) -> List[str]:
+        """
+        Returns the tests that killed mutants near the mutation,
+        the most likely to kill it first.
+        """
+        scores = self.get_scores(mutation, config=config)
+        return sorted(scores, key=lambda test: -scores[test])
+
+    def prioritize(
+        self, tests: Sequence[str], mutation: Mutation, *, config: Config
+    ) -> List[str]:
+        scores = self.get_scores(mutation, config=config)
+        return sorted(tests, key=lambda test: -scores.get(test, 0))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "KillHistory":
+        if not Path(path).exists():
+            return cls()
+        data = json.loads(Path(path).read_text())
+        return cls(
+            kills={
+                file_path: {int(line): tests for line, tests in lines.items()}
+                for file_path, lines in data.items()
+            }
+        )
+
+    def save(self, path: Union[str, Path]) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            Path(path).write_text(json.dumps(self.kills, indent=2, sort_keys=True))
@@ -0,0 +1,138 @@
+import datetime as dt
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .config import Config
+from .mutation import Mutation, get_mutation_source, get_original_source
+from .source import hash_text
+from .types import ResultStatus, TestsResult
+
+DEFAULT_JOURNAL_PATH = Path(".radiation") / "journal.jsonl"
+
+# (path, lineno, end_lineno, col_offset, end_col_offset, replacement, digest)
+JournalKey = Tuple[str, int, Optional[int], int, Optional[int], str, str]
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """
+    A tested mutation, described without its AST so it can be matched
+    against regenerated mutations and read without the project.
+    """
+
+    path: str
+    lineno: int
+    end_lineno: Optional[int]
+    col_offset: int
+    end_col_offset: Optional[int]
+    replacement: str
+    # sha256 of the original file's content
+    digest: str
+    status: ResultStatus
+    duration: float
+    mutator: Optional[str] = None
+    # the shard (e.g. "1/8") of a sharded run
+    shard: Optional[str] = None
+
+    @property
+    def key(self) -> JournalKey:
+        return (
+            self.path,
+            self.lineno,
+            self.end_lineno,
+            self.col_offset,
+            self.end_col_offset,
+            self.replacement,
+            self.digest,
+        )
+
+    def to_result(self) -> TestsResult:
+        return TestsResult(
+            duration=dt.timedelta(seconds=self.duration), status=self.status
+        )
+
+
+def get_digest(path: Path) -> str:
+    return hash_text(path.read_text())
+
+
+def read_journal(path: Union[str, Path]) -> Iterator[JournalEntry]:
+    with open(path) as journal_file:
+        for line in journal_file:
+            try:
+                yield JournalEntry(**json.loads(line))
+            except ValueError:
+                # the last line is cut short if the run was killed while writing it
+                continue
+
+
+def write_journal(path: Union[str, Path], entries: Iterable[JournalEntry]) -> None:
+    Path(path).write_text(
+        "".join(json.dumps(asdict(entry)) + "\n" for entry in entries)
+    )
+
+
+@dataclass
+class Journal:
+    """
+    Appends each result to a file as soon as it's known,
+    so an interrupted run can be resumed.
+    """
+
+    path: Path
+    entries: Dict[JournalKey, JournalEntry] = field(default_factory=dict)
+    shard: Optional[str] = None
+
+    @classmethod
+    def create(
+        cls, path: Union[str, Path], *, shard: Optional[str] = None
+    ) -> "Journal":
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text("")
+        return cls(path=Path(path), shard=shard)
+
+    @classmethod
+    def resume(
+        cls, path: Union[str, Path], *, shard: Optional[str] = None
+    ) -> "Journal":
+        if not Path(path).exists():
+            return cls.create(path, shard=shard)
+        entries = {entry.key: entry for entry in read_journal(path)}
+        # rewritten so an entry cut short doesn't run into the next one
+        write_journal(path, entries.values())
+        return cls(path=Path(path), entries=entries, shard=shard)
+
+    def _to_entry(
+        self, mutation: Mutation, result: TestsResult, *, config: Config
+    ) -> JournalEntry:
+        path = mutation.context.file.path
+        node = mutation.context.node
+        return JournalEntry(
+            path=str(path.relative_to(config.project_root)),
+            lineno=node.lineno,
+            end_lineno=node.end_lineno,
+            col_offset=node.col_offset,
+            end_col_offset=node.end_col_offset,
+            replacement=get_mutation_source(mutation),
+            digest=get_original_source(mutation).digest,
+            status=result.status,
+            duration=result.duration.total_seconds(),
+            mutator=mutation.mutator,
+            shard=self.shard,
+        )
+
+    def get(self, mutation: Mutation, *, config: Config) -> Optional[TestsResult]:
+        placeholder = TestsResult(duration=dt.timedelta(), status="survived")
+        key = self._to_entry(mutation, placeholder, config=config).key
+        entry = self.entries.get(key)
+        return entry.to_result() if entry else None
+
+    def append(
+        self, mutation: Mutation, result: TestsResult, *, config: Config
+    ) -> None:
+        entry = self._to_entry(mutation, result, config=config)
+        self.entries[entry.key] = entry
+        with open(self.path, "a") as journal_file:
+            journal_file.write(json.dumps(asdict(entry)) + "\n")
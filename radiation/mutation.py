@@ -1,47 +1,150 @@
 from __future__ import annotations
 
 from ast import AST
-from dataclasses import dataclass
+from copy import copy
 from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
 
-from astunparse import unparse
-
+from radiation.source import SourceLines, unparse
 from radiation.types import Context
 
+# a step from a node to one of its children: (field name, index in a list field)
+PathStep = Tuple[str, Optional[int]]
+
+
+def _rebuild(root: AST, path: Sequence[PathStep], leaf: AST) -> AST:
+    # only the nodes (and lists) on the path are copied,
+    # everything else is shared with the unmutated tree
+    if not path:
+        return leaf
+    (name, index), rest = path[0], path[1:]
+    new_root = copy(root)
+    if index is None:
+        setattr(new_root, name, _rebuild(getattr(root, name), rest, leaf))
+    else:
+        items = list(getattr(root, name))
+        items[index] = _rebuild(items[index], rest, leaf)
+        setattr(new_root, name, items)
+    return new_root
+
 
-@dataclass
 class Mutation:
-    tree: AST
-    node: AST
-    context: Context
+    """
+    A mutated node, where it is and which mutator produced it.
+
+    The whole mutated tree is only built when `tree` is accessed, from the
+    unmutated root and the path from it to the mutated node. It shares every
+    node off that path with the unmutated tree, so it must not be modified.
+    """
+
+    __slots__ = (
+        "node",
+        "context",
+        "mutator",
+        "source",
+        "_tree",
+        "_root",
+        "_path",
+        "_subtree",
+    )
+
+    def __init__(
+        self,
+        tree: Optional[AST],
+        node: AST,
+        context: Context,
+        mutator: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> None:
+        self.node = node
+        self.context = context
+        self.mutator = mutator
+        # the replacement source of the node, if the mutator produced it
+        self.source = source
+        self._tree = tree
+        self._root: Optional[AST] = None
+        self._path: Tuple[PathStep, ...] = ()
+        # the mutated tree at the end of the path
+        self._subtree = tree
+
+    @property
+    def tree(self) -> AST:
+        if self._tree is None:
+            assert self._root is not None and self._subtree is not None
+            self._tree = _rebuild(self._root, self._path, self._subtree)
+        return self._tree
+
+    def __getstate__(self) -> Tuple[object, ...]:
+        # a lazily built tree is left out, the unmutated root is shared with
+        # every other mutation of the file pickled along with this one
+        tree = self._tree if self._root is None else None
+        return (
+            self.node,
+            self.context,
+            self.mutator,
+            self.source,
+            tree,
+            self._root,
+            self._path,
+            self._subtree,
+        )
+
+    def __setstate__(self, state: Tuple[object, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        return (
+            f"Mutation(node={get_mutation_source(self)!r}, "
+            f"context={self.context!r}, mutator={self.mutator!r})"
+        )
 
     @staticmethod
-    def from_node(node: AST, context: Context) -> Mutation:
-        return Mutation(node, node, context)
+    def from_node(
+        node: AST, context: Context, source: Optional[str] = None
+    ) -> Mutation:
+        return Mutation(node, node, context, source=source)
 
     def with_tree(self, tree: AST) -> Mutation:
-        return Mutation(tree, self.node, self.context)
+        return Mutation(tree, self.node, self.context, self.mutator, self.source)
+
+    def within(self, parent: AST, name: str, index: Optional[int] = None) -> Mutation:
+        """
+        Returns the mutation as seen from `parent`, whose field `name`
+        (at `index` for list fields) contains the mutated tree.
+        """
+        mutation = Mutation(None, self.node, self.context, self.mutator, self.source)
+        mutation._root = parent
+        mutation._path = ((name, index), *self._path)
+        mutation._subtree = self._subtree
+        return mutation
+
 
+def get_mutation_source(mutation: Mutation) -> str:
+    if mutation.source is not None:
+        return mutation.source
+    return unparse(mutation.node)
 
-def apply_mutation_on_string(text: str, mutation: Mutation) -> str:
-    lines = text.splitlines()
-    lineno = mutation.context.node.lineno
-    col_offset = mutation.context.node.col_offset
-    end_lineno = mutation.context.node.end_lineno or lineno
-    end_col_offset = mutation.context.node.end_col_offset
 
-    start_of_line = lines[lineno - 1][:col_offset]
-    end_of_line = lines[end_lineno - 1][end_col_offset:]
+def apply_mutation_on_string(text: Union[str, SourceLines], mutation: Mutation) -> str:
+    source = text if isinstance(text, SourceLines) else SourceLines(text)
+    node = mutation.context.node
+    start, end = source.span(
+        node.lineno, node.col_offset, node.end_lineno, node.end_col_offset
+    )
+    return source.splice(start, end, get_mutation_source(mutation))
 
-    mutated_lines = [
-        *lines[: lineno - 1],
-        start_of_line + unparse(mutation.node).strip("\n") + end_of_line,
-        *lines[end_lineno:],
-    ]
 
-    return "\n".join(mutated_lines)
+def get_original_source(mutation: Mutation) -> SourceLines:
+    """
+    Returns the source of the mutated file, as it was read for generation if
+    available, rather than reading it again.
+    """
+    file = mutation.context.file
+    return file.source or SourceLines(file.path.read_text())
 
 
 def apply_mutation_on_disk(path: Path, mutation: Mutation) -> None:
-    mutated = apply_mutation_on_string(path.read_text(), mutation)
+    # `path` is the mutated file or a copy of it
+    mutated = apply_mutation_on_string(get_original_source(mutation), mutation)
     path.write_text(mutated)
@@ -1,17 +1,13 @@
-from ast import AST
-from typing import Callable, Iterable, Sequence
+from typing import Sequence
 
-from ..mutation import Mutation
-from ..types import Context
 from .binops import switch_bin_ops
 from .boolops import switch_bool_ops
 from .compare import switch_compare_ops
 from .constants import modify_constants
+from .dispatch import Mutator, MutatorTable, handles
 from .invert import invert
 from .unaryops import switch_unary_ops
 
-Mutator = Callable[[AST, Context], Iterable[Mutation]]
-
 builtin_mutators = [
     switch_bin_ops,
     switch_bool_ops,
@@ -22,5 +18,9 @@ builtin_mutators = [
 ]
 
 
+def get_mutator_id(mutator: Mutator) -> str:
+    return getattr(mutator, "__name__", type(mutator).__name__)
+
+
 def get_default_mutators() -> Sequence[Mutator]:
     return builtin_mutators.copy()
@@ -3,7 +3,9 @@ from ast import AST, BinOp, operator
 from typing import Dict, Iterator, Type
 
 from ..mutation import Mutation
+from ..source import replace_tokens
 from ..types import Context
+from .dispatch import handles
 
 MAPPING: Dict[Type[operator], Type[operator]] = {
     ast.Add: ast.Sub,
@@ -13,13 +15,29 @@ MAPPING: Dict[Type[operator], Type[operator]] = {
     ast.FloorDiv: ast.Div,
 }
 
+TOKENS: Dict[Type[operator], str] = {
+    ast.Add: "+",
+    ast.Sub: "-",
+    ast.Mult: "*",
+    ast.Div: "/",
+    ast.FloorDiv: "//",
+}
+
 
 def _switch_op(op: operator) -> operator:
     return MAPPING[type(op)]()
 
 
+@handles(BinOp)
 def switch_bin_ops(node: AST, context: Context) -> Iterator[Mutation]:
     if isinstance(node, BinOp) and type(node.op) in MAPPING:
+        new_op = _switch_op(node.op)
         yield Mutation.from_node(
-            BinOp(left=node.left, op=_switch_op(node.op), right=node.right), context
+            BinOp(left=node.left, op=new_op, right=node.right),
+            context,
+            source=replace_tokens(
+                context.file.source,
+                node,
+                [(node.left, node.right, TOKENS[type(node.op)], TOKENS[type(new_op)])],
+            ),
         )
@@ -3,20 +3,38 @@ from ast import AST, BoolOp, boolop
 from typing import Dict, Iterator, Type
 
 from ..mutation import Mutation
+from ..source import replace_tokens
 from ..types import Context
+from .dispatch import handles
 
 MAPPING: Dict[Type[boolop], Type[boolop]] = {
     ast.Or: ast.And,
     ast.And: ast.Or,
 }
 
+TOKENS: Dict[Type[boolop], str] = {
+    ast.Or: "or",
+    ast.And: "and",
+}
+
 
 def _switch_op(op: boolop) -> boolop:
     return MAPPING[type(op)]()
 
 
+@handles(BoolOp)
 def switch_bool_ops(node: AST, context: Context) -> Iterator[Mutation]:
     if isinstance(node, BoolOp) and type(node.op) in MAPPING:
+        new_op = _switch_op(node.op)
         yield Mutation.from_node(
-            BoolOp(values=node.values, op=_switch_op(node.op)), context
+            BoolOp(values=node.values, op=new_op),
+            context,
+            source=replace_tokens(
+                context.file.source,
+                node,
+                [
+                    (before, after, TOKENS[type(node.op)], TOKENS[type(new_op)])
+                    for before, after in zip(node.values, node.values[1:])
+                ],
+            ),
         )
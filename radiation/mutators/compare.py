@@ -4,7 +4,9 @@ from copy import deepcopy
 from typing import Dict, Iterable, Iterator, Type
 
 from ..mutation import Mutation
+from ..source import replace_tokens
 from ..types import Context
+from .dispatch import handles
 
 MAPPING: Dict[Type[cmpop], Iterable[Type[cmpop]]] = {
     ast.In: (ast.NotIn,),
@@ -19,18 +21,42 @@ MAPPING: Dict[Type[cmpop], Iterable[Type[cmpop]]] = {
     ast.IsNot: (ast.Is,),
 }
 
+TOKENS: Dict[Type[cmpop], str] = {
+    ast.In: "in",
+    ast.NotIn: "not in",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+    ast.Is: "is",
+    ast.IsNot: "is not",
+}
+
 
 def _get_replacement_ops(op: cmpop) -> Iterable[cmpop]:
     for op_type in MAPPING[type(op)]:
         yield op_type()
 
 
+@handles(Compare)
 def switch_compare_ops(node: AST, context: Context) -> Iterator[Mutation]:
     if not isinstance(node, Compare):
         return
 
     for index, op in enumerate(node.ops):
+        before = node.left if index == 0 else node.comparators[index - 1]
+        after = node.comparators[index]
         for new_op in _get_replacement_ops(op):
             new_node = deepcopy(node)
             new_node.ops[index] = new_op
-            yield Mutation.from_node(new_node, context)
+            yield Mutation.from_node(
+                new_node,
+                context,
+                source=replace_tokens(
+                    context.file.source,
+                    node,
+                    [(before, after, TOKENS[type(op)], TOKENS[type(new_op)])],
+                ),
+            )
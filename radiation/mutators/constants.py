@@ -1,16 +1,21 @@
-from ast import AST, Bytes, Num, Str
+from ast import AST, Bytes, Constant, Num, Str
 from typing import Iterator
 
 from ..mutation import Mutation
 from ..types import Context
+from .dispatch import handles
 
 
+@handles(Constant)
 def modify_constants(node: AST, context: Context) -> Iterator[Mutation]:
+    # the values' reprs are valid literals for all of these types
     if isinstance(node, Str):
-        yield Mutation.from_node(Str(f"XXX{node.s}XXX", kind=None), context)
+        value = f"XXX{node.s}XXX"
+        yield Mutation.from_node(Str(value, kind=None), context, source=repr(value))
     if isinstance(node, Bytes):
-        yield Mutation.from_node(Bytes(b"XXX%bXXX" % node.s, kind=None), context)
+        data = b"XXX%bXXX" % node.s
+        yield Mutation.from_node(Bytes(data, kind=None), context, source=repr(data))
     if isinstance(node, Num):
         values = {0, 1, node.value - 1, node.value + 1} - {node.value}
         for val in sorted(values, key=lambda n: (n.real, n.imag)):
-            yield Mutation.from_node(Num(val, kind=None), context)
+            yield Mutation.from_node(Num(val, kind=None), context, source=repr(val))
@@ -0,0 +1,60 @@
+from ast import AST
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from ..mutation import Mutation
+from ..types import Context
+
+Mutator = Callable[[AST, Context], Iterable[Mutation]]
+_M = TypeVar("_M", bound=Mutator)
+
+NODE_TYPES_ATTR = "__radiation_node_types__"
+
+
+def handles(*node_types: Type[AST]) -> Callable[[_M], _M]:
+    """
+    Declares the node types a mutator can mutate, so it's only called on them.
+    Mutators without a declaration are called on every node.
+    """
+
+    def decorator(mutator: _M) -> _M:
+        setattr(mutator, NODE_TYPES_ATTR, node_types)
+        return mutator
+
+    return decorator
+
+
+def get_node_types(mutator: Mutator) -> Optional[Tuple[Type[AST], ...]]:
+    return getattr(mutator, NODE_TYPES_ATTR, None)
+
+
+@dataclass
+class MutatorTable:
+    """
+    The mutators to call on each node type, in their original order.
+    """
+
+    mutators: Sequence[Mutator]
+    _by_type: Dict[type, List[Mutator]] = field(
+        init=False, default_factory=dict, repr=False, compare=False
+    )
+
+    def get(self, node_type: type) -> List[Mutator]:
+        if node_type not in self._by_type:
+            self._by_type[node_type] = [
+                mutator
+                for mutator in self.mutators
+                if (node_types := get_node_types(mutator)) is None
+                or issubclass(node_type, node_types)
+            ]
+        return self._by_type[node_type]
@@ -3,17 +3,23 @@ from typing import Iterator
 
 from ..context import get_context
 from ..mutation import Mutation
+from ..source import parenthesize
 from ..types import Context
+from .dispatch import handles
 
 
 def _invert(node: AST) -> AST:
     return UnaryOp(op=Not(), operand=node)
 
 
+@handles(IfExp, If, While)
 def invert(node: AST, context: Context) -> Iterator[Mutation]:
     if isinstance(node, (IfExp, If, While)) and not isinstance(node.test, Compare):
+        source = context.file.source
+        test = source.get_segment(node.test) if source else None
         yield Mutation(
             type(node)(body=node.body, test=_invert(node.test), orelse=node.orelse),
             _invert(node.test),
             get_context(node.test, context),
+            source=f"not {parenthesize(test, node.test)}" if test else None,
         )
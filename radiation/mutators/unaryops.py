@@ -3,20 +3,43 @@ from ast import AST, UnaryOp, unaryop
 from typing import Dict, Iterator, Type
 
 from ..mutation import Mutation
+from ..source import parenthesize, replace_tokens
 from ..types import Context
+from .dispatch import handles
 
 MAPPING: Dict[Type[unaryop], Type[unaryop]] = {
     ast.UAdd: ast.USub,
     ast.USub: ast.UAdd,
 }
 
+TOKENS: Dict[Type[unaryop], str] = {
+    ast.UAdd: "+",
+    ast.USub: "-",
+}
+
 
 def _switch_op(op: unaryop) -> unaryop:
     return MAPPING[type(op)]()
 
 
+@handles(UnaryOp)
 def switch_unary_ops(node: AST, context: Context) -> Iterator[Mutation]:
+    source = context.file.source
     if isinstance(node, UnaryOp) and type(node.op) == ast.Invert:
-        yield Mutation.from_node(node.operand, context)
+        operand = source.get_segment(node.operand) if source else None
+        yield Mutation.from_node(
+            node.operand,
+            context,
+            source=parenthesize(operand, node.operand) if operand else None,
+        )
     if isinstance(node, UnaryOp) and type(node.op) in MAPPING:
-        yield Mutation.from_node(UnaryOp(_switch_op(node.op), node.operand), context)
+        new_op = _switch_op(node.op)
+        yield Mutation.from_node(
+            UnaryOp(new_op, node.operand),
+            context,
+            source=replace_tokens(
+                source,
+                node,
+                [(None, node.operand, TOKENS[type(node.op)], TOKENS[type(new_op)])],
+            ),
+        )
@@ -1,25 +1,53 @@
 import ast
+import datetime as dt
 import os
 from ast import Module
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass, field
+from functools import partial
 from glob import iglob
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Union
-
-from radiation_cli.utils import is_relative_to
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+from .cache import ResultCache
 from .config import Config
-from .filters import MutantFilter, get_default_filters
+from .equivalence import EquivalenceChecker
+from .files import IgnorePatterns, escape, git_ls_files, walk_files
+from .filters import (
+    MutantFilter,
+    SubtreePredicate,
+    get_default_filters,
+    get_subtree_predicates,
+)
 from .gen import gen_mutations
 from .mutation import Mutation
 from .mutators import Mutator, get_default_mutators
 from .runners import Runner, get_default_runner
+from .source import SourceCache, SourceLines
 from .types import Context, FileContext, NodeContext, TestsResult
 
 
-def _get_initial_context(path: Path, module: Module) -> Context:
+def _get_initial_context(path: Path, module: Module, source: SourceLines) -> Context:
     return Context(
-        file=FileContext(path=path),
+        file=FileContext(path=path, source=source),
         node=NodeContext(
             lineno=module.body[0].lineno,
             end_lineno=module.body[-1].end_lineno,
@@ -29,20 +57,89 @@ def _get_initial_context(path: Path, module: Module) -> Context:
     )
 
 
+def _may_contain(
+    predicates: Sequence[SubtreePredicate], config: Config, context: Context
+) -> bool:
+    return all(predicate(context, config) for predicate in predicates)
+
+
+def _gen_unfiltered_mutations(
+    tree: Module,
+    source: SourceLines,
+    path: Path,
+    mutators: Sequence[Mutator],
+    may_contain: Optional[Callable[[Context], bool]],
+) -> Iterator[Mutation]:
+    if len(tree.body) == 0:
+        return
+    yield from gen_mutations(
+        tree,
+        parent_context=_get_initial_context(path, tree, source),
+        mutators=mutators,
+        may_contain=may_contain,
+    )
+
+
+# set in each worker process generating mutations, so the mutators and
+# the filters' predicates are pickled once per worker rather than per file
+_worker_mutators: Sequence[Mutator] = ()
+_worker_may_contain: Optional[Callable[[Context], bool]] = None
+
+
+def _init_generation_worker(
+    mutators: Sequence[Mutator], may_contain: Optional[Callable[[Context], bool]]
+) -> None:
+    global _worker_mutators, _worker_may_contain
+    _worker_mutators, _worker_may_contain = mutators, may_contain
+
+
+def _gen_file_mutations(path: Path) -> List[Mutation]:
+    # runs in a worker process, the mutations are pickled back together
+    # so they share a single copy of the file's tree and source
+    source = SourceLines(path.read_text())
+    return list(
+        _gen_unfiltered_mutations(
+            ast.parse(source.text),
+            source,
+            path,
+            _worker_mutators,
+            _worker_may_contain,
+        )
+    )
+
+
 def _find_files(
-    search: str, *, extension: str = ".py", excludes: Optional[List[Path]] = None
+    root: Path, glob: str, *, extension: str = ".py", ignore: IgnorePatterns
 ) -> Iterable[Path]:
-    excludes = excludes or []
-
-    for path in sorted(iglob(search, recursive=True)):
-        if any(is_relative_to(path, exclude) for exclude in excludes):
-            continue
-        if Path(path).is_dir():
-            yield from _find_files(f"{path}/*", extension=extension, excludes=excludes)
+    # include is a glob and thus won't be handled well by pathlib
+    for path in sorted(iglob(os.path.join(root, glob), recursive=True)):
+        relative = os.path.relpath(path, root).replace(os.sep, "/")
+        is_dir = os.path.isdir(path)
+        if relative != "." and ignore.match_with_parents(relative, is_dir=is_dir):
             continue
-        if not path.endswith(extension):
-            continue
-        yield Path(path)
+        if is_dir:
+            yield from walk_files(path, root=root, extension=extension, ignore=ignore)
+        elif path.endswith(extension):
+            yield Path(path)
+
+
+def _find_git_files(
+    root: Path, globs: List[str], *, extension: str = ".py", ignore: IgnorePatterns
+) -> Iterable[Path]:
+    files = [
+        relative
+        for relative in git_ls_files(root)
+        if relative.endswith(extension)
+        and not any(part.startswith(".") for part in relative.split("/"))
+        and not ignore.match_with_parents(relative, is_dir=False)
+    ]
+    for glob in globs:
+        include = IgnorePatterns.parse([escape(glob, glob=True)])
+        for relative in files:
+            # deleted files are still listed until the deletion is staged
+            path = root / relative
+            if include.match_with_parents(relative, is_dir=False) and path.exists():
+                yield path
 
 
 def _assert_relative(paths: List[str]) -> None:
@@ -55,6 +152,10 @@ class Radiation:
     runner: Runner = field(default_factory=get_default_runner)
     filters: Sequence[MutantFilter] = field(default_factory=get_default_filters)
     mutators: Sequence[Mutator] = field(default_factory=get_default_mutators)
+    cache: Optional[ResultCache] = None
+    # mutations found equivalent are reported without running the tests
+    equivalence: Optional[EquivalenceChecker] = None
+    sources: SourceCache = field(default_factory=SourceCache, compare=False)
 
     def find_files(
         self,
@@ -62,46 +163,138 @@ class Radiation:
         *,
         exclude: Optional[str] = None,
         excludes: Optional[List[str]] = None,
+        ignore: Sequence[str] = (),
+        git_files: bool = False,
     ) -> Iterable[Path]:
+        """
+        Yields the files matching `globs`, or under the directories they match.
+        `excludes` are paths and `ignore` holds `.gitignore`-style patterns,
+        both relative to the project root. Excluded directories aren't walked.
+
+        With `git_files`, the files are taken from `git ls-files` rather than
+        from walking the project.
+        """
         globs = [globs] if isinstance(globs, str) else globs
         excludes = [exclude] if exclude else excludes or []
         _assert_relative(globs)
         _assert_relative(excludes)
 
+        root = self.config.project_root
+        patterns = IgnorePatterns.parse([*map(escape, excludes), *ignore])
+        if git_files:
+            yield from _find_git_files(root, globs, ignore=patterns)
+            return
         for glob in globs:
-            yield from _find_files(
-                # include is a glob and thus won't be handled well by pathlib
-                os.path.join(self.config.project_root, glob),
-                excludes=[self.config.project_root / exclude for exclude in excludes],
-            )
+            yield from _find_files(root, glob, ignore=patterns)
 
-    def gen_mutations_str(
-        self, code: str, path: Union[str, Path] = "<code>"
+    def _gen_mutations_in_tree(
+        self, tree: Module, source: SourceLines, path: Union[str, Path]
     ) -> Iterable[Mutation]:
-        path = Path(path)
-        path = path if path.is_absolute() else self.config.project_root / path
+        yield from self._filter(
+            _gen_unfiltered_mutations(
+                tree, source, self._resolve(path), self.mutators, self._may_contain()
+            )
+        )
 
-        tree = ast.parse(code)
+    def _resolve(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        return path if path.is_absolute() else self.config.project_root / path
 
-        if len(tree.body) == 0:
-            return
+    def _may_contain(self) -> Optional[Callable[[Context], bool]]:
+        # subtrees a filter's predicate rejects are not walked
+        predicates = get_subtree_predicates(self.filters)
+        return partial(_may_contain, predicates, self.config) if predicates else None
 
-        for mut in gen_mutations(
-            tree,
-            parent_context=_get_initial_context(path, tree),
-            mutators=self.mutators,
-        ):
+    def _filter(self, mutations: Iterable[Mutation]) -> Iterator[Mutation]:
+        for mut in mutations:
             if all(filter_fn(mut, self.config) for filter_fn in self.filters):
                 yield mut
 
+    def gen_mutations_str(
+        self, code: str, path: Union[str, Path] = "<code>"
+    ) -> Iterable[Mutation]:
+        yield from self._gen_mutations_in_tree(ast.parse(code), SourceLines(code), path)
+
     def gen_mutations(self, path: Union[str, Path]) -> Iterable[Mutation]:
-        yield from self.gen_mutations_str(Path(path).read_text(), path)
+        yield from self._gen_mutations_in_tree(
+            self.sources.get_tree(path), self.sources.get_source(path), path
+        )
+
+    def gen_mutations_many(
+        self, paths: Iterable[Union[str, Path]], *, jobs: int = 1
+    ) -> Iterator[Mutation]:
+        """
+        Generates the mutations of several files, parsing them in `jobs`
+        processes. The mutations are yielded in the order of `paths`,
+        and filtered here since filters can keep state across files.
+        """
+        if jobs == 1:
+            for path in paths:
+                yield from self.gen_mutations(path)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_generation_worker,
+            initargs=(self.mutators, self._may_contain()),
+        ) as executor:
+            # at most `jobs` files are generated ahead of the consumer,
+            # so mutations don't pile up while the first ones are tested
+            pending: Deque["Future[List[Mutation]]"] = deque()
+            for path in map(self._resolve, paths):
+                if len(pending) >= jobs:
+                    yield from self._filter(pending.popleft().result())
+                pending.append(executor.submit(_gen_file_mutations, path))
+            while pending:
+                yield from self._filter(pending.popleft().result())
 
     def run_baseline_tests(self) -> TestsResult:
         return self.runner.run_baseline_tests(config=self.config)
 
+    def _screen(self, mutation: Mutation) -> Optional[TestsResult]:
+        if self.equivalence is None or not self.equivalence.is_equivalent(mutation):
+            return None
+        return TestsResult(duration=dt.timedelta(), status="equivalent")
+
+    def _test_mutation(self, mutation: Mutation, *, timeout: float) -> TestsResult:
+        if self.cache is None:
+            return self.runner.test_mutation(
+                mutation, config=self.config, timeout=timeout
+            )
+
+        if cached := self.cache.get(mutation, config=self.config):
+            return cached
+        result = self.runner.test_mutation(
+            mutation, config=self.config, timeout=timeout
+        )
+        self.cache.set(mutation, result, config=self.config)
+        return result
+
     def test_mutation(self, mutation: Mutation, *, timeout: float) -> TestsResult:
-        return self.runner.test_mutation(mutation, config=self.config, timeout=timeout)
+        return self._screen(mutation) or self._test_mutation(mutation, timeout=timeout)
+
+    def test_mutations(
+        self, mutations: Iterable[Mutation], *, timeout: float, jobs: int = 1
+    ) -> Iterator[Tuple[Mutation, TestsResult]]:
+        # results are yielded in completion order, at most `jobs` mutations
+        # are in flight so `mutations` can be a lazy iterable
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            pending: Dict["Future[TestsResult]", Mutation] = {}
+            for mutation in mutations:
+                # screened here rather than in the workers, before waiting on them
+                if screened := self._screen(mutation):
+                    yield mutation, screened
+                    continue
+                if len(pending) >= jobs:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+                future = executor.submit(self._test_mutation, mutation, timeout=timeout)
+                pending[future] = mutation
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
 
     def unsafe_test_mutation(self, mutation: Mutation) -> TestsResult:
         return self.runner.test_mutation(mutation, config=self.config)
@@ -3,6 +3,7 @@ from typing import Optional, Protocol
 from ..config import Config
 from ..mutation import Mutation
 from ..types import TestsResult
+from .schemata import SchemataRunner
 from .tempdir import TempDirRunner
 
 
@@ -0,0 +1,352 @@
+import datetime as dt
+import importlib.abc
+import importlib.machinery
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from queue import Empty, Queue
+from tempfile import TemporaryFile
+from types import FunctionType, ModuleType
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
+
+from ..config import Config
+from ..mutation import Mutation, apply_mutation_on_string, get_original_source
+from ..types import TestsResult
+from .limits import ResourceLimits
+
+# (path of the mutated file, mutated source, timeout)
+Request = Tuple[Optional[str], Optional[str], Optional[float]]
+# (exit code or None if timed out, output)
+Response = Tuple[Optional[int], Optional[str]]
+
+_MODULE_METADATA = (
+    "__name__",
+    "__file__",
+    "__package__",
+    "__path__",
+    "__spec__",
+    "__loader__",
+    "__builtins__",
+)
+
+
+def _patch_function(old: FunctionType, new: FunctionType) -> bool:
+    if hasattr(old, "__wrapped__") and hasattr(new, "__wrapped__"):
+        _patch_function(old.__wrapped__, new.__wrapped__)  # type: ignore
+    try:
+        old.__code__ = new.__code__
+    except ValueError:
+        # the closures don't match, the new function is used as is
+        return False
+    old.__defaults__ = new.__defaults__
+    old.__kwdefaults__ = new.__kwdefaults__
+    return True
+
+
+def _patch_class(old: type, new: type) -> None:
+    for name, new_value in vars(new).items():
+        old_value = vars(old).get(name)
+        old_func = getattr(old_value, "__func__", old_value)
+        new_func = getattr(new_value, "__func__", new_value)
+        if isinstance(old_func, FunctionType) and isinstance(new_func, FunctionType):
+            if _patch_function(old_func, new_func):
+                continue
+        if not name.startswith("__"):
+            setattr(old, name, new_value)
+
+
+def _patch_namespace(old: Dict[str, Any], new: Dict[str, Any]) -> None:
+    # objects are patched in place where possible, so references held by
+    # other modules (e.g. `from module import function`) see the mutation too
+    for name, new_value in new.items():
+        old_value = old.get(name)
+        if isinstance(old_value, FunctionType) and isinstance(new_value, FunctionType):
+            if _patch_function(old_value, new_value):
+                continue
+        if (
+            isinstance(old_value, type)
+            and isinstance(new_value, type)
+            and old_value.__module__ == new_value.__module__
+        ):
+            _patch_class(old_value, new_value)
+            continue
+        old[name] = new_value
+
+
+class _MutatedLoader(importlib.machinery.SourceFileLoader):
+    def __init__(self, fullname: str, path: str, source: str) -> None:
+        super().__init__(fullname, path)
+        self.source = source
+
+    def get_data(self, path: str) -> bytes:
+        if path == self.path:
+            return self.source.encode()
+        return super().get_data(path)
+
+    def path_stats(self, path: str) -> Any:
+        # skips the bytecode cache of the original file
+        raise OSError("mutated sources have no stats")
+
+
+class _MutatedFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, path: str, source: str) -> None:
+        self.path = path
+        self.source = source
+
+    def find_spec(
+        self, fullname: str, path: Optional[Sequence[str]], target: Any = None
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if not spec or not spec.origin or os.path.realpath(spec.origin) != self.path:
+            return None
+        spec.loader = _MutatedLoader(fullname, spec.origin, self.source)
+        return spec
+
+
+def _find_module(path: str) -> Optional[ModuleType]:
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, "__file__", None)
+        if module_file and os.path.realpath(module_file) == path:
+            return module
+    return None
+
+
+def _apply_mutation_in_memory(path: str, source: str) -> None:
+    path = os.path.realpath(path)
+    module = _find_module(path)
+    if module is None:
+        # not imported yet, it will be imported from the mutated source
+        sys.meta_path.insert(0, _MutatedFinder(path, source))
+        return
+
+    namespace = {
+        key: module.__dict__[key] for key in _MODULE_METADATA if key in module.__dict__
+    }
+    exec(compile(source, path, "exec"), namespace)
+    _patch_namespace(module.__dict__, namespace)
+
+
+def _wait(pid: int, timeout: Optional[float], limits: ResourceLimits) -> Optional[int]:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        waited_pid, status = os.waitpid(pid, os.WNOHANG)
+        if waited_pid:
+            if os.WIFSIGNALED(status) and limits.exceeded_cpu_limit(
+                -os.WTERMSIG(status)
+            ):
+                return None
+            return os.WEXITSTATUS(status) if os.WIFEXITED(status) else -1
+        if deadline is not None and time.monotonic() > deadline:
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            os.waitpid(pid, 0)
+            return None
+        time.sleep(0.01)
+
+
+def _redirect_output(output: IO[bytes]) -> None:
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(output.fileno(), 1)
+    os.dup2(output.fileno(), 2)
+
+
+def _read_output(output: IO[bytes]) -> str:
+    output.seek(0)
+    return output.read().decode(errors="replace")
+
+
+def _run_items(session: Any) -> int:
+    items = session.items
+    for index, item in enumerate(items):
+        nextitem = items[index + 1] if index + 1 < len(items) else None
+        item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+        if session.shouldfail or session.shouldstop:
+            break
+    exitstatus = 1 if session.testsfailed else 0
+    session.config.hook.pytest_sessionfinish(session=session, exitstatus=exitstatus)
+    return exitstatus
+
+
+def _fork_and_run(
+    session: Any, request: Request, output: IO[bytes], limits: ResourceLimits
+) -> Response:
+    # pytest's capturing restores stdout and stderr to the descriptors they had
+    # when it started, so the child writes to the server's output file as well
+    path, source, timeout = request
+    output.seek(0)
+    output.truncate()
+    pid = os.fork()
+    if pid == 0:
+        exitstatus = 1
+        try:
+            os.setpgid(0, 0)
+            limits.apply()
+            if path and source is not None:
+                _apply_mutation_in_memory(path, source)
+            exitstatus = _run_items(session)
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exitstatus)
+
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        # the child has already set it (or exited)
+        pass
+    returncode = _wait(pid, timeout, limits)
+    return returncode, (None if returncode is None else _read_output(output))
+
+
+def _serve(
+    connection: Connection,
+    project_root: str,
+    pytest_args: List[str],
+    limits: ResourceLimits,
+) -> None:
+    import pytest
+
+    os.chdir(project_root)
+    sys.path.insert(0, project_root)
+
+    class ForkPlugin:
+        served = False
+
+        @pytest.hookimpl(tryfirst=True)
+        def pytest_runtestloop(self, session: Any) -> bool:
+            if session.testsfailed:
+                # collection errors, the tests cannot run
+                return False
+            self.served = True
+            try:
+                while request := connection.recv():
+                    connection.send(_fork_and_run(session, request, output, limits))
+            except EOFError:
+                pass
+            return True
+
+    with TemporaryFile() as output:
+        _redirect_output(output)
+        plugin = ForkPlugin()
+        pytest.main([*pytest_args, "-p", "no:cacheprovider"], plugins=[plugin])
+        if plugin.served:
+            return
+
+        # pytest exited without serving, e.g. on bad arguments or collection errors
+        try:
+            while connection.recv():
+                connection.send((1, _read_output(output)))
+        except EOFError:
+            pass
+
+
+@dataclass
+class _Server:
+    process: multiprocessing.process.BaseProcess
+    connection: Connection
+
+    def request(self, request: Request) -> Response:
+        self.connection.send(request)
+        return self.connection.recv()  # type: ignore
+
+    def close(self) -> None:
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+        self.connection.close()
+
+
+@dataclass
+class ForkRunner:
+    """
+    Imports the project and collects its tests once in a pytest process,
+    then forks it for each mutation and patches the mutated module in memory.
+
+    Mutated module-level values are rebound in the module and functions and
+    methods are patched in place, values that were copied elsewhere before
+    the fork (e.g. `from module import CONSTANT`) keep their original value.
+    """
+
+    pytest_args: Sequence[str] = ()
+    limits: ResourceLimits = field(default_factory=ResourceLimits)
+    _servers: "Queue[_Server]" = field(
+        init=False, default_factory=Queue, repr=False, compare=False
+    )
+
+    def _start_server(self, config: Config) -> _Server:
+        context = multiprocessing.get_context("spawn")
+        connection, child_connection = context.Pipe()
+        process = context.Process(
+            target=_serve,
+            args=(
+                child_connection,
+                str(config.project_root),
+                list(self.pytest_args),
+                self.limits,
+            ),
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        return _Server(process=process, connection=connection)
+
+    def _acquire_server(self, config: Config) -> _Server:
+        try:
+            return self._servers.get_nowait()
+        except Empty:
+            return self._start_server(config)
+
+    def _run(self, request: Request, *, config: Config) -> TestsResult:
+        server = self._acquire_server(config)
+        start_time = dt.datetime.now()
+        try:
+            returncode, output = server.request(request)
+        except (EOFError, OSError):
+            server.close()
+            raise
+        self._servers.put(server)
+
+        if returncode is None:
+            return TestsResult(
+                duration=dt.datetime.now() - start_time,
+                status="timed out",
+            )
+        return TestsResult(
+            duration=dt.datetime.now() - start_time,
+            status=("survived" if returncode == 0 else "killed"),
+            output=output,
+        )
+
+    def run_baseline_tests(
+        self, *, config: Config, timeout: Optional[float] = None
+    ) -> TestsResult:
+        return self._run((None, None, timeout), config=config)
+
+    def test_mutation(
+        self, mutation: Mutation, *, config: Config, timeout: Optional[float] = None
+    ) -> TestsResult:
+        path = mutation.context.file.path
+        source = apply_mutation_on_string(get_original_source(mutation), mutation)
+        return self._run((str(path), source, timeout), config=config)
+
+    def cleanup(self) -> None:
+        while True:
+            try:
+                server = self._servers.get_nowait()
+            except Empty:
+                return
+            server.close()
@@ -0,0 +1,62 @@
+import signal
+from dataclasses import dataclass
+from typing import Optional
+
+# SIGXCPU doesn't exist on Windows, where the limits aren't supported anyway
+_SIGXCPU = getattr(signal, "SIGXCPU", None)
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """
+    Limits on each process running the tests, None means unlimited.
+    A process exceeding the CPU time limit is considered timed out.
+    """
+
+    # bytes of address space
+    memory: Optional[int] = None
+    # seconds of CPU time
+    cpu: Optional[int] = None
+
+    def wrap_command(self, command: str) -> str:
+        """
+        Returns a shell command setting the limits before running `command`.
+        """
+        limits = []
+        if self.memory is not None:
+            limits.append(f"ulimit -v {self.memory // 1024}")
+        if self.cpu is not None:
+            # only the soft limit, which sends SIGXCPU rather than SIGKILL
+            limits.append(f"ulimit -S -t {self.cpu}")
+        if not limits:
+            return command
+        # the newline ends the command even if it ends with a comment
+        return " && ".join([*limits, f"{{ {command}\n}}"])
+
+    def exceeded_cpu_limit(self, returncode: int) -> bool:
+        """
+        Returns whether a process exiting with `returncode` was stopped by the
+        CPU time limit, which is never the case when there's no limit.
+        """
+        # the shell reports a child killed by a signal as 128 + the signal
+        return (
+            self.cpu is not None
+            and _SIGXCPU is not None
+            and returncode in (-_SIGXCPU, 128 + _SIGXCPU)
+        )
+
+    def apply(self) -> None:
+        """
+        Sets the limits on the current process.
+        """
+        import resource
+
+        for kind, value in [
+            (resource.RLIMIT_AS, self.memory),
+            (resource.RLIMIT_CPU, self.cpu),
+        ]:
+            if value is None:
+                continue
+            _, hard = resource.getrlimit(kind)
+            soft = value if hard == resource.RLIM_INFINITY else min(value, hard)
+            resource.setrlimit(kind, (soft, hard))
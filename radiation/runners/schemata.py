@@ -0,0 +1,120 @@
+import datetime as dt
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, Iterable, Optional, Tuple
+
+from ..config import Config
+from ..mutation import Mutation, get_mutation_source, get_original_source
+from ..schemata import ACTIVE_MUTANT_ENV, build_schema
+from ..types import TestsResult
+from .snapshot import materialize, snapshot_tree
+from .tempdir import TempDirRunner
+
+# (path, lineno, end_lineno, col_offset, end_col_offset, replacement)
+_MutantKey = Tuple[Path, int, Optional[int], int, Optional[int], str]
+
+
+def _get_mutant_key(mutation: Mutation) -> _MutantKey:
+    # equal for the same mutation generated again, unlike its id()
+    node = mutation.context.node
+    return (
+        mutation.context.file.path,
+        node.lineno,
+        node.end_lineno,
+        node.col_offset,
+        node.end_col_offset,
+        get_mutation_source(mutation),
+    )
+
+
+@dataclass
+class SchemataRunner(TempDirRunner):
+    """
+    Writes every mutation of a file into a single instrumented copy of it,
+    so the sandbox is prepared once and each test run only changes the
+    RADIATION_ACTIVE_MUTANT environment variable.
+
+    Mutations that cannot be instrumented, or whose file fails to be, are
+    tested like in TempDirRunner.
+
+    The instrumented files are regenerated from their AST, so they lose their
+    comments and formatting and their line numbers don't match the original
+    files' (e.g. in tracebacks).
+    """
+
+    _sandbox: "Optional[TemporaryDirectory[str]]" = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    # mutant ids are the mutations' indexes in `prepare`
+    _mutant_ids: Dict[_MutantKey, str] = field(
+        init=False, default_factory=dict, repr=False, compare=False
+    )
+
+    def prepare(self, mutations: Iterable[Mutation], *, config: Config) -> None:
+        self.cleanup()
+
+        by_file: Dict[Path, Dict[str, Mutation]] = defaultdict(dict)
+        for index, mutation in enumerate(mutations):
+            by_file[mutation.context.file.path][str(index)] = mutation
+
+        self._sandbox = TemporaryDirectory()
+        snapshot_tree(config.project_root, self._sandbox.name, mode=self.snapshot)
+
+        for path, file_mutations in by_file.items():
+            source = get_original_source(next(iter(file_mutations.values())))
+            try:
+                code, mutant_ids = build_schema(source.text, file_mutations)
+            except Exception:
+                # the file's mutations are tested on their own instead
+                continue
+            target = Path(self._sandbox.name) / path.relative_to(config.project_root)
+            materialize(target)
+            target.write_text(code)
+            for mutant_id in mutant_ids:
+                self._mutant_ids[_get_mutant_key(file_mutations[mutant_id])] = mutant_id
+
+    def _get_env(self, mutant_id: Optional[str] = None) -> Dict[str, str]:
+        env = {key: val for key, val in os.environ.items() if key != ACTIVE_MUTANT_ENV}
+        return {**env, ACTIVE_MUTANT_ENV: mutant_id} if mutant_id else env
+
+    def run_baseline_tests(
+        self, *, config: Config, timeout: Optional[float] = None
+    ) -> TestsResult:
+        if not self._sandbox:
+            return super().run_baseline_tests(config=config, timeout=timeout)
+        if self.select_tests:
+            # the line numbers of the instrumented files don't match the original
+            # ones, so the coverage is collected on an uninstrumented copy, which
+            # with no active mutant behaves the same, so it isn't run again
+            return super().run_baseline_tests(config=config, timeout=timeout)
+        return self._run_tests_in_dir(
+            self._sandbox.name, timeout=timeout, env=self._get_env()
+        )
+
+    def test_mutation(
+        self, mutation: Mutation, *, config: Config, timeout: Optional[float] = None
+    ) -> TestsResult:
+        mutant_id = self._mutant_ids.get(_get_mutant_key(mutation))
+        if not self._sandbox or mutant_id is None:
+            return super().test_mutation(mutation, config=config, timeout=timeout)
+        args = self._get_test_args(mutation, config=config)
+        if args is None:
+            return TestsResult(duration=dt.timedelta(), status="uncovered")
+        return self._run_mutation_tests(
+            self._sandbox.name,
+            mutation,
+            config=config,
+            timeout=timeout,
+            env=self._get_env(mutant_id),
+            args=args,
+        )
+
+    def cleanup(self) -> None:
+        super().cleanup()
+        if self._sandbox:
+            self._sandbox.cleanup()
+        self._sandbox = None
+        self._mutant_ids.clear()
@@ -0,0 +1,91 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from shutil import copy2, copystat, copytree
+from typing import Literal, Union
+
+SnapshotMode = Literal["copy", "link"]
+
+# from linux/fs.h, clones a file's extents into another file on CoW filesystems
+FICLONE = 0x40049409
+
+# written in place by the tests' tools, so they are copied even when linking
+_CACHE_DIRS = frozenset(
+    {
+        ".pytest_cache",
+        "__pycache__",
+        ".radiation",
+        ".mypy_cache",
+        ".hypothesis",
+        ".tox",
+        ".nox",
+    }
+)
+_CACHE_FILE_PREFIXES = (".coverage", ".radiation")
+
+
+def _is_cache(path: Path) -> bool:
+    parts = path.parts
+    return not _CACHE_DIRS.isdisjoint(parts) or parts[-1].startswith(
+        _CACHE_FILE_PREFIXES
+    )
+
+
+def _reflink(src: str, dst: str) -> None:
+    try:
+        import fcntl
+    except ImportError as e:
+        raise OSError("reflinks are not supported on this platform") from e
+
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+    copystat(src, dst)
+
+
+@dataclass
+class _LinkOrCopy:
+    root: Path
+    # a failure almost always means the filesystem doesn't support the method,
+    # so it isn't retried for the rest of the tree
+    can_reflink: bool = True
+    can_hardlink: bool = True
+
+    def __call__(self, src: str, dst: str) -> None:
+        if _is_cache(Path(src).relative_to(self.root)):
+            copy2(src, dst)
+            return
+        if self.can_reflink:
+            try:
+                _reflink(src, dst)
+                return
+            except OSError:
+                self.can_reflink = False
+                Path(dst).unlink(missing_ok=True)
+        if self.can_hardlink:
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                self.can_hardlink = False
+        copy2(src, dst)
+
+
+def snapshot_tree(
+    src: Union[str, Path], dst: Union[str, Path], *, mode: SnapshotMode = "copy"
+) -> None:
+    copytree(
+        src,
+        dst,
+        dirs_exist_ok=True,
+        copy_function=_LinkOrCopy(Path(src)) if mode == "link" else copy2,
+    )
+
+
+def materialize(path: Path) -> None:
+    # hardlinked files share their content with the original project,
+    # so they must be replaced with a private copy before being written to
+    if path.stat().st_nlink <= 1:
+        return
+    private_copy = path.with_name(f".{path.name}.radiation")
+    copy2(path, private_copy)
+    os.replace(private_copy, path)
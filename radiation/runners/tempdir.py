@@ -1,34 +1,223 @@
 import datetime as dt
+import os
+import shlex
+import signal
 import subprocess
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from shutil import copytree
+from queue import Empty, Queue
 from tempfile import TemporaryDirectory
-from typing import Optional, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 from ..config import Config
+from ..coverage import COVERAGE_ARGS, COVERAGE_FILE, CoverageMap
+from ..history import KillHistory, get_failed_tests
 from ..mutation import Mutation, apply_mutation_on_disk
+from ..timing import DURATIONS_ARGS, BaselineTimings, get_timeout
 from ..types import TestsResult
+from .limits import ResourceLimits
+from .snapshot import SnapshotMode, materialize, snapshot_tree
+
+
+def _kill_process_group(process: "subprocess.Popen[str]") -> None:
+    # the run command's shell may have started the tests in child processes
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError):
+        # killpg is not available on Windows
+        process.kill()
+
+
+def _run_shell(
+    command: str,
+    *,
+    cwd: Union[str, Path],
+    env: Optional[Dict[str, str]],
+    timeout: Optional[float],
+) -> Optional["subprocess.CompletedProcess[str]"]:
+    """
+    Runs `command` in its own process group, killing the whole group if it
+    times out, in which case None is returned.
+    """
+    with subprocess.Popen(
+        command,
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        env=env,
+        text=True,
+        start_new_session=True,
+    ) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process_group(process)
+            process.communicate()
+            return None
+        except BaseException:
+            _kill_process_group(process)
+            raise
+        return subprocess.CompletedProcess(
+            process.args, process.returncode, stdout, stderr
+        )
+
+
+# pytest options taking the next argument as their value, which may be a path
+_PYTEST_OPTIONS_WITH_VALUE = frozenset(
+    [
+        *("-c", "-k", "-m", "-o", "-p", "-W", "--rootdir", "--confcutdir"),
+        *("--basetemp", "--deselect", "--ignore", "--ignore-glob", "--junitxml"),
+        *("--cov", "--cov-config", "--cov-report", "--tb", "--maxfail"),
+    ]
+)
+# characters ending a command (or starting a redirection) in a shell command
+_SHELL_OPERATOR_CHARS = frozenset(";&|()<>\n")
+
+
+def _split_command(command: str) -> List[Tuple[int, int, bool]]:
+    """
+    Returns the (start, end, is_operator) spans of the words and operators
+    of the shell command `command`, up to a comment.
+    """
+    spans = []
+    index = 0
+    while index < len(command):
+        char = command[index]
+        if char.isspace() and char != "\n":
+            index += 1
+        elif char == "#":
+            break
+        elif char in _SHELL_OPERATOR_CHARS:
+            start = index
+            while index < len(command) and command[index] in _SHELL_OPERATOR_CHARS:
+                index += 1
+            spans.append((start, index, True))
+        else:
+            start = index
+            while index < len(command) and not (
+                command[index].isspace() or command[index] in _SHELL_OPERATOR_CHARS
+            ):
+                if command[index] == "\\":
+                    index += 1
+                elif command[index] in "'\"":
+                    quote = command[index]
+                    index += 1
+                    while index < len(command) and command[index] != quote:
+                        index += 2 if quote == '"' and command[index] == "\\" else 1
+                index += 1
+            spans.append((start, index, False))
+    return spans
+
+
+def add_test_args(run_command: str, args: Sequence[str], cwd: Union[str, Path]) -> str:
+    """
+    Returns `run_command` with `args` added to the arguments of its pytest
+    invocation, before any shell operator, or to its end if it has none.
+
+    When `args` contains test ids, the paths (or test ids) of existing files
+    and directories already given to pytest are removed, since they would
+    otherwise run along with the selected tests.
+    """
+    quoted = " ".join(map(shlex.quote, args))
+    spans = _split_command(run_command)
+    try:
+        words = [
+            None if is_operator else shlex.split(run_command[start:end])[0]
+            for start, end, is_operator in spans
+        ]
+    except ValueError:
+        words = []
+    if not args or not words:
+        return " ".join(filter(None, [run_command, quoted]))
+
+    start = next(
+        (
+            index + 1
+            for index, word in enumerate(words)
+            if word is not None and Path(word).name == "pytest"
+        ),
+        0,
+    )
+    end = next(
+        (index for index in range(start, len(words)) if words[index] is None),
+        len(words),
+    )
+    if not start:
+        end = len(words)
+
+    removed = []
+    if start and any(not arg.startswith("-") for arg in args):
+        takes_value = False
+        for index, word in enumerate(words[start:end], start):
+            assert word is not None
+            if not takes_value and not word.startswith("-"):
+                if (Path(cwd) / word.split("::")[0]).exists():
+                    removed.append(index)
+                    continue
+            takes_value = not takes_value and word in _PYTEST_OPTIONS_WITH_VALUE
+
+    parts = []
+    position = 0
+    for index in removed:
+        # along with the whitespace before it
+        parts.append(run_command[position : spans[index - 1][1]])
+        position = spans[index][1]
+    insert_at = spans[end - 1][1]
+    parts += [run_command[position:insert_at], " ", quoted, run_command[insert_at:]]
+    return "".join(parts)
+
+
+def _invalidate_bytecode(path: Path) -> None:
+    # a mutant and the original often have the same size and are written within
+    # the same second, which is all a .pyc is validated against
+    for cached in path.parent.glob(f"__pycache__/{path.stem}.*.pyc"):
+        cached.unlink(missing_ok=True)
 
 
 @dataclass
 class TempDirRunner:
     run_command: str
+    reuse_sandboxes: bool = False
+    snapshot: SnapshotMode = "copy"
+    select_tests: bool = False
+    # stops at the first failing test (requires a pytest run command)
+    fail_fast: bool = False
+    # runs the tests that killed nearby mutants first (requires a pytest run command)
+    history: Optional[KillHistory] = None
+    # with test selection, the timeout of each mutant is its tests' baseline
+    # duration times the multiplier, but at least the floor (in seconds)
+    timeout_multiplier: float = 1.5
+    timeout_floor: float = 1.0
+    limits: ResourceLimits = field(default_factory=ResourceLimits)
+    _timings: Optional[BaselineTimings] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    _coverage: Optional[CoverageMap] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+    _sandboxes: "Queue[TemporaryDirectory[str]]" = field(
+        init=False, default_factory=Queue, repr=False, compare=False
+    )
 
     def _run_tests_in_dir(
-        self, cwd: Union[str, Path], *, timeout: Optional[float] = None
+        self,
+        cwd: Union[str, Path],
+        *,
+        timeout: Optional[float] = None,
+        env: Optional[Dict[str, str]] = None,
+        args: Sequence[str] = (),
     ) -> TestsResult:
         start_time = dt.datetime.now()
-        try:
-            completed_process = subprocess.run(
-                self.run_command,
-                shell=True,
-                capture_output=True,
-                cwd=cwd,
-                timeout=timeout,
-                text=True,
-            )
-        except subprocess.TimeoutExpired:
+        completed_process = _run_shell(
+            self.limits.wrap_command(add_test_args(self.run_command, args, cwd)),
+            cwd=cwd,
+            env=env,
+            timeout=timeout,
+        )
+        if completed_process is None or self.limits.exceeded_cpu_limit(
+            completed_process.returncode
+        ):
             return TestsResult(
                 duration=dt.datetime.now() - start_time,
                 status="timed out",
@@ -39,21 +228,179 @@ class TempDirRunner:
             output=completed_process.stdout,
         )
 
+    def _run_baseline_tests_in_dir(
+        self,
+        cwd: Union[str, Path],
+        *,
+        timeout: Optional[float] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> TestsResult:
+        if not self.select_tests:
+            return self._run_tests_in_dir(cwd, timeout=timeout, env=env)
+
+        coverage_file = Path(cwd) / COVERAGE_FILE
+        result = self._run_tests_in_dir(
+            cwd,
+            timeout=timeout,
+            env={**(env or os.environ), "COVERAGE_FILE": str(coverage_file)},
+            args=[*COVERAGE_ARGS, *DURATIONS_ARGS],
+        )
+        if result.status == "survived" and coverage_file.exists():
+            self._coverage = CoverageMap.from_data_file(coverage_file, root=cwd)
+            self._timings = BaselineTimings.from_baseline(result)
+        return result
+
+    def _get_test_args(
+        self, mutation: Mutation, *, config: Config
+    ) -> Optional[List[str]]:
+        """
+        Returns the ids of the tests to run against the mutation (all of them
+        when empty), or None when no test executes the mutated code.
+        """
+        if self._coverage is None:
+            return []
+        tests = self._coverage.get_tests(mutation, config=config)
+        if tests is None:
+            return []
+        return tests or None
+
+    def _get_timeout(
+        self, tests: Sequence[str], timeout: Optional[float]
+    ) -> Optional[float]:
+        if not tests or self._timings is None:
+            return timeout
+        expected = self._timings.get_expected(tests)
+        if expected is None:
+            return timeout
+        adaptive = get_timeout(
+            expected, multiplier=self.timeout_multiplier, floor=self.timeout_floor
+        )
+        return adaptive if timeout is None else min(adaptive, timeout)
+
+    def _run_mutation_tests(
+        self,
+        cwd: Union[str, Path],
+        mutation: Mutation,
+        *,
+        config: Config,
+        timeout: Optional[float] = None,
+        env: Optional[Dict[str, str]] = None,
+        args: Sequence[str] = (),
+    ) -> TestsResult:
+        timeout = self._get_timeout(args, timeout)
+        options = ["-x"] if self.fail_fast else []
+        if self.history is None:
+            return self._run_tests_in_dir(
+                cwd, timeout=timeout, env=env, args=[*options, *args]
+            )
+
+        if args:
+            result = self._run_tests_in_dir(
+                cwd,
+                timeout=timeout,
+                env=env,
+                args=[
+                    *options,
+                    *self.history.prioritize(args, mutation, config=config),
+                ],
+            )
+        else:
+            # the likely killers run on their own first, the whole suite
+            # only runs if they all pass
+            result = TestsResult(duration=dt.timedelta(), status="survived")
+            if killers := self.history.get_killers(mutation, config=config):
+                result = self._run_tests_in_dir(
+                    cwd, timeout=timeout, env=env, args=[*options, *killers]
+                )
+                if result.status == "killed" and not get_failed_tests(result.output):
+                    # no test failed, e.g. they were renamed since they were
+                    # recorded, so the whole suite decides
+                    result = replace(result, status="survived")
+            if result.status == "survived":
+                elapsed = result.duration
+                remaining = (
+                    None
+                    if timeout is None
+                    else max(timeout - elapsed.total_seconds(), 0)
+                )
+                result = self._run_tests_in_dir(
+                    cwd, timeout=remaining, env=env, args=options
+                )
+                result.duration += elapsed
+
+        if result.status == "killed":
+            self.history.record(
+                mutation, get_failed_tests(result.output), config=config
+            )
+        return result
+
+    def _acquire_sandbox(self, config: Config) -> "TemporaryDirectory[str]":
+        try:
+            return self._sandboxes.get_nowait()
+        except Empty:
+            sandbox = TemporaryDirectory()
+            snapshot_tree(config.project_root, sandbox.name, mode=self.snapshot)
+            return sandbox
+
+    def _test_mutation_in_sandbox(
+        self,
+        mutation: Mutation,
+        *,
+        config: Config,
+        timeout: Optional[float] = None,
+        args: Sequence[str] = (),
+    ) -> TestsResult:
+        mut_rel_path = mutation.context.file.path.relative_to(config.project_root)
+        sandbox = self._acquire_sandbox(config)
+        path = Path(sandbox.name) / mut_rel_path
+        materialize(path)
+        original = path.read_bytes()
+        try:
+            apply_mutation_on_disk(path, mutation)
+            _invalidate_bytecode(path)
+            return self._run_mutation_tests(
+                sandbox.name, mutation, config=config, timeout=timeout, args=args
+            )
+        finally:
+            path.write_bytes(original)
+            _invalidate_bytecode(path)
+            self._sandboxes.put(sandbox)
+
     def run_baseline_tests(
         self, *, config: Config, timeout: Optional[float] = None
     ) -> TestsResult:
         with TemporaryDirectory() as tempdir:
-            copytree(config.project_root, tempdir, dirs_exist_ok=True)
-            return self._run_tests_in_dir(tempdir, timeout=timeout)
+            snapshot_tree(config.project_root, tempdir, mode=self.snapshot)
+            return self._run_baseline_tests_in_dir(tempdir, timeout=timeout)
 
     def test_mutation(
         self, mutation: Mutation, *, config: Config, timeout: Optional[float] = None
     ) -> TestsResult:
+        args = self._get_test_args(mutation, config=config)
+        if args is None:
+            return TestsResult(duration=dt.timedelta(), status="uncovered")
+
+        if self.reuse_sandboxes:
+            return self._test_mutation_in_sandbox(
+                mutation, config=config, timeout=timeout, args=args
+            )
+
         mut_rel_path = mutation.context.file.path.relative_to(config.project_root)
         with TemporaryDirectory() as tempdir:
-            copytree(config.project_root, tempdir, dirs_exist_ok=True)
+            snapshot_tree(config.project_root, tempdir, mode=self.snapshot)
+            materialize(Path(tempdir) / mut_rel_path)
             apply_mutation_on_disk(
                 Path(tempdir) / mut_rel_path,
                 mutation,
             )
-            return self._run_tests_in_dir(tempdir, timeout=timeout)
+            return self._run_mutation_tests(
+                tempdir, mutation, config=config, timeout=timeout, args=args
+            )
+
+    def cleanup(self) -> None:
+        while True:
+            try:
+                sandbox = self._sandboxes.get_nowait()
+            except Empty:
+                return
+            sandbox.cleanup()
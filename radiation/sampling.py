@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import Config
+from .filters import MutantFilter
+from .journal import JournalEntry
+from .mutation import Mutation
+
+# (not on a changed line, negated survival rate), lower is tested first
+_Key = Tuple[bool, float]
+
+# the survival rate assumed for mutators without history
+DEFAULT_SURVIVAL_RATE = 0.5
+
+
+def get_survival_rates(entries: Iterable[JournalEntry]) -> Dict[str, float]:
+    """
+    Returns the share of each mutator's mutations that survived,
+    smoothed towards the default rate for mutators with few results.
+    """
+    tested: "Counter[str]" = Counter()
+    survived: "Counter[str]" = Counter()
+    for entry in entries:
+        # neither says anything about how well the tests kill the mutator's mutations
+        if entry.mutator is None or entry.status in ("timed out", "equivalent"):
+            continue
+        tested[entry.mutator] += 1
+        survived[entry.mutator] += entry.status in ("survived", "uncovered")
+    return {
+        mutator: (survived[mutator] + DEFAULT_SURVIVAL_RATE * 2) / (count + 2)
+        for mutator, count in tested.items()
+    }
+
+
+@dataclass
+class Prioritizer:
+    """
+    Orders mutations so the most useful ones are tested first when not all of
+    them can be: mutations on changed lines, then those of the mutators whose
+    mutations survived the most, taking turns between files.
+    """
+
+    # accepts the mutations on changed lines
+    changed: Optional[MutantFilter] = None
+    survival_rates: Dict[str, float] = field(default_factory=dict)
+
+    def sort(self, mutations: Iterable[Mutation], *, config: Config) -> List[Mutation]:
+        by_file: Dict[Path, List[Tuple[_Key, Mutation]]] = {}
+        for mutation in mutations:
+            by_file.setdefault(mutation.context.file.path, []).append(
+                (self._get_key(mutation, config), mutation)
+            )
+
+        # the first mutation of each file, then the second one of each file, etc.
+        ranked: List[Tuple[Tuple[bool, int, float, int], Mutation]] = []
+        for file_index, file_mutations in enumerate(by_file.values()):
+            file_mutations.sort(key=lambda item: item[0])
+            for turn, ((unchanged, rate), mutation) in enumerate(file_mutations):
+                ranked.append(((unchanged, turn, rate, file_index), mutation))
+        return [mutation for _, mutation in sorted(ranked, key=lambda item: item[0])]
+
+    def _get_key(self, mutation: Mutation, config: Config) -> _Key:
+        changed = self.changed is not None and self.changed(mutation, config)
+        rate = self.survival_rates.get(mutation.mutator or "", DEFAULT_SURVIVAL_RATE)
+        return (not changed, -rate)
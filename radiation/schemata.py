@@ -0,0 +1,121 @@
+import ast
+from ast import AST, Compare, Constant, Eq, IfExp, Load, Name, NodeTransformer
+from collections import defaultdict
+from copy import deepcopy
+from typing import Dict, List, Mapping, Optional, Set, Tuple, cast
+
+from .mutation import Mutation
+from .source import unparse
+
+ACTIVE_MUTANT_ENV = "RADIATION_ACTIVE_MUTANT"
+ACTIVE_MUTANT_NAME = "_radiation_active_mutant"
+
+Span = Tuple[int, int, Optional[int], Optional[int]]
+
+# expressions under these nodes must stay literal, so they can't be switched
+_LITERAL_ONLY = tuple(
+    getattr(ast, name) for name in ("JoinedStr", "pattern") if hasattr(ast, name)
+)
+_WITH_DOCSTRING = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def _get_prelude() -> List[ast.stmt]:
+    return ast.parse(
+        f"import os as _radiation_os\n"
+        f"{ACTIVE_MUTANT_NAME} = _radiation_os.environ.get({ACTIVE_MUTANT_ENV!r})\n"
+    ).body
+
+
+def _get_docstring(node: AST) -> Optional[AST]:
+    body = getattr(node, "body", None) if isinstance(node, _WITH_DOCSTRING) else None
+    if (
+        body
+        and isinstance(body[0], ast.Expr)
+        and isinstance(body[0].value, Constant)
+        and isinstance(body[0].value.value, str)
+    ):
+        return body[0].value
+    return None
+
+
+def _get_span(mutation: Mutation) -> Span:
+    node = mutation.context.node
+    return (node.lineno, node.col_offset, node.end_lineno, node.end_col_offset)
+
+
+def _is_active(mutant_id: str) -> Compare:
+    return Compare(
+        left=Name(id=ACTIVE_MUTANT_NAME, ctx=Load()),
+        ops=[Eq()],
+        comparators=[Constant(value=mutant_id, kind=None)],
+    )
+
+
+class _SchemaTransformer(NodeTransformer):
+    def __init__(self, mutations: Mapping[str, Mutation]) -> None:
+        self.pending: Dict[Span, List[Tuple[str, Mutation]]] = defaultdict(list)
+        self.applied: Set[str] = set()
+        self.docstrings: Set[int] = set()
+        for mutant_id, mutation in mutations.items():
+            if isinstance(mutation.node, ast.expr):
+                self.pending[_get_span(mutation)].append((mutant_id, mutation))
+
+    def visit(self, node: AST) -> AST:
+        if isinstance(node, _LITERAL_ONLY) or id(node) in self.docstrings:
+            return node
+        if docstring := _get_docstring(node):
+            self.docstrings.add(id(docstring))
+
+        node = self.generic_visit(node)
+
+        if not isinstance(node, ast.expr) or not isinstance(
+            getattr(node, "ctx", Load()), Load
+        ):
+            return node
+
+        span = (
+            node.lineno,
+            node.col_offset,
+            node.end_lineno,
+            node.end_col_offset,
+        )
+        switched: ast.expr = node
+        for mutant_id, mutation in reversed(self.pending.pop(span, [])):
+            switched = IfExp(
+                test=_is_active(mutant_id),
+                body=cast(ast.expr, deepcopy(mutation.node)),
+                orelse=switched,
+            )
+            self.applied.add(mutant_id)
+        return switched
+
+
+def _get_prelude_index(module: ast.Module) -> int:
+    index = 1 if _get_docstring(module) else 0
+    body = module.body
+    while (
+        index < len(body)
+        and isinstance(body[index], ast.ImportFrom)
+        and getattr(body[index], "module", None) == "__future__"
+    ):
+        index += 1
+    return index
+
+
+def build_schema(code: str, mutations: Mapping[str, Mutation]) -> Tuple[str, Set[str]]:
+    """
+    Instruments `code` so that each mutation is switched on when the
+    RADIATION_ACTIVE_MUTANT environment variable is set to its id.
+
+    Returns the instrumented code and the ids of the mutations it contains,
+    mutations that cannot be switched at runtime (e.g. of statements, docstrings
+    or inside f-strings) are left out and need to be tested on their own.
+    """
+    transformer = _SchemaTransformer(mutations)
+    module = cast(ast.Module, transformer.visit(ast.parse(code)))
+
+    index = _get_prelude_index(module)
+    module.body[index:index] = _get_prelude()
+    ast.fix_missing_locations(module)
+
+    return unparse(module), transformer.applied
@@ -0,0 +1,239 @@
+import ast
+import hashlib
+import io
+import tokenize
+from ast import AST, Module
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional, Sequence, Tuple, Union
+
+from astunparse import unparse as _astunparse
+
+# nodes whose source can be put anywhere an expression goes without parentheses
+_ATOMIC = (
+    ast.Name,
+    ast.Constant,
+    ast.Attribute,
+    ast.Subscript,
+    ast.Call,
+    ast.List,
+    ast.Dict,
+    ast.Set,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+    ast.JoinedStr,
+)
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class SourceLines:
+    """
+    A file's text, indexed by line so positions from the AST (whose column
+    offsets count UTF-8 bytes) can be turned into string offsets cheaply.
+    """
+
+    __slots__ = ("text", "lines", "_starts", "_digest")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._digest: Optional[str] = None
+        self.lines = text.splitlines(keepends=True)
+        self._starts: List[int] = []
+        offset = 0
+        for line in self.lines:
+            self._starts.append(offset)
+            offset += len(line)
+
+    def __reduce__(self) -> Tuple[type, Tuple[str]]:
+        # the line index is rebuilt rather than pickled
+        return SourceLines, (self.text,)
+
+    @property
+    def digest(self) -> str:
+        # the hash of the text the mutations were generated from, which may
+        # differ from the file on disk if it changed since
+        if self._digest is None:
+            self._digest = hash_text(self.text)
+        return self._digest
+
+    def offset(self, lineno: int, col_offset: Optional[int]) -> int:
+        if lineno > len(self.lines):
+            return len(self.text)
+        line = self.lines[lineno - 1]
+        if not col_offset:
+            column = 0
+        elif line.isascii():
+            column = col_offset
+        else:
+            column = len(line.encode()[:col_offset].decode(errors="ignore"))
+        return self._starts[lineno - 1] + column
+
+    def span(
+        self,
+        lineno: int,
+        col_offset: int,
+        end_lineno: Optional[int],
+        end_col_offset: Optional[int],
+    ) -> Tuple[int, int]:
+        return (
+            self.offset(lineno, col_offset),
+            self.offset(end_lineno or lineno, end_col_offset),
+        )
+
+    def get_node_span(self, node: AST) -> Optional[Tuple[int, int]]:
+        if getattr(node, "end_lineno", None) is None:
+            return None
+        return self.span(
+            node.lineno,  # type: ignore
+            node.col_offset,  # type: ignore
+            node.end_lineno,  # type: ignore
+            node.end_col_offset,  # type: ignore
+        )
+
+    def get_segment(self, node: AST) -> Optional[str]:
+        span = self.get_node_span(node)
+        return self.text[span[0] : span[1]] if span else None
+
+    def splice(self, start: int, end: int, replacement: str) -> str:
+        return self.text[:start] + replacement + self.text[end:]
+
+
+def _get_tokens(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Returns the (string, start, end) of the operator and name tokens of
+    the expression `text`, comments left out.
+    """
+    # parenthesized so expressions spanning several lines tokenize
+    wrapped = f"({text}\n)"
+    starts = [0]
+    for line in wrapped.splitlines(keepends=True):
+        starts.append(starts[-1] + len(line))
+
+    tokens = []
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(wrapped).readline):
+            if token.type in (tokenize.OP, tokenize.NAME):
+                (start_row, start_col), (end_row, end_col) = token.start, token.end
+                tokens.append(
+                    (
+                        token.string,
+                        starts[start_row - 1] + start_col - 1,
+                        starts[end_row - 1] + end_col - 1,
+                    )
+                )
+    except (tokenize.TokenError, SyntaxError):
+        pass
+    return tokens
+
+
+def _find_tokens(
+    tokens: Sequence[Tuple[str, int, int]], words: List[str], start: int, end: int
+) -> Optional[Tuple[int, int]]:
+    gap = [token for token in tokens if start <= token[1] and token[2] <= end]
+    for index in range(len(gap) - len(words) + 1):
+        found = gap[index : index + len(words)]
+        if [string for string, _, _ in found] == words:
+            return found[0][1], found[-1][2]
+    return None
+
+
+def replace_tokens(
+    source: Optional[SourceLines],
+    node: AST,
+    replacements: Sequence[Tuple[Optional[AST], AST, str, str]],
+) -> Optional[str]:
+    """
+    Returns the source of `node` where, for each (before, after, token, new_token),
+    the first `token` between the `before` node (or the start of `node`)
+    and the `after` node is replaced.
+
+    Returns None when the source isn't available or a token isn't found.
+    """
+    if source is None or (span := source.get_node_span(node)) is None:
+        return None
+    start, end = span
+    tokens = [
+        (string, start + token_start, start + token_end)
+        for string, token_start, token_end in _get_tokens(source.text[start:end])
+    ]
+
+    parts = []
+    position = start
+    for before, after, token, new_token in replacements:
+        before_span = (start, start) if before is None else source.get_node_span(before)
+        after_span = source.get_node_span(after)
+        if before_span is None or after_span is None:
+            return None
+        token_span = _find_tokens(tokens, token.split(), before_span[1], after_span[0])
+        if token_span is None:
+            return None
+        parts += [source.text[position : token_span[0]], new_token]
+        position = token_span[1]
+    parts.append(source.text[position:end])
+    return "".join(parts)
+
+
+def parenthesize(text: str, node: AST) -> str:
+    return text if isinstance(node, _ATOMIC) else f"({text})"
+
+
+def unparse(node: AST) -> str:
+    if hasattr(ast, "unparse"):
+        text = ast.unparse(node)
+        return parenthesize(text, node) if isinstance(node, ast.expr) else text
+    return _astunparse(node).strip("\n")
+
+
+@dataclass
+class _CachedFile:
+    # (mtime in ns, size) of the file when it was read
+    stamp: Tuple[int, int]
+    source: SourceLines
+    tree: Optional[Module] = None
+
+
+@dataclass
+class SourceCache:
+    """
+    Reads and parses each file once, keeping the `max_size` most recently
+    used files. A file is read again if its mtime or size changes.
+    """
+
+    max_size: int = 256
+    _files: "OrderedDict[Path, _CachedFile]" = field(
+        init=False, default_factory=OrderedDict, repr=False, compare=False
+    )
+    _lock: Lock = field(init=False, default_factory=Lock, repr=False, compare=False)
+
+    def _get_file(self, path: Path) -> _CachedFile:
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._files.get(path)
+            if cached and cached.stamp == stamp:
+                self._files.move_to_end(path)
+                return cached
+
+        cached = _CachedFile(stamp=stamp, source=SourceLines(path.read_text()))
+        with self._lock:
+            self._files[path] = cached
+            self._files.move_to_end(path)
+            while len(self._files) > self.max_size:
+                self._files.popitem(last=False)
+        return cached
+
+    def get_source(self, path: Union[str, Path]) -> SourceLines:
+        return self._get_file(Path(path)).source
+
+    def get_tree(self, path: Union[str, Path]) -> Module:
+        cached = self._get_file(Path(path))
+        if cached.tree is None:
+            cached.tree = ast.parse(cached.source.text)
+        return cached.tree
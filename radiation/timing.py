@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+from .types import TestsResult
+
+# appended to the run command (which must be a pytest invocation)
+# to report how long every test takes
+DURATIONS_ARGS = ("--durations=0", "--durations-min=0")
+
+_DURATION_LINE = re.compile(
+    r"^(\d+(?:\.\d+)?)s (?:setup|call|teardown)\s+(.+?)\s*$", re.MULTILINE
+)
+
+
+def get_test_durations(output: Optional[str]) -> Dict[str, float]:
+    """
+    Returns the duration in seconds of each test in pytest's durations report,
+    setup and teardown included.
+    """
+    durations: Dict[str, float] = {}
+    for match in _DURATION_LINE.finditer(output or ""):
+        seconds, test = match.groups()
+        durations[test] = durations.get(test, 0.0) + float(seconds)
+    return durations
+
+
+def get_timeout(expected: float, *, multiplier: float, floor: float) -> float:
+    return max(expected * multiplier, floor)
+
+
+@dataclass
+class BaselineTimings:
+    """
+    How long the tests took in the baseline run.
+    """
+
+    # test id -> seconds
+    durations: Dict[str, float]
+    # seconds spent outside of any test (e.g. starting up and collecting)
+    overhead: float
+
+    @classmethod
+    def from_baseline(cls, result: TestsResult) -> Optional[BaselineTimings]:
+        durations = get_test_durations(result.output)
+        if not durations:
+            return None
+        overhead = result.duration.total_seconds() - sum(durations.values())
+        return cls(durations=durations, overhead=max(overhead, 0.0))
+
+    def get_expected(self, tests: Sequence[str]) -> Optional[float]:
+        """
+        Returns how long running `tests` is expected to take,
+        or None if one of them didn't run in the baseline.
+        """
+        if any(test not in self.durations for test in tests):
+            return None
+        return self.overhead + sum(self.durations[test] for test in tests)
@@ -1,9 +1,12 @@
 import datetime as dt
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Literal, Optional
+from typing import TYPE_CHECKING, Any, Literal, Optional
 
-ResultStatus = Literal["survived", "killed", "timed out"]
+if TYPE_CHECKING:
+    from .source import SourceLines
+
+ResultStatus = Literal["survived", "killed", "timed out", "uncovered", "equivalent"]
 
 
 @dataclass
@@ -11,6 +14,7 @@ class TestsResult:
     duration: dt.timedelta
     status: ResultStatus
     output: Optional[str] = None
+    cached: bool = False
 
 
 @dataclass(frozen=True)
@@ -24,6 +28,8 @@ class NodeContext:
 @dataclass(frozen=True)
 class FileContext:
     path: Path
+    # the file's source, available to mutators producing replacement source
+    source: Optional["SourceLines"] = field(default=None, repr=False, compare=False)
 
 
 @dataclass(frozen=True)
@@ -2,11 +2,13 @@ import os
 from configparser import ConfigParser
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Union
+from typing import Any, Dict, List, Optional, Sequence, Union, cast
 
 import click
 import toml
 
+from radiation.runners.snapshot import SnapshotMode
+
 
 @dataclass(frozen=True)
 class CLIConfig:
@@ -14,9 +16,28 @@ class CLIConfig:
     include: List[str] = field(default_factory=lambda: ["."])
     run_command: str = "pytest"
     tests_dir: str = "tests"
+    exclude: List[str] = field(default_factory=list)
+    git_files: bool = False
     tests_timeout: Optional[float] = None
+    timeout_multiplier: float = 1.5
+    timeout_floor: float = 1.0
+    memory_limit: Optional[int] = None
+    cpu_limit: Optional[int] = None
     diff_command: Optional[str] = None
     line_limit: Optional[int] = None
+    sample: Optional[int] = None
+    time_budget: Optional[float] = None
+    sample_base: str = "HEAD"
+    jobs: int = 1
+    reuse_sandboxes: bool = False
+    snapshot: SnapshotMode = "copy"
+    schemata: bool = False
+    fork: bool = False
+    select_tests: bool = False
+    fail_fast: bool = False
+    kill_history: bool = False
+    cache: bool = False
+    screen_equivalent: bool = True
 
 
 DEFAULT_SECTIONS = ("radiation", "settings")
@@ -54,10 +75,29 @@ def _read_toml(
                 include=_toml_parse_list(config["include"]),
                 run_command=config["run_command"],
                 tests_dir=config["tests_dir"],
+                exclude=_toml_parse_list(config.get("exclude", [])),
+                git_files=config.get("git_files", False),
                 project_root=Path(path).parent,
                 tests_timeout=config.get("tests_timeout"),
+                timeout_multiplier=config.get("timeout_multiplier", 1.5),
+                timeout_floor=config.get("timeout_floor", 1.0),
+                memory_limit=config.get("memory_limit"),
+                cpu_limit=config.get("cpu_limit"),
                 diff_command=config.get("diff_command"),
                 line_limit=_parse_limit(config.get("line_limit")),
+                sample=config.get("sample"),
+                time_budget=config.get("time_budget"),
+                sample_base=config.get("sample_base", "HEAD"),
+                jobs=config.get("jobs", 1),
+                reuse_sandboxes=config.get("reuse_sandboxes", False),
+                snapshot=config.get("snapshot", "copy"),
+                schemata=config.get("schemata", False),
+                fork=config.get("fork", False),
+                select_tests=config.get("select_tests", False),
+                fail_fast=config.get("fail_fast", False),
+                kill_history=config.get("kill_history", False),
+                cache=config.get("cache", False),
+                screen_equivalent=config.get("screen_equivalent", True),
             )
     return None
 
@@ -77,12 +117,39 @@ def _read_cfg(
                 include=_cfg_parse_list(parser.get(section, "include")),
                 run_command=parser.get(section, "run_command"),
                 tests_dir=parser.get(section, "tests_dir"),
+                exclude=_cfg_parse_list(parser.get(section, "exclude", fallback="")),
+                git_files=parser.getboolean(section, "git_files", fallback=False),
                 project_root=Path(path).parent,
                 tests_timeout=parser.getfloat(section, "tests_timeout", fallback=None),
+                timeout_multiplier=parser.getfloat(
+                    section, "timeout_multiplier", fallback=1.5
+                ),
+                timeout_floor=parser.getfloat(section, "timeout_floor", fallback=1.0),
+                memory_limit=parser.getint(section, "memory_limit", fallback=None),
+                cpu_limit=parser.getint(section, "cpu_limit", fallback=None),
                 diff_command=parser.get(section, "diff_command", fallback=None),
                 line_limit=_parse_limit(
                     parser.get(section, "line_limit", fallback=None)
                 ),
+                sample=parser.getint(section, "sample", fallback=None),
+                time_budget=parser.getfloat(section, "time_budget", fallback=None),
+                sample_base=parser.get(section, "sample_base", fallback="HEAD"),
+                jobs=parser.getint(section, "jobs", fallback=1),
+                reuse_sandboxes=parser.getboolean(
+                    section, "reuse_sandboxes", fallback=False
+                ),
+                snapshot=cast(
+                    SnapshotMode, parser.get(section, "snapshot", fallback="copy")
+                ),
+                schemata=parser.getboolean(section, "schemata", fallback=False),
+                fork=parser.getboolean(section, "fork", fallback=False),
+                select_tests=parser.getboolean(section, "select_tests", fallback=False),
+                fail_fast=parser.getboolean(section, "fail_fast", fallback=False),
+                kill_history=parser.getboolean(section, "kill_history", fallback=False),
+                cache=parser.getboolean(section, "cache", fallback=False),
+                screen_equivalent=parser.getboolean(
+                    section, "screen_equivalent", fallback=True
+                ),
             )
     return None
 
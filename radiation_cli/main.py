@@ -1,24 +1,45 @@
-from collections import defaultdict
+import shlex
+import subprocess
+import time
+from collections import Counter, defaultdict
 from dataclasses import replace
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import click
 from click import ClickException
 
 from radiation import Radiation
+from radiation.cache import DEFAULT_CACHE_PATH, ResultCache, hash_files
 from radiation.config import Config
+from radiation.equivalence import EquivalenceChecker
+from radiation.filters.duplicate import DuplicateFilter
 from radiation.filters.line_limit import LineLimitFilter
 from radiation.filters.patch import PatchFilter
+from radiation.filters.shard import ShardFilter, get_missing_shards
+from radiation.history import DEFAULT_HISTORY_PATH, KillHistory
+from radiation.journal import (
+    DEFAULT_JOURNAL_PATH,
+    Journal,
+    JournalEntry,
+    JournalKey,
+    read_journal,
+    write_journal,
+)
 from radiation.mutation import Mutation
-from radiation.runners import TempDirRunner
-from radiation.types import ResultStatus
+from radiation.runners import SchemataRunner, TempDirRunner
+from radiation.runners.fork import ForkRunner
+from radiation.runners.limits import ResourceLimits
+from radiation.sampling import Prioritizer, get_survival_rates
+from radiation.timing import get_timeout
+from radiation.types import ResultStatus, TestsResult
 from radiation_cli.config import (
     CLIConfig,
     read_config,
     read_default_config,
     validate_path_suffix,
 )
-from radiation_cli.utils import dump_mutation, get_mutation_loc
+from radiation_cli.utils import dump_journal_entry, dump_mutation, get_mutation_loc
 
 
 def _override_config(config: CLIConfig, overrides: Dict[str, Any]) -> CLIConfig:
@@ -26,6 +47,115 @@ def _override_config(config: CLIConfig, overrides: Dict[str, Any]) -> CLIConfig:
     return replace(config, **overrides)
 
 
+def _get_pytest_args(run_command: str) -> List[str]:
+    command = shlex.split(run_command)
+    for index, arg in enumerate(command):
+        if Path(arg).name == "pytest":
+            return command[index + 1 :]
+    raise ClickException("--fork requires the run command to be a pytest invocation")
+
+
+def _get_limits(config: CLIConfig) -> ResourceLimits:
+    return ResourceLimits(
+        memory=config.memory_limit * 2**20 if config.memory_limit else None,
+        cpu=config.cpu_limit,
+    )
+
+
+def _check_fork_options(config: CLIConfig) -> None:
+    # these need a sandbox or the run command, which the fork runner doesn't use
+    incompatible = [
+        option
+        for option, enabled in [
+            ("--schemata", config.schemata),
+            ("--select-tests", config.select_tests),
+            ("--kill-history", config.kill_history),
+            ("--reuse-sandboxes", config.reuse_sandboxes),
+            ("--snapshot", config.snapshot != "copy"),
+        ]
+        if enabled
+    ]
+    if incompatible:
+        raise click.UsageError(
+            f"--fork cannot be combined with {', '.join(incompatible)}"
+        )
+
+
+def _get_runner(
+    config: CLIConfig, *, history: Optional[KillHistory] = None
+) -> Union[TempDirRunner, ForkRunner]:
+    if config.fork:
+        _check_fork_options(config)
+        pytest_args = _get_pytest_args(config.run_command)
+        return ForkRunner(
+            pytest_args=[*pytest_args, "-x"] if config.fail_fast else pytest_args,
+            limits=_get_limits(config),
+        )
+    return (SchemataRunner if config.schemata else TempDirRunner)(
+        run_command=config.run_command,
+        reuse_sandboxes=config.reuse_sandboxes,
+        snapshot=config.snapshot,
+        select_tests=config.select_tests,
+        fail_fast=config.fail_fast,
+        history=history,
+        timeout_multiplier=config.timeout_multiplier,
+        timeout_floor=config.timeout_floor,
+        limits=_get_limits(config),
+    )
+
+
+def _parse_shard(spec: Optional[str]) -> Optional[ShardFilter]:
+    try:
+        return ShardFilter.parse(spec) if spec else None
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+def _get_changed_lines_filter(config: CLIConfig) -> Optional[PatchFilter]:
+    # the paths are made relative to the project root, which may be a
+    # subdirectory of the repository
+    command = ["git", "diff", "--relative", "--merge-base", config.sample_base]
+    try:
+        completed_process = subprocess.run(
+            command,
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=config.project_root,
+        )
+    except (subprocess.CalledProcessError, OSError) as e:
+        # outside a repository, git also prints the usage of `git diff --no-index`
+        error = (getattr(e, "stderr", None) or str(e)).strip().splitlines()
+        _warn(
+            f"cannot diff against {config.sample_base!r}, changed lines don't come"
+            f" first: {error[0] if error else e}"
+        )
+        return None
+    return PatchFilter(patch=completed_process.stdout)
+
+
+def _until(deadline: float, mutations: Iterable[Mutation]) -> Iterator[Mutation]:
+    # the mutations already being tested finish, no new one starts
+    for mutation in mutations:
+        if time.monotonic() >= deadline:
+            return
+        yield mutation
+
+
+def _get_cache_salt(config: CLIConfig, radiation: Radiation) -> str:
+    tests = radiation.find_files(config.tests_dir)
+    return f"{config.run_command}\0{config.select_tests}\0{hash_files(tests)}"
+
+
+def _warn(message: str) -> None:
+    click.secho(f"Warning: {message}", fg="yellow", err=True)
+
+
+def _describe(status: str, result: TestsResult, *notes: str) -> str:
+    notes = (*notes, "cached") if result.cached else notes
+    return f"{status} ({', '.join(notes)})" if notes else status
+
+
 pass_config = click.make_pass_decorator(CLIConfig)
 
 
@@ -61,12 +191,60 @@ pass_config = click.make_pass_decorator(CLIConfig)
     required=False,
     show_default="tests",
 )
+@click.option(
+    "-e",
+    "--exclude",
+    type=str,
+    multiple=True,
+    help="paths not to take files for mutation from, as .gitignore-style"
+    " patterns, can be given multiple times",
+    callback=lambda ctx, param, value: list(value) or None,
+)
+@click.option(
+    "--git-files/--no-git-files",
+    default=None,
+    help="take the files for mutation from `git ls-files` (tracked, or untracked"
+    " and not ignored) instead of walking the project",
+    show_default="no-git-files",
+)
 @click.option(
     "--tests-timeout",
     type=float,
     help="maximum time for each test suite to run in seconds",
     required=False,
 )
+@click.option(
+    "--timeout-multiplier",
+    type=click.FloatRange(min=1),
+    help="how many times longer than in the baseline run the tests may take"
+    " against a mutation before it's considered timed out, with --select-tests"
+    " only the selected tests' baseline durations count",
+    required=False,
+    show_default="1.5",
+)
+@click.option(
+    "--timeout-floor",
+    type=click.FloatRange(min=0),
+    help="minimum timeout in seconds for the tests against a mutation, so tests"
+    " that are fast in the baseline run don't time out on a loaded machine",
+    required=False,
+    show_default="1",
+)
+@click.option(
+    "--memory-limit",
+    type=click.IntRange(min=1),
+    help="maximum address space in MiB of each process running the tests",
+    required=False,
+    show_default="none",
+)
+@click.option(
+    "--cpu-limit",
+    type=click.IntRange(min=1),
+    help="maximum CPU time in seconds of each process running the tests, mutations"
+    " exceeding it are considered timed out",
+    required=False,
+    show_default="none",
+)
 @click.option(
     "--run-command",
     type=str,
@@ -88,6 +266,118 @@ pass_config = click.make_pass_decorator(CLIConfig)
     required=False,
     show_default="none",
 )
+@click.option(
+    "--sample",
+    type=click.IntRange(min=1),
+    help="only test this many mutations, the ones on changed lines (see"
+    " --sample-base) first, then those of the mutators whose mutations survived"
+    " the most in the last run, taking turns between files. Every mutation is"
+    " generated and ranked before the first one is tested",
+    required=False,
+    show_default="all",
+)
+@click.option(
+    "--time-budget",
+    type=click.FloatRange(min=0),
+    help="seconds after which no more mutations are tested, they are tested in the"
+    " same order as with --sample (so every mutation is generated and ranked"
+    " before the first one is tested)",
+    required=False,
+    show_default="none",
+)
+@click.option(
+    "--sample-base",
+    type=str,
+    help="git ref whose changes come first with --sample and --time-budget, the"
+    " lines changed since the merge base of the ref and HEAD, committed or not"
+    " (e.g. origin/main in CI). With --diff-command, its diff is used instead",
+    required=False,
+    show_default="HEAD",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="number of mutations to test concurrently, and of processes"
+    " generating mutations",
+    required=False,
+    show_default="1",
+)
+@click.option(
+    "--reuse-sandboxes/--no-reuse-sandboxes",
+    default=None,
+    help="copy the project once per job and restore the mutated file after"
+    " each test run, instead of copying the project for every mutation",
+    show_default="no-reuse-sandboxes",
+)
+@click.option(
+    "--snapshot",
+    type=click.Choice(["copy", "link"]),
+    help="how to copy the project into a sandbox, 'link' uses reflinks or"
+    " hardlinks when the temp dir is on the project's filesystem (see TMPDIR),"
+    " except for caches like .pytest_cache and __pycache__, and is only safe"
+    " when the tests don't modify other project files in place",
+    required=False,
+    show_default="copy",
+)
+@click.option(
+    "--schemata/--no-schemata",
+    default=None,
+    help="instrument each file once with all of its mutations and switch between"
+    " them with the RADIATION_ACTIVE_MUTANT environment variable",
+    show_default="no-schemata",
+)
+@click.option(
+    "--fork/--no-fork",
+    default=None,
+    help="collect the tests once in a pytest process and fork it for each"
+    " mutation, patching the mutated module in memory (requires the run"
+    " command to be a pytest invocation). The tests run in the project itself"
+    " rather than in a sandbox, so files they write end up in the project."
+    " Cannot be combined with --schemata, --select-tests, --kill-history,"
+    " --reuse-sandboxes or --snapshot",
+    show_default="no-fork",
+)
+@click.option(
+    "--select-tests/--no-select-tests",
+    default=None,
+    help="record which tests execute each line during the baseline run and only"
+    " run those against each mutation, mutations no test executes are reported"
+    " without running the tests (requires the run command to be a pytest"
+    " invocation and pytest-cov). Test paths in the run command are replaced"
+    " by the selected tests",
+    show_default="no-select-tests",
+)
+@click.option(
+    "--fail-fast/--no-fail-fast",
+    default=None,
+    help="stop testing a mutation at the first failing test (requires the run"
+    " command to be a pytest invocation)",
+    show_default="no-fail-fast",
+)
+@click.option(
+    "--kill-history/--no-kill-history",
+    default=None,
+    help="remember which tests killed mutations on each line (in"
+    f" {DEFAULT_HISTORY_PATH}) and run the tests that killed nearby mutations"
+    " first (requires the run command to be a pytest invocation)",
+    show_default="no-kill-history",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=None,
+    help="reuse the results of mutations whose file, tests and run command"
+    f" haven't changed since they were last tested (stored in {DEFAULT_CACHE_PATH})",
+    show_default="no-cache",
+)
+@click.option(
+    "--screen-equivalent/--no-screen-equivalent",
+    default=None,
+    help="compile each mutated module and report the mutations whose bytecode"
+    " is the same as the original's (ignoring line numbers and docstrings) as"
+    " equivalent, without running the tests",
+    show_default="screen-equivalent",
+)
 @click.pass_context
 def cli(
     ctx: click.Context,
@@ -105,8 +395,23 @@ def cli(
 
 
 @cli.command(help="run the mutation testing pipeline")
+@click.option(
+    "--resume",
+    is_flag=True,
+    help=f"skip the mutations already tested according to {DEFAULT_JOURNAL_PATH},"
+    " continuing a run that was interrupted",
+)
+@click.option(
+    "--shard",
+    help="only test the mutations of shard K out of N (e.g. 1/8), chosen by"
+    " hashing their file, span and mutator, see the merge command",
+    callback=lambda ctx, param, value: _parse_shard(value),
+)
 @pass_config
-def run(config: CLIConfig) -> None:
+def run(config: CLIConfig, resume: bool, shard: Optional[ShardFilter]) -> None:
+    deadline = (
+        None if config.time_budget is None else time.monotonic() + config.time_budget
+    )
     patch = (
         PatchFilter.from_shell_command(
             config.diff_command, project_dir=config.project_root
@@ -114,57 +419,209 @@ def run(config: CLIConfig) -> None:
         if config.diff_command
         else None
     )
+    duplicates = DuplicateFilter()
     limiter = LineLimitFilter(config.line_limit) if config.line_limit else None
 
+    history_path = config.project_root / DEFAULT_HISTORY_PATH
+    history = KillHistory.load(history_path) if config.kill_history else None
+
+    runner = _get_runner(config, history=history)
     radiation = Radiation(
-        runner=TempDirRunner(run_command=config.run_command),
-        filters=list(filter(None, [patch, limiter])),
+        runner=runner,
+        # duplicates don't count towards the line limit, and the shard is
+        # chosen last so every shard limits the lines the same way
+        filters=list(filter(None, [patch, duplicates, limiter, shard])),
         config=Config(project_root=config.project_root),
+        equivalence=EquivalenceChecker() if config.screen_equivalent else None,
     )
+    cache_path = config.project_root / DEFAULT_CACHE_PATH
+    cache = (
+        ResultCache.load(cache_path, salt=_get_cache_salt(config, radiation))
+        if config.cache
+        else None
+    )
+    radiation = replace(radiation, cache=cache)
 
-    mutations = [
-        mutation
-        for path in radiation.find_files(config.include, exclude=config.tests_dir)
-        for mutation in radiation.gen_mutations(path)
-    ]
+    mutations = radiation.gen_mutations_many(
+        radiation.find_files(
+            config.include,
+            exclude=config.tests_dir,
+            ignore=config.exclude,
+            git_files=config.git_files,
+        ),
+        jobs=config.jobs,
+    )
+
+    journal_path = config.project_root / DEFAULT_JOURNAL_PATH
+    # the previous run's results rank the mutators when sampling
+    previous = list(read_journal(journal_path)) if journal_path.exists() else []
+    journal = (Journal.resume if resume else Journal.create)(
+        journal_path, shard=str(shard) if shard else None
+    )
+
+    # killed and equivalent mutations are only counted,
+    # so memory doesn't grow with their number
+    results: Dict[ResultStatus, List[Tuple[Mutation, TestsResult]]] = defaultdict(list)
+    counts: "Counter[str]" = Counter()
+
+    def record(mutation: Mutation, result: TestsResult, *, resumed: bool) -> None:
+        counts["resumed" if resumed else "tested"] += 1
+        counts["cached"] += result.cached
+        counts["equivalent"] += result.status == "equivalent"
+        if result.status not in ("killed", "equivalent"):
+            results[result.status].append((mutation, result))
 
-    click.echo(f"Generated {len(mutations)} mutations")
+    def skip_journaled(mutations: Iterable[Mutation]) -> Iterator[Mutation]:
+        for mutation in mutations:
+            if journaled := journal.get(mutation, config=radiation.config):
+                record(mutation, journaled, resumed=True)
+            else:
+                yield mutation
 
-    click.echo("Running baseline tests ..")
-    result = radiation.run_baseline_tests()
+    pending = skip_journaled(mutations)
 
-    if result.status == "killed":
-        click.secho(result.output, fg="red", err=True)
-        raise ClickException(
-            "Cannot test mutations when the baseline "
-            "tests are failing (test command output printed above)"
+    total = None
+    if config.sample or deadline is not None:
+        prioritizer = Prioritizer(
+            changed=patch or _get_changed_lines_filter(config),
+            survival_rates=get_survival_rates(previous),
         )
+        ranked = prioritizer.sort(pending, config=radiation.config)
+        total = len(ranked) + counts["resumed"]
+        pending = iter(ranked[: config.sample])
 
-    baseline_timeout = result.duration.total_seconds() * 1.5
-    timeout = (
-        min(baseline_timeout, config.tests_timeout)
-        if config.tests_timeout
-        else baseline_timeout
-    )
+    # the runner's sandboxes and processes are cleaned up on errors and Ctrl-C too
+    try:
+        if isinstance(runner, SchemataRunner):
+            # the instrumented files need every mutation up front
+            schemata_mutations = list(pending)
+            runner.prepare(schemata_mutations, config=radiation.config)
+            pending = iter(schemata_mutations)
+
+        click.echo("Running baseline tests ..")
+        result = radiation.run_baseline_tests()
+
+        if result.status == "killed":
+            click.secho(result.output, fg="red", err=True)
+            raise ClickException(
+                "Cannot test mutations when the baseline "
+                "tests are failing (test command output printed above)"
+            )
+
+        baseline_timeout = get_timeout(
+            result.duration.total_seconds(),
+            multiplier=config.timeout_multiplier,
+            floor=config.timeout_floor,
+        )
+        timeout = (
+            min(baseline_timeout, config.tests_timeout)
+            if config.tests_timeout
+            else baseline_timeout
+        )
+
+        if deadline is not None:
+            pending = _until(deadline, pending)
 
-    results: Dict[ResultStatus, List[Mutation]] = defaultdict(list)
+        # the number of mutations isn't known until they are all generated
+        with click.progressbar(
+            radiation.test_mutations(pending, timeout=timeout, jobs=config.jobs),
+            label="Running tests",
+            show_pos=True,
+            item_show_func=lambda item: get_mutation_loc(
+                item[0] if item else None, config=config
+            ),
+        ) as progress_bar:
+            for mutation, result in progress_bar:
+                journal.append(mutation, result, config=radiation.config)
+                record(mutation, result, resumed=False)
+    finally:
+        runner.cleanup()
 
-    with click.progressbar(
-        mutations,
-        label="Running tests",
-        show_percent=False,
-        item_show_func=lambda mutation: get_mutation_loc(mutation, config=config),
-    ) as progress_bar:
+    if history is not None:
+        history.save(history_path)
 
-        for mutation in progress_bar:
-            result = radiation.test_mutation(mutation, timeout=timeout)
-            results[result.status].append(mutation)
+    click.echo(f"Tested {counts['tested']} mutations")
+    if duplicates.removed:
+        click.echo(f"Removed {duplicates.removed} duplicate mutations")
+    if resume:
+        click.echo(f"Skipped {counts['resumed']} mutations tested before resuming")
+    if total is not None:
+        covered = counts["tested"] + counts["resumed"]
+        share = covered / total if total else 1
+        click.echo(f"Covered {covered} of {total} mutations ({share:.0%})")
+    if cache is not None:
+        cache.prune(config=radiation.config)
+        cache.save(cache_path)
+        click.echo(f"Reused {counts['cached']} cached results")
+    if counts["equivalent"]:
+        click.echo(
+            f"Found {counts['equivalent']} equivalent mutations, the tests didn't run"
+        )
+
+    for mutation, result in results["survived"]:
+        dump_mutation(mutation, status=_describe("surviving", result), config=config)
+
+    for mutation, result in results["uncovered"]:
+        dump_mutation(
+            mutation, status=_describe("surviving", result, "uncovered"), config=config
+        )
+
+    for mutation, result in results["timed out"]:
+        dump_mutation(mutation, status=_describe("timed out", result), config=config)
+
+
+@cli.command(help="combine the journals of runs on different shards into one report")
+@click.argument(
+    "journals", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False)
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False),
+    help="also write the combined journal to this file",
+)
+@pass_config
+def merge(config: CLIConfig, journals: Tuple[str, ...], output: Optional[str]) -> None:
+    entries: Dict[JournalKey, JournalEntry] = {}
+    # shard -> number of journals with results of it
+    shards: "Counter[str]" = Counter()
+    for journal in journals:
+        journal_shards = set()
+        for entry in read_journal(journal):
+            entries[entry.key] = entry
+            journal_shards.add(entry.shard)
+        shards.update(filter(None, journal_shards))
+        if None in journal_shards:
+            _warn(f"{journal} doesn't come from a sharded run")
+    if output:
+        write_journal(output, entries.values())
 
-    for mutation in results["survived"]:
-        dump_mutation(mutation, status="surviving", config=config)
+    for shard, count in shards.items():
+        if count > 1:
+            _warn(f"shard {shard} is in {count} journals")
+    if missing := get_missing_shards(map(ShardFilter.parse, shards)):
+        _warn(
+            f"no results of shard {', '.join(map(str, missing))},"
+            " the report is incomplete unless they had no mutations"
+        )
+
+    click.echo(f"Merged {len(journals)} journals")
+    click.echo(f"Tested {len(entries)} mutations")
+    equivalent = sum(entry.status == "equivalent" for entry in entries.values())
+    if equivalent:
+        click.echo(f"Found {equivalent} equivalent mutations, the tests didn't run")
 
-    for mutation in results["timed out"]:
-        dump_mutation(mutation, status="timed out", config=config)
+    ordered = sorted(
+        entries.values(), key=lambda entry: (entry.path, entry.lineno, entry.col_offset)
+    )
+    for status, description in [
+        ("survived", "surviving"),
+        ("uncovered", "surviving (uncovered)"),
+        ("timed out", "timed out"),
+    ]:
+        for entry in ordered:
+            if entry.status == status:
+                dump_journal_entry(entry, status=description, config=config)
 
 
 if __name__ == "__main__":
@@ -1,18 +1,17 @@
-from pathlib import Path
-from typing import Optional, Union
+from typing import Optional
 
 import click
 
-from radiation.mutation import Mutation, apply_mutation_on_string
+from radiation.journal import JournalEntry, get_digest
+from radiation.mutation import (
+    Mutation,
+    apply_mutation_on_string,
+    get_original_source,
+)
+from radiation.source import SourceLines
 from radiation_cli.config import CLIConfig
 
 
-def is_relative_to(path: Union[str, Path], parent: Union[str, Path]) -> bool:
-    assert Path(path).is_absolute()
-    assert Path(parent).is_absolute()
-    return Path(parent) in Path(path).parents
-
-
 def get_mutation_loc(mutation: Optional[Mutation], *, config: CLIConfig) -> str:
     if not mutation:
         return ""
@@ -20,22 +19,51 @@ def get_mutation_loc(mutation: Optional[Mutation], *, config: CLIConfig) -> str:
     return f"{rel_path}:{mutation.context.node.lineno}"
 
 
-def dump_mutation(
-    mutation: Mutation, *, status: str, config: CLIConfig, context_lines: int = 2
-) -> None:
-    path = mutation.context.file.path
-    lineno = mutation.context.node.lineno
-
-    lines = apply_mutation_on_string(path.read_text(), mutation).splitlines()
+def _dump(text: str, *, lineno: int, loc: str, status: str, context_lines: int) -> None:
+    lines = text.splitlines()
 
     start = max(0, lineno - context_lines - 1)
     end = min(len(lines), lineno + context_lines)
 
     click.echo("")
-    click.secho(
-        f"{status.capitalize()} mutant in {get_mutation_loc(mutation, config=config)}",
-        bold=True,
-    )
+    click.secho(f"{status.capitalize()} mutant in {loc}", bold=True)
     for index, line in enumerate(lines[start:end]):
         curr_lineno = index + start + 1
         click.secho(f"{curr_lineno} {line}", bold=curr_lineno == lineno)
+
+
+def dump_mutation(
+    mutation: Mutation, *, status: str, config: CLIConfig, context_lines: int = 2
+) -> None:
+    _dump(
+        apply_mutation_on_string(get_original_source(mutation), mutation),
+        lineno=mutation.context.node.lineno,
+        loc=get_mutation_loc(mutation, config=config),
+        status=status,
+        context_lines=context_lines,
+    )
+
+
+def dump_journal_entry(
+    entry: JournalEntry, *, status: str, config: CLIConfig, context_lines: int = 2
+) -> None:
+    path = config.project_root / entry.path
+    loc = f"{entry.path}:{entry.lineno}"
+    if not path.exists() or get_digest(path) != entry.digest:
+        # the mutated file isn't the one that was tested, only the change is known
+        click.echo("")
+        click.secho(f"{status.capitalize()} mutant in {loc} (file changed)", bold=True)
+        click.echo(entry.replacement)
+        return
+
+    source = SourceLines(path.read_text())
+    start, end = source.span(
+        entry.lineno, entry.col_offset, entry.end_lineno, entry.end_col_offset
+    )
+    _dump(
+        source.splice(start, end, entry.replacement),
+        lineno=entry.lineno,
+        loc=loc,
+        status=status,
+        context_lines=context_lines,
+    )
@@ -0,0 +1,154 @@
+import datetime as dt
+from pathlib import Path
+
+from radiation import Radiation
+from radiation.cache import ResultCache, hash_files
+from radiation.config import Config
+from radiation.mutation import Mutation
+from radiation.runners import TempDirRunner
+from radiation.types import Context, FileContext, NodeContext
+from radiation.types import TestsResult as RadiationTestsResult
+
+from .utils import get_node_from_expr
+
+
+def _mutation(path: Path, expr: str = "2") -> Mutation:
+    return Mutation(
+        node=get_node_from_expr(expr),
+        tree=get_node_from_expr(expr),
+        context=Context(
+            node=NodeContext(lineno=1, end_lineno=1, col_offset=4, end_col_offset=5),
+            file=FileContext(path=path),
+        ),
+    )
+
+
+def test_result_cache(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("a = 1")
+    config = Config(project_root=tmp_path)
+
+    cache = ResultCache()
+    cache.set(
+        _mutation(tmp_path / "code.py"),
+        RadiationTestsResult(
+            duration=dt.timedelta(seconds=2), status="killed", output="..."
+        ),
+        config=config,
+    )
+
+    assert cache.get(
+        _mutation(tmp_path / "code.py"), config=config
+    ) == RadiationTestsResult(
+        duration=dt.timedelta(seconds=2), status="killed", cached=True
+    )
+    assert cache.get(_mutation(tmp_path / "code.py", "3"), config=config) is None
+
+
+def test_result_cache_skips_timeouts(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("a = 1")
+    config = Config(project_root=tmp_path)
+
+    cache = ResultCache()
+    cache.set(
+        _mutation(tmp_path / "code.py"),
+        RadiationTestsResult(duration=dt.timedelta(seconds=2), status="timed out"),
+        config=config,
+    )
+
+    assert cache.get(_mutation(tmp_path / "code.py"), config=config) is None
+
+
+def test_result_cache_key(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("a = 1")
+    config = Config(project_root=tmp_path)
+    key = ResultCache().get_key(_mutation(tmp_path / "code.py"), config=config)
+
+    assert (
+        ResultCache(salt="other").get_key(
+            _mutation(tmp_path / "code.py"), config=config
+        )
+        != key
+    )
+
+    (tmp_path / "code.py").write_text("a = 1  # changed")
+    assert ResultCache().get_key(_mutation(tmp_path / "code.py"), config=config) != key
+
+
+def test_result_cache_key_hashes_generated_source(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("a = 1")
+    config = Config(project_root=tmp_path)
+    radiation = Radiation(runner=TempDirRunner(run_command=""), config=config)
+    mutation = next(iter(radiation.gen_mutations(tmp_path / "code.py")))
+    key = ResultCache().get_key(mutation, config=config)
+
+    # the key is of the source the mutation was generated from
+    (tmp_path / "code.py").write_text("a = 1  # changed")
+    assert ResultCache().get_key(mutation, config=config) == key
+
+
+def test_result_cache_save_load(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("a = 1")
+    config = Config(project_root=tmp_path)
+
+    cache = ResultCache(salt="salt")
+    cache.set(
+        _mutation(tmp_path / "code.py"),
+        RadiationTestsResult(duration=dt.timedelta(seconds=2), status="survived"),
+        config=config,
+    )
+    cache.save(tmp_path / ".radiation" / "results.json")
+
+    loaded = ResultCache.load(tmp_path / ".radiation" / "results.json", salt="salt")
+    assert loaded == cache
+    assert ResultCache.load(tmp_path / "missing.json") == ResultCache()
+
+
+def test_result_cache_load_other_salt(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("a = 1")
+    config = Config(project_root=tmp_path)
+
+    cache = ResultCache(salt="salt")
+    cache.set(
+        _mutation(tmp_path / "code.py"),
+        RadiationTestsResult(duration=dt.timedelta(seconds=2), status="survived"),
+        config=config,
+    )
+    cache.save(tmp_path / "results.json")
+
+    assert ResultCache.load(tmp_path / "results.json", salt="other") == (
+        ResultCache(salt="other")
+    )
+
+
+def test_result_cache_prune(tmp_path: Path) -> None:
+    for name in ["kept.py", "changed.py", "removed.py"]:
+        (tmp_path / name).write_text("a = 1")
+    config = Config(project_root=tmp_path)
+
+    cache = ResultCache()
+    for name in ["kept.py", "changed.py", "removed.py"]:
+        cache.set(
+            _mutation(tmp_path / name),
+            RadiationTestsResult(duration=dt.timedelta(seconds=2), status="killed"),
+            config=config,
+        )
+    cache.save(tmp_path / "results.json")
+
+    (tmp_path / "changed.py").write_text("a = 1  # changed")
+    (tmp_path / "removed.py").unlink()
+    loaded = ResultCache.load(tmp_path / "results.json")
+    loaded.prune(config=config)
+
+    assert [path for _, _, path, _ in loaded.results.values()] == ["kept.py"]
+    assert loaded.get(_mutation(tmp_path / "kept.py"), config=config) is not None
+
+
+def test_hash_files(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("a")
+    (tmp_path / "b.py").write_text("b")
+
+    digest = hash_files([tmp_path / "a.py", tmp_path / "b.py"])
+    assert hash_files([tmp_path / "b.py", tmp_path / "a.py"]) == digest
+
+    (tmp_path / "b.py").write_text("c")
+    assert hash_files([tmp_path / "a.py", tmp_path / "b.py"]) != digest
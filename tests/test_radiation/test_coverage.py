@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from radiation.config import Config
+from radiation.coverage import CoverageMap
+from radiation.mutation import Mutation
+from radiation.types import Context, FileContext, NodeContext
+
+from .utils import get_node_from_expr
+
+
+def _mutation(lineno: int, end_lineno: int) -> Mutation:
+    return Mutation(
+        node=get_node_from_expr("1"),
+        tree=get_node_from_expr("1"),
+        context=Context(
+            node=NodeContext(
+                lineno=lineno, end_lineno=end_lineno, col_offset=0, end_col_offset=1
+            ),
+            file=FileContext(path=Path("/project/pkg/code.py")),
+        ),
+    )
+
+
+def _coverage_map() -> CoverageMap:
+    coverage_map = CoverageMap()
+    coverage_map.add("pkg/code.py", 1, [""])
+    coverage_map.add("pkg/code.py", 2, ["test_code.py::test_a|run"])
+    coverage_map.add(
+        "pkg/code.py",
+        3,
+        ["test_code.py::test_b[1|2]|run", "test_code.py::test_a|teardown"],
+    )
+    return coverage_map
+
+
+def test_coverage_map_get_tests() -> None:
+    config = Config(project_root=Path("/project"))
+    coverage_map = _coverage_map()
+
+    assert coverage_map.get_tests(_mutation(2, 2), config=config) == [
+        "test_code.py::test_a"
+    ]
+    assert coverage_map.get_tests(_mutation(2, 3), config=config) == [
+        "test_code.py::test_a",
+        "test_code.py::test_b[1|2]",
+    ]
+
+
+def test_coverage_map_get_tests_uncovered() -> None:
+    config = Config(project_root=Path("/project"))
+    assert _coverage_map().get_tests(_mutation(4, 5), config=config) == []
+
+
+def test_coverage_map_get_tests_outside_tests() -> None:
+    config = Config(project_root=Path("/project"))
+    assert _coverage_map().get_tests(_mutation(1, 2), config=config) is None
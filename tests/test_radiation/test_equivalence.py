@@ -0,0 +1,76 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from radiation import Radiation
+from radiation.config import Config
+from radiation.equivalence import EquivalenceChecker, get_module_signature
+from radiation.mutation import get_mutation_source
+from radiation.runners import TempDirRunner
+
+
+@pytest.mark.parametrize(
+    "original, mutated",
+    [
+        ("a = 1\n", "\n\na  =  1  # one\n"),
+        ('"""doc"""\na = 1\n', '"""XXXdocXXX"""\na = 1\n'),
+        ('def f():\n    "doc"\n', 'def f():\n    "XXXdocXXX"\n'),
+        ("a = 2 * 3\n", "a = 6\n"),
+        ("a = not True\n", "a = False\n"),
+    ],
+)
+def test_get_module_signature_equivalent(original: str, mutated: str) -> None:
+    assert get_module_signature(original, "a.py") == get_module_signature(
+        mutated, "b.py"
+    )
+
+
+@pytest.mark.parametrize(
+    "original, mutated",
+    [
+        ("a = 1\n", "a = 2\n"),
+        ("a = 1\n", "a = 1.0\n"),
+        ("a = 1\n", "a = True\n"),
+        ("a = 0.0\n", "a = -0.0\n"),
+        ("a = (1, 2)\n", "a = (1, 2.0)\n"),
+        ("def f():\n    return 1\n", "def f():\n    return 2\n"),
+        ("def f(a):\n    return a + 1\n", "def f(a):\n    return a - 1\n"),
+        ("a = 'doc'\n", "a = 'XXXdocXXX'\n"),
+        ("assert a\n", "assert not a\n"),
+        ("if __debug__:\n    a = 1\n", "if __debug__:\n    a = 2\n"),
+    ],
+)
+def test_get_module_signature_not_equivalent(original: str, mutated: str) -> None:
+    assert get_module_signature(original, "a.py") != get_module_signature(
+        mutated, "a.py"
+    )
+
+
+def test_get_module_signature_optimized_interpreter() -> None:
+    script = (
+        "from radiation.equivalence import get_module_signature as s\n"
+        # not an assert, which -O would strip
+        "if s('assert a\\n', 'a.py') == s('assert not a\\n', 'a.py'): exit(1)\n"
+    )
+    subprocess.run(
+        [sys.executable, "-O", "-c", script], cwd=Path(__file__).parents[2], check=True
+    )
+
+
+def test_get_module_signature_syntax_error() -> None:
+    assert get_module_signature("a = ", "a.py") is None
+
+
+def test_equivalence_checker(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text('"""doc"""\na = 1\n')
+    radiation = Radiation(
+        runner=TempDirRunner(run_command=""), config=Config(project_root=tmp_path)
+    )
+    checker = EquivalenceChecker()
+
+    assert [
+        (get_mutation_source(mutation), checker.is_equivalent(mutation))
+        for mutation in radiation.gen_mutations(tmp_path / "a.py")
+    ] == [("'XXXdocXXX'", True), ("0", False), ("2", False)]
@@ -0,0 +1,121 @@
+import os
+import subprocess
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from radiation.files import IgnorePatterns, escape, git_ls_files, walk_files
+
+
+@pytest.mark.parametrize(
+    "patterns, path, is_dir, expected",
+    [
+        (["node_modules"], "node_modules", True, True),
+        (["node_modules"], "web/node_modules", True, True),
+        (["/node_modules"], "web/node_modules", True, False),
+        (["build/"], "build", False, False),
+        (["build/"], "src/build", True, True),
+        (["*.pyi"], "pkg/stubs.pyi", False, True),
+        (["pkg/*.py"], "pkg/a.py", False, True),
+        (["pkg/*.py"], "pkg/sub/a.py", False, False),
+        (["pkg/*.py"], "other/pkg/a.py", False, False),
+        (["**/migrations"], "app/db/migrations", True, True),
+        (["docs/**"], "docs/conf.py", False, True),
+        (["docs/**"], "docs", True, False),
+        (["a/**/b.py"], "a/b.py", False, True),
+        (["a/**/b.py"], "a/x/y/b.py", False, True),
+        (["test_?.py"], "test_1.py", False, True),
+        (["test_[!a-z].py"], "test_1.py", False, True),
+        (["test_[!a-z].py"], "test_a.py", False, False),
+        (["*_pb2.py", "!keep_pb2.py"], "keep_pb2.py", False, False),
+        (["!keep_pb2.py", "*_pb2.py"], "keep_pb2.py", False, True),
+        (["# comment", ""], "# comment", False, False),
+        ([r"\#notes.py"], "#notes.py", False, True),
+    ],
+)
+def test_ignore_patterns_match(
+    patterns: List[str], path: str, is_dir: bool, expected: bool
+) -> None:
+    assert IgnorePatterns.parse(patterns).match(path, is_dir=is_dir) == expected
+
+
+def test_ignore_patterns_match_with_parents() -> None:
+    patterns = IgnorePatterns.parse(["vendor/"])
+    assert patterns.match_with_parents("src/vendor/lib/a.py", is_dir=False)
+    assert not patterns.match_with_parents("src/vendored.py", is_dir=False)
+
+
+def test_escape() -> None:
+    patterns = IgnorePatterns.parse([escape("./dir[1]/"), escape("a*", glob=True)])
+    assert patterns.match("dir[1]", is_dir=True)
+    assert not patterns.match("dir1", is_dir=True)
+    assert patterns.match("abc.py", is_dir=False)
+    assert not patterns.match("sub/abc.py", is_dir=False)
+    assert IgnorePatterns.parse([escape(".")]).match("sub/a.py", is_dir=False)
+
+
+@pytest.fixture
+def project_dir(tmp_path: Path) -> Path:
+    for path in [
+        "a.py",
+        "b.txt",
+        "pkg/__init__.py",
+        "pkg/z.py",
+        "pkg/gen/c_pb2.py",
+        "node_modules/lib/x.py",
+        ".venv/lib/site.py",
+    ]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).touch()
+    return tmp_path
+
+
+def test_walk_files(project_dir: Path) -> None:
+    assert list(walk_files(project_dir, root=project_dir)) == [
+        project_dir / "a.py",
+        project_dir / "node_modules" / "lib" / "x.py",
+        project_dir / "pkg" / "__init__.py",
+        project_dir / "pkg" / "gen" / "c_pb2.py",
+        project_dir / "pkg" / "z.py",
+    ]
+
+
+def test_walk_files_prunes_ignored_dirs(
+    project_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scanned: List[str] = []
+    scandir = os.scandir
+
+    def recording_scandir(path: str) -> "os._ScandirIterator[str]":
+        scanned.append(os.path.relpath(path, project_dir))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+
+    assert list(
+        walk_files(
+            project_dir / "pkg",
+            root=project_dir,
+            ignore=IgnorePatterns.parse(["node_modules/", "/pkg/gen"]),
+        )
+    ) == [project_dir / "pkg" / "__init__.py", project_dir / "pkg" / "z.py"]
+    assert scanned == ["pkg"]
+
+
+def test_git_ls_files(project_dir: Path) -> None:
+    (project_dir / ".gitignore").write_text("node_modules/\n")
+    subprocess.run(["git", "init", "-q"], check=True, cwd=project_dir)
+    subprocess.run(["git", "add", "a.py", "pkg"], check=True, cwd=project_dir)
+    (project_dir / "pkg" / "a.py").touch()
+
+    assert git_ls_files(project_dir) == [
+        ".gitignore",
+        ".venv/lib/site.py",
+        "a.py",
+        "b.txt",
+        "pkg/__init__.py",
+        "pkg/a.py",
+        "pkg/gen/c_pb2.py",
+        "pkg/z.py",
+    ]
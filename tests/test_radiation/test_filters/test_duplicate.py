@@ -0,0 +1,116 @@
+import ast
+from pathlib import Path
+from typing import Iterable
+
+import pytest
+
+from radiation import Radiation
+from radiation.config import Config
+from radiation.filters.duplicate import (
+    DuplicateFilter,
+    get_mutation_hash,
+    normalize_source,
+)
+from radiation.mutation import Mutation, get_mutation_source
+from radiation.runners import TempDirRunner
+from radiation.types import Context, FileContext, NodeContext
+
+from ..utils import get_node_from_expr
+
+
+def _mutation(path: Path, source: str, col_offset: int = 4) -> Mutation:
+    node = get_node_from_expr("2")
+    return Mutation(
+        tree=node,
+        node=node,
+        context=Context(
+            file=FileContext(path=path),
+            node=NodeContext(
+                lineno=1,
+                end_lineno=1,
+                col_offset=col_offset,
+                end_col_offset=col_offset + 1,
+            ),
+        ),
+        source=source,
+    )
+
+
+@pytest.mark.parametrize(
+    "source, other",
+    [
+        ("a + 1", "(a+1)"),
+        ("'x'", '"x"'),
+        ("f(a,\n      b)", "f(a, b)"),
+    ],
+)
+def test_normalize_source_same(source: str, other: str) -> None:
+    assert normalize_source(source) == normalize_source(other)
+
+
+@pytest.mark.parametrize(
+    "source, other",
+    [("1", "1.0"), ("1", "True"), ("a + 1", "a - 1"), ("(a, b)", "[a, b]")],
+)
+def test_normalize_source_different(source: str, other: str) -> None:
+    assert normalize_source(source) != normalize_source(other)
+
+
+def test_normalize_source_invalid() -> None:
+    assert normalize_source("a +") == "a +"
+
+
+def test_get_mutation_hash() -> None:
+    config = Config(project_root=Path("/repo"))
+    mutation_hash = get_mutation_hash(_mutation(Path("/repo/a.py"), "2"), config)
+
+    assert get_mutation_hash(_mutation(Path("/repo/a.py"), "(2)"), config) == (
+        mutation_hash
+    )
+    assert get_mutation_hash(_mutation(Path("/repo/b.py"), "2"), config) != (
+        mutation_hash
+    )
+    assert get_mutation_hash(_mutation(Path("/repo/a.py"), "2", 5), config) != (
+        mutation_hash
+    )
+    assert get_mutation_hash(_mutation(Path("/repo/a.py"), "3"), config) != (
+        mutation_hash
+    )
+
+
+def test_duplicate_filter() -> None:
+    config = Config(project_root=Path("/repo"))
+    duplicate_filter = DuplicateFilter()
+
+    assert [
+        duplicate_filter(_mutation(Path("/repo/a.py"), source), config)
+        for source in ["2", "3", "(2)", "2", "4"]
+    ] == [True, True, False, False, True]
+    assert duplicate_filter.removed == 2
+
+
+def test_duplicate_filter_removes_mutations_of_different_mutators(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "code.py").write_text("a = -b\n")
+
+    def remove_minus(node: ast.AST, context: Context) -> Iterable[Mutation]:
+        if isinstance(node, ast.UnaryOp):
+            yield Mutation.from_node(node.operand, context, source="b")
+
+    def flip_sign(node: ast.AST, context: Context) -> Iterable[Mutation]:
+        if isinstance(node, ast.UnaryOp):
+            yield Mutation.from_node(ast.UnaryOp(ast.UAdd(), node.operand), context)
+            yield Mutation.from_node(node.operand, context)
+
+    duplicate_filter = DuplicateFilter()
+    radiation = Radiation(
+        runner=TempDirRunner(run_command=""),
+        mutators=[remove_minus, flip_sign],
+        filters=[duplicate_filter],
+        config=Config(project_root=tmp_path),
+    )
+    mutations = list(radiation.gen_mutations(tmp_path / "code.py"))
+
+    assert [get_mutation_source(mutation) for mutation in mutations] == ["b", "(+b)"]
+    assert duplicate_filter.removed == 1
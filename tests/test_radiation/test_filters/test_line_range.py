@@ -0,0 +1,93 @@
+import ast
+from pathlib import Path
+from textwrap import dedent
+from typing import Iterable, List
+
+import pytest
+
+from radiation import Radiation
+from radiation.config import Config
+from radiation.filters.line_range import LineRangeFilter, merge_intervals
+from radiation.mutation import Mutation, get_mutation_source
+from radiation.runners import TempDirRunner
+from radiation.types import Context, FileContext, NodeContext
+
+
+@pytest.fixture
+def project_path() -> Path:
+    return Path("/home/myuser/myrepo")
+
+
+def _context(path: Path, lineno: int, end_lineno: int) -> Context:
+    return Context(
+        file=FileContext(path=path),
+        node=NodeContext(
+            lineno=lineno, end_lineno=end_lineno, col_offset=0, end_col_offset=1
+        ),
+    )
+
+
+def test_merge_intervals() -> None:
+    assert merge_intervals([(7, 9), (1, 2), (3, 3), (8, 12), (20, 20)]) == [
+        (1, 3),
+        (7, 12),
+        (20, 20),
+    ]
+
+
+def test_line_range_filter_from_specs() -> None:
+    assert LineRangeFilter.from_specs(["a.py:3-5", "dir/b.py:7", "a.py:1"]) == (
+        LineRangeFilter({"a.py": [(1, 1), (3, 5)], "dir/b.py": [(7, 7)]})
+    )
+
+
+@pytest.mark.parametrize("spec", ["a.py", "a.py:", "a.py:x-3", ":3", "a.py:3-"])
+def test_line_range_filter_from_invalid_specs(spec: str) -> None:
+    with pytest.raises(ValueError):
+        LineRangeFilter.from_specs([spec])
+
+
+def test_line_range_filter_may_contain(project_path: Path) -> None:
+    line_filter = LineRangeFilter({"myfile.py": [(3, 5)]})
+    config = Config(project_root=project_path)
+    path = project_path / "myfile.py"
+
+    assert line_filter.may_contain(_context(path, 1, 10), config)
+    assert line_filter.may_contain(_context(path, 5, 6), config)
+    assert not line_filter.may_contain(_context(path, 6, 10), config)
+    assert not line_filter.may_contain(_context(project_path / "b.py", 3, 3), config)
+
+
+def test_line_range_filter_prunes_generation(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text(
+        dedent(
+            """
+            def f(a):
+                return a + 1
+
+            @decorate(2 + 3)
+            def g(b):
+                return b - 4
+            """.lstrip(
+                "\n"
+            )
+        )
+    )
+    visited: List[int] = []
+
+    def mutator(node: ast.AST, context: Context) -> Iterable[Mutation]:
+        visited.append(context.node.lineno)
+        if isinstance(node, ast.BinOp):
+            yield Mutation.from_node(node, context)
+
+    radiation = Radiation(
+        runner=TempDirRunner(run_command=""),
+        mutators=[mutator],
+        filters=[LineRangeFilter({"code.py": [(4, 4)]})],
+        config=Config(project_root=tmp_path),
+    )
+    mutations = list(radiation.gen_mutations(tmp_path / "code.py"))
+
+    assert [get_mutation_source(mutation) for mutation in mutations] == ["(2 + 3)"]
+    # f is never walked, the decorator is walked although g starts on line 5
+    assert 2 not in visited and 4 in visited
@@ -1,11 +1,14 @@
 import subprocess
+from dataclasses import replace
 from pathlib import Path
 from textwrap import dedent
+from typing import Optional
 
 import pytest
+from whatthepatch import parse_patch
 
 from radiation.config import Config
-from radiation.filters.patch import PatchFilter
+from radiation.filters.patch import PatchFilter, get_added_lines, is_mutation_in_diff
 from radiation.mutation import Mutation
 from radiation.types import Context, FileContext, NodeContext
 
@@ -153,6 +156,64 @@ def test_filter_other_filename(
     assert not PatchFilter(patch_other_file)(mutation_in_line_1, config)
 
 
+def test_get_added_lines() -> None:
+    (diff,) = parse_patch(
+        dedent(
+            """
+            --- a/myfile.py
+            +++ b/myfile.py
+            @@ -1,4 +1,6 @@
+            -a = 1
+            +a = 2
+            +b = 3
+             c = 4
+            -d = 5
+            +d = 6
+            +e = 7
+             f = 8
+            @@ -10,1 +12,2 @@
+             g = 9
+            +h = 10
+            """.lstrip(
+                "\n"
+            )
+        )
+    )
+    assert diff.changes is not None
+    assert get_added_lines(diff.changes) == [(1, 2), (4, 5), (13, 13)]
+
+
+@pytest.mark.parametrize(
+    "lineno, end_lineno, expected",
+    [
+        (1, 1, False),
+        (2, 2, True),
+        (3, 4, True),
+        (6, 9, False),
+        (9, 12, True),
+        (12, 14, True),
+        (13, None, False),
+    ],
+)
+def test_is_mutation_in_diff(
+    mutation_in_line_1: Mutation,
+    lineno: int,
+    end_lineno: Optional[int],
+    expected: bool,
+) -> None:
+    mutation = Mutation(
+        tree=mutation_in_line_1.tree,
+        node=mutation_in_line_1.node,
+        context=replace(
+            mutation_in_line_1.context,
+            node=NodeContext(
+                lineno=lineno, end_lineno=end_lineno, col_offset=0, end_col_offset=1
+            ),
+        ),
+    )
+    assert is_mutation_in_diff(mutation, [(2, 4), (10, 12)]) == expected
+
+
 def test_patch_filter_from_git_diff(
     mutation_in_line_1: Mutation, mutation_in_line_2: Mutation, tmp_path: Path
 ) -> None:
@@ -0,0 +1,60 @@
+import ast
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+import pytest
+
+from radiation import Radiation
+from radiation.config import Config
+from radiation.filters.shard import ShardFilter, get_missing_shards
+from radiation.mutation import Mutation
+from radiation.runners import TempDirRunner
+from radiation.types import Context
+
+
+def test_shard_filter_parse() -> None:
+    assert ShardFilter.parse("3/8") == ShardFilter(3, 8)
+
+
+@pytest.mark.parametrize("spec", ["3", "3/", "/8", "a/8", "0/8", "9/8", "-1/8"])
+def test_shard_filter_parse_invalid(spec: str) -> None:
+    with pytest.raises(ValueError):
+        ShardFilter.parse(spec)
+
+
+def test_shard_filter_partitions_mutations(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text(
+        "".join(f"a{index} = {index} + 1\n" for index in range(40))
+    )
+
+    def mutator(node: ast.AST, context: Context) -> Iterable[Mutation]:
+        if isinstance(node, ast.Constant):
+            yield Mutation.from_node(node, context)
+
+    def gen_sources(*filters: ShardFilter) -> List[Tuple[int, int]]:
+        radiation = Radiation(
+            runner=TempDirRunner(run_command=""),
+            mutators=[mutator],
+            filters=list(filters),
+            config=Config(project_root=tmp_path),
+        )
+        return [
+            (mutation.context.node.lineno, mutation.context.node.col_offset)
+            for mutation in radiation.gen_mutations(tmp_path / "code.py")
+        ]
+
+    everything = gen_sources()
+    shards = [gen_sources(ShardFilter(index, 3)) for index in range(1, 4)]
+
+    assert all(shards)
+    assert sorted(sum(shards, [])) == sorted(everything)
+    # the same mutations end up in the same shard every time
+    assert gen_sources(ShardFilter(2, 3)) == shards[1]
+
+
+def test_get_missing_shards() -> None:
+    assert get_missing_shards([ShardFilter(2, 4), ShardFilter(4, 4)]) == [
+        ShardFilter(1, 4),
+        ShardFilter(3, 4),
+    ]
+    assert get_missing_shards([ShardFilter(1, 2), ShardFilter(2, 2)]) == []
@@ -1,9 +1,11 @@
+import ast
 from _ast import BinOp
-from ast import AST, Compare
+from ast import AST, Compare, Not, UnaryOp
 from pathlib import Path
 from typing import Iterable, cast
 
 import pytest
+from astunparse import unparse
 
 from radiation.gen import gen_mutations
 from radiation.mutation import Mutation
@@ -160,3 +162,16 @@ def test_gen_mutations_cmp_ops(dummy_context: Context) -> None:
             ),
         ],
     )
+
+
+def test_gen_mutations_sets_mutator_id(dummy_context: Context) -> None:
+    def negate(node: AST, context: Context) -> Iterable[Mutation]:
+        if isinstance(node, Compare):
+            yield Mutation.from_node(UnaryOp(Not(), node), context)
+
+    (mutation,) = gen_mutations(
+        ast.parse("x = 1 < 2"), parent_context=dummy_context, mutators=[negate]
+    )
+
+    assert mutation.mutator == "negate"
+    assert unparse(mutation.tree).strip() == "x = (not (1 < 2))"
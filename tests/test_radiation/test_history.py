@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from radiation.config import Config
+from radiation.history import KillHistory, get_failed_tests
+from radiation.mutation import Mutation
+from radiation.types import Context, FileContext, NodeContext
+
+from .utils import get_node_from_expr
+
+
+def _mutation(lineno: int) -> Mutation:
+    return Mutation(
+        node=get_node_from_expr("1"),
+        tree=get_node_from_expr("1"),
+        context=Context(
+            node=NodeContext(
+                lineno=lineno, end_lineno=lineno, col_offset=0, end_col_offset=1
+            ),
+            file=FileContext(path=Path("/project/code.py")),
+        ),
+    )
+
+
+def test_get_failed_tests() -> None:
+    output = (
+        "F.F\n"
+        "=========== short test summary info ===========\n"
+        "FAILED test_code.py::test_a - assert 1 == 2\n"
+        "FAILED test_code.py::test_b[1-2]\n"
+        "FAILED test_code.py::test_a - assert 3 == 4\n"
+        "2 failed, 1 passed in 0.01s\n"
+    )
+    assert get_failed_tests(output) == [
+        "test_code.py::test_a",
+        "test_code.py::test_b[1-2]",
+    ]
+    assert get_failed_tests(None) == []
+
+
+def test_kill_history_get_killers() -> None:
+    config = Config(project_root=Path("/project"))
+    history = KillHistory()
+    history.record(_mutation(8), ["test_far"], config=config)
+    history.record(_mutation(3), ["test_near"], config=config)
+    history.record(_mutation(20), ["test_out_of_range"], config=config)
+
+    assert history.get_killers(_mutation(4), config=config) == [
+        "test_near",
+        "test_far",
+    ]
+    assert history.prioritize(
+        ["test_other", "test_far", "test_near"], _mutation(4), config=config
+    ) == ["test_near", "test_far", "test_other"]
+
+
+def test_kill_history_save_load(tmp_path: Path) -> None:
+    config = Config(project_root=Path("/project"))
+    history = KillHistory()
+    history.record(_mutation(3), ["test_a", "test_b"], config=config)
+    history.record(_mutation(3), ["test_a"], config=config)
+
+    history.save(tmp_path / ".radiation" / "history.json")
+
+    assert KillHistory.load(tmp_path / ".radiation" / "history.json") == history
+    assert KillHistory.load(tmp_path / "missing.json") == KillHistory()
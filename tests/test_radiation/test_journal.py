@@ -0,0 +1,93 @@
+import datetime as dt
+from pathlib import Path
+
+import pytest
+
+from radiation import Radiation
+from radiation.config import Config
+from radiation.journal import Journal, get_digest, read_journal
+from radiation.mutation import Mutation
+from radiation.runners import TempDirRunner
+from radiation.types import Context, FileContext, NodeContext
+from radiation.types import TestsResult as RadiationTestsResult
+
+from .utils import get_node_from_expr
+
+
+def _mutation(path: Path, expr: str = "2") -> Mutation:
+    return Mutation(
+        node=get_node_from_expr(expr),
+        tree=get_node_from_expr(expr),
+        context=Context(
+            node=NodeContext(lineno=1, end_lineno=1, col_offset=4, end_col_offset=5),
+            file=FileContext(path=path),
+        ),
+    )
+
+
+def test_journal_resume(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("a = 1")
+    config = Config(project_root=tmp_path)
+    journal_path = tmp_path / ".radiation" / "journal.jsonl"
+
+    journal = Journal.create(journal_path)
+    journal.append(
+        _mutation(tmp_path / "code.py"),
+        RadiationTestsResult(duration=dt.timedelta(seconds=2), status="killed"),
+        config=config,
+    )
+    # a run killed while writing
+    with open(journal_path, "a") as journal_file:
+        journal_file.write('{"path": "code.py", "lin')
+
+    resumed = Journal.resume(journal_path)
+    assert resumed.get(
+        _mutation(tmp_path / "code.py"), config=config
+    ) == RadiationTestsResult(duration=dt.timedelta(seconds=2), status="killed")
+    assert resumed.get(_mutation(tmp_path / "code.py", "3"), config=config) is None
+
+    (tmp_path / "code.py").write_text("a = 1  # changed")
+    assert (
+        Journal.resume(journal_path).get(_mutation(tmp_path / "code.py"), config=config)
+        is None
+    )
+
+
+def test_journal_create_truncates(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("a = 1")
+    journal_path = tmp_path / "journal.jsonl"
+
+    Journal.create(journal_path).append(
+        _mutation(tmp_path / "code.py"),
+        RadiationTestsResult(duration=dt.timedelta(seconds=2), status="survived"),
+        config=Config(project_root=tmp_path),
+    )
+    assert [entry.replacement for entry in read_journal(journal_path)] == ["2"]
+
+    Journal.create(journal_path)
+    assert list(read_journal(journal_path)) == []
+
+
+def test_journal_digests_generated_source(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "code.py").write_text("a = 1")
+    config = Config(project_root=tmp_path)
+    radiation = Radiation(runner=TempDirRunner(run_command=""), config=config)
+    mutations = list(radiation.gen_mutations(tmp_path / "code.py"))
+    journal = Journal.create(tmp_path / "journal.jsonl")
+
+    # the mutated file isn't read again
+    monkeypatch.setattr(Path, "read_text", None)
+    monkeypatch.setattr(Path, "read_bytes", None)
+    for mutation in mutations:
+        journal.append(
+            mutation,
+            RadiationTestsResult(duration=dt.timedelta(), status="killed"),
+            config=config,
+        )
+    monkeypatch.undo()
+
+    assert {entry.digest for entry in read_journal(tmp_path / "journal.jsonl")} == {
+        get_digest(tmp_path / "code.py")
+    }
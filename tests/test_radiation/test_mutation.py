@@ -1,5 +1,10 @@
+import ast
+import pickle
 from pathlib import Path
 from textwrap import dedent
+from typing import cast
+
+from astunparse import unparse
 
 from radiation.mutation import Mutation, apply_mutation_on_string
 from radiation.types import Context, FileContext, NodeContext
@@ -72,3 +77,66 @@ def test_apply_multiline_mutation_on_string() -> None:
             """
         )
     )
+
+
+def test_mutation_tree_is_built_lazily() -> None:
+    root = ast.parse("a = 1\nb = f(2)\n")
+    call = cast(ast.Call, cast(ast.Assign, root.body[1]).value)
+    context = Context(
+        file=FileContext(path=Path("/bla.py")),
+        node=NodeContext(lineno=2, end_lineno=2, col_offset=6, end_col_offset=7),
+    )
+
+    mutation = (
+        Mutation.from_node(get_node_from_expr("3"), context)
+        .within(call, "args", 0)
+        .within(root.body[1], "value")
+        .within(root, "body", 1)
+    )
+
+    assert unparse(mutation.tree).strip() == "a = 1\nb = f(3)"
+    # the original tree is untouched
+    assert unparse(root).strip() == "a = 1\nb = f(2)"
+
+
+def test_mutation_tree_shares_unmutated_nodes() -> None:
+    root = ast.parse("a = 1\nb = 2\n")
+    context = Context(
+        file=FileContext(path=Path("/bla.py")),
+        node=NodeContext(lineno=2, end_lineno=2, col_offset=4, end_col_offset=5),
+    )
+
+    tree = cast(
+        ast.Module,
+        Mutation.from_node(get_node_from_expr("3"), context)
+        .within(root.body[1], "value")
+        .within(root, "body", 1)
+        .tree,
+    )
+
+    assert tree.body[0] is root.body[0]
+    assert tree.body is not root.body
+    assert tree.body[1] is not root.body[1]
+
+
+def test_mutation_pickles_without_its_tree() -> None:
+    root = ast.parse("a = 1\nb = 2\n")
+    context = Context(
+        file=FileContext(path=Path("/bla.py")),
+        node=NodeContext(lineno=2, end_lineno=2, col_offset=4, end_col_offset=5),
+    )
+    first, second = (
+        Mutation.from_node(get_node_from_expr(value), context, source=value)
+        .within(root.body[1], "value")
+        .within(root, "body", 1)
+        for value in ("3", "4")
+    )
+    first.tree
+
+    first, second = pickle.loads(pickle.dumps([first, second]))
+
+    assert first._tree is None
+    assert first._root is second._root
+    assert unparse(first.tree).strip() == "a = 1\nb = 3"
+    assert unparse(second.tree).strip() == "a = 1\nb = 4"
+    assert (first.source, first.context) == ("3", context)
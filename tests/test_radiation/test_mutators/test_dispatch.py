@@ -0,0 +1,36 @@
+import ast
+from ast import AST, BinOp, Constant, Name
+from typing import Iterable
+
+from radiation.mutation import Mutation
+from radiation.mutators import MutatorTable, builtin_mutators, handles
+from radiation.mutators.dispatch import get_node_types
+from radiation.types import Context
+
+
+def test_mutator_table() -> None:
+    @handles(BinOp)
+    def binops(node: AST, context: Context) -> Iterable[Mutation]:
+        return []
+
+    def undeclared(node: AST, context: Context) -> Iterable[Mutation]:
+        return []
+
+    @handles(ast.expr)
+    def expressions(node: AST, context: Context) -> Iterable[Mutation]:
+        return []
+
+    table = MutatorTable([binops, undeclared, expressions])
+
+    assert table.get(BinOp) == [binops, undeclared, expressions]
+    assert table.get(Name) == [undeclared, expressions]
+    assert table.get(ast.Pass) == [undeclared]
+    # the lookup is cached per type
+    assert table.get(Name) is table.get(Name)
+
+
+def test_builtin_mutators_declare_node_types() -> None:
+    assert all(get_node_types(mutator) for mutator in builtin_mutators)
+    assert [
+        mutator.__name__ for mutator in MutatorTable(builtin_mutators).get(Constant)
+    ] == ["modify_constants"]
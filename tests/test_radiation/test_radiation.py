@@ -1,13 +1,19 @@
 import ast
+import subprocess
+import time
 from ast import AST, BinOp, Expr
+from dataclasses import replace
 from pathlib import Path
 from typing import Iterable, cast
 
 import pytest
 
 from radiation import Radiation
+from radiation.cache import ResultCache
 from radiation.config import Config
-from radiation.mutation import Mutation
+from radiation.equivalence import EquivalenceChecker
+from radiation.filters.line_limit import LineLimitFilter
+from radiation.mutation import Mutation, get_mutation_source
 from radiation.runners import TempDirRunner
 from radiation.types import Context, FileContext, NodeContext
 
@@ -119,6 +125,34 @@ def test_find_files_include_glob_to_files(project_dir: Path) -> None:
     ) == [project_dir / "dir" / "b.py", project_dir / "otherdir" / "b.py"]
 
 
+def test_find_files_ignore(project_dir: Path) -> None:
+    assert list(
+        Radiation(
+            runner=TempDirRunner(run_command=""),
+            config=Config(project_root=project_dir),
+        ).find_files(".", exclude="dir", ignore=["b.py", "!otherdir/b.py"])
+    ) == [
+        project_dir / "a.py",
+        project_dir / "otherdir" / "b.py",
+        project_dir / "otherdir" / "nesteddir" / "c.py",
+    ]
+
+
+def test_find_files_git_files(project_dir: Path) -> None:
+    (project_dir / ".gitignore").write_text("nesteddir/\n")
+    (project_dir / "deleted.py").touch()
+    subprocess.run(["git", "init", "-q"], check=True, cwd=project_dir)
+    subprocess.run(["git", "add", "-A"], check=True, cwd=project_dir)
+    (project_dir / "deleted.py").unlink()
+
+    assert list(
+        Radiation(
+            runner=TempDirRunner(run_command=""),
+            config=Config(project_root=project_dir),
+        ).find_files(["*dir", "a.py"], exclude="dir", git_files=True)
+    ) == [project_dir / "otherdir" / "b.py", project_dir / "a.py"]
+
+
 def test_find_files_doesnt_allow_absolute_includes(project_dir: Path) -> None:
     with pytest.raises(AssertionError, match="must be relative"):
         list(
@@ -445,3 +479,123 @@ def test_gen_mutations(project_dir: Path) -> None:
             ),
         ],
     )
+
+
+def test_gen_mutations_many(project_dir: Path) -> None:
+    (project_dir / "a.py").write_text("a = 1 + 2\nb = a > 3\n")
+    (project_dir / "dir" / "b.py").write_text("c = a - 1\n")
+    paths = list(Radiation(config=Config(project_root=project_dir)).find_files("."))
+
+    def get_radiation() -> Radiation:
+        return Radiation(
+            runner=TempDirRunner(run_command=""),
+            filters=[LineLimitFilter(1)],
+            config=Config(project_root=project_dir),
+        )
+
+    expected = [
+        mutation for path in paths for mutation in get_radiation().gen_mutations(path)
+    ]
+    mutations = list(get_radiation().gen_mutations_many(paths, jobs=2))
+
+    assert [m.context.file.path for m in mutations] == [
+        project_dir / "a.py",
+        project_dir / "a.py",
+        project_dir / "dir" / "b.py",
+    ]
+    assert_results_equal(mutations, expected)
+    assert [get_mutation_source(m) for m in mutations] == [
+        get_mutation_source(m) for m in expected
+    ]
+    assert mutations[0].context.file.source is mutations[1].context.file.source
+
+
+def _mark_visited(node: AST, context: Context) -> Iterable[Mutation]:
+    # module-level so it can be sent to the worker processes
+    if isinstance(node, ast.Module):
+        context.file.path.with_suffix(".visited").touch()
+    if isinstance(node, ast.Constant):
+        yield Mutation.from_node(node, context)
+
+
+def test_gen_mutations_many_bounded(tmp_path: Path) -> None:
+    paths = [tmp_path / f"file{index}.py" for index in range(8)]
+    for path in paths:
+        path.write_text("a = 1\n")
+    radiation = Radiation(
+        runner=TempDirRunner(run_command=""),
+        mutators=[_mark_visited],
+        config=Config(project_root=tmp_path),
+    )
+
+    mutations = radiation.gen_mutations_many(paths, jobs=2)
+    assert not list(tmp_path.glob("*.visited"))
+
+    first = next(mutations)
+    assert first.context.file.path == paths[0]
+    # let the workers finish whatever they were given
+    time.sleep(0.5)
+    # the first file, and at most the next `jobs` files
+    assert len(list(tmp_path.glob("*.visited"))) <= 3
+    # closes the generator, which shuts its workers down
+    del mutations
+
+
+def test_test_mutations(project_dir: Path) -> None:
+    (project_dir / "a.py").write_text("a = 1\nb = 2\n")
+
+    radiation = Radiation(
+        runner=TempDirRunner(run_command="grep -q 'a = 1' a.py"),
+        config=Config(project_root=project_dir),
+    )
+    mutations = list(radiation.gen_mutations(project_dir / "a.py"))
+
+    results = list(radiation.test_mutations(mutations, timeout=10, jobs=2))
+
+    assert sorted(id(mutation) for mutation, _ in results) == sorted(
+        id(mutation) for mutation in mutations
+    )
+    assert sorted(
+        (mutation.context.node.lineno, result.status) for mutation, result in results
+    ) == [
+        (1, "killed"),
+        (1, "killed"),
+        (2, "survived"),
+        (2, "survived"),
+        (2, "survived"),
+    ]
+
+
+def test_test_mutation_cached(project_dir: Path) -> None:
+    (project_dir / "a.py").write_text("a = 1\nb = 2\n")
+
+    cache = ResultCache()
+    radiation = Radiation(
+        runner=TempDirRunner(run_command="grep -q 'a = 1' a.py"),
+        config=Config(project_root=project_dir),
+        cache=cache,
+    )
+    mutation, *_ = radiation.gen_mutations(project_dir / "a.py")
+
+    result = radiation.test_mutation(mutation, timeout=10)
+    assert (result.status, result.cached) == ("killed", False)
+
+    cached_result = radiation.test_mutation(mutation, timeout=10)
+    assert cached_result == replace(result, output=None, cached=True)
+
+
+def test_test_mutations_screens_equivalent(project_dir: Path) -> None:
+    (project_dir / "a.py").write_text('"""doc"""\na = 1\n')
+
+    radiation = Radiation(
+        runner=TempDirRunner(run_command="grep -q 'a = 1' a.py"),
+        config=Config(project_root=project_dir),
+        equivalence=EquivalenceChecker(),
+    )
+    mutations = list(radiation.gen_mutations(project_dir / "a.py"))
+
+    results = list(radiation.test_mutations(mutations, timeout=10, jobs=2))
+
+    assert sorted(
+        (get_mutation_source(mutation), result.status) for mutation, result in results
+    ) == [("'XXXdocXXX'", "equivalent"), ("0", "killed"), ("2", "killed")]
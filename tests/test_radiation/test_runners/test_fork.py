@@ -0,0 +1,209 @@
+from pathlib import Path
+from textwrap import dedent
+from typing import Iterator
+
+import pytest
+
+from radiation.config import Config
+from radiation.mutation import Mutation
+from radiation.runners.fork import ForkRunner
+from radiation.runners.limits import ResourceLimits
+from radiation.types import Context, FileContext, NodeContext
+
+from ..utils import get_node_from_expr
+
+
+def _dedent(text: str) -> str:
+    return dedent(text.lstrip("\n")).rstrip("\n")
+
+
+@pytest.fixture
+def project_path(tmp_path: Path) -> Path:
+    (tmp_path / "sleepy.py").write_text(
+        _dedent(
+            """
+            import time
+
+            DELAY = 0
+
+            def is_positive(n: int) -> bool:
+                time.sleep(DELAY)
+                return n > 0
+            """
+        )
+    )
+    (tmp_path / "test_sleepy.py").write_text(
+        _dedent(
+            """
+            from sleepy import is_positive
+
+            def test_is_positive():
+                assert is_positive(1)
+                assert not is_positive(-1)
+            """
+        )
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def runner() -> Iterator[ForkRunner]:
+    runner = ForkRunner()
+    yield runner
+    runner.cleanup()
+
+
+def _mutation(project_path: Path, expr: str, **node_context: int) -> Mutation:
+    return Mutation(
+        node=get_node_from_expr(expr),
+        tree=get_node_from_expr(expr),
+        context=Context(
+            node=NodeContext(**node_context),  # type: ignore
+            file=FileContext(path=project_path / "sleepy.py"),
+        ),
+    )
+
+
+def test_fork_runner(project_path: Path, runner: ForkRunner) -> None:
+    config = Config(project_root=project_path)
+
+    assert runner.run_baseline_tests(config=config).status == "survived"
+    # n >= 0
+    assert (
+        runner.test_mutation(
+            _mutation(
+                project_path,
+                "n >= 0",
+                lineno=7,
+                end_lineno=7,
+                col_offset=11,
+                end_col_offset=16,
+            ),
+            config=config,
+        ).status
+        == "survived"
+    )
+    # n > -1
+    survived = runner.test_mutation(
+        _mutation(
+            project_path,
+            "-1",
+            lineno=7,
+            end_lineno=7,
+            col_offset=15,
+            end_col_offset=16,
+        ),
+        config=config,
+        timeout=10,
+    )
+    assert survived.status == "survived"
+    # n < 0
+    killed = runner.test_mutation(
+        _mutation(
+            project_path,
+            "n < 0",
+            lineno=7,
+            end_lineno=7,
+            col_offset=11,
+            end_col_offset=16,
+        ),
+        config=config,
+    )
+    assert killed.status == "killed"
+    assert "test_sleepy.py::test_is_positive" in (killed.output or "")
+
+    # the same server is reused between mutations
+    assert runner._servers.qsize() == 1
+
+
+def test_fork_runner_timeout(project_path: Path, runner: ForkRunner) -> None:
+    result = runner.test_mutation(
+        _mutation(
+            project_path, "5", lineno=3, end_lineno=3, col_offset=8, end_col_offset=9
+        ),
+        config=Config(project_root=project_path),
+        timeout=0.5,
+    )
+
+    assert result.status == "timed out"
+    assert result.output is None
+
+
+def test_fork_runner_cpu_limit(project_path: Path) -> None:
+    runner = ForkRunner(limits=ResourceLimits(cpu=1))
+    try:
+        result = runner.test_mutation(
+            # loops forever
+            _mutation(
+                project_path,
+                "any(iter(int, 1))",
+                lineno=7,
+                end_lineno=7,
+                col_offset=11,
+                end_col_offset=16,
+            ),
+            config=Config(project_root=project_path),
+            timeout=30,
+        )
+    finally:
+        runner.cleanup()
+
+    assert result.status == "timed out"
+
+
+def test_fork_runner_sigxcpu_without_cpu_limit(
+    project_path: Path, runner: ForkRunner
+) -> None:
+    result = runner.test_mutation(
+        _mutation(
+            project_path,
+            "__import__('os').kill(__import__('os').getpid(),"
+            " __import__('signal').SIGXCPU)",
+            lineno=7,
+            end_lineno=7,
+            col_offset=11,
+            end_col_offset=16,
+        ),
+        config=Config(project_root=project_path),
+        timeout=30,
+    )
+
+    assert result.status == "killed"
+
+
+def test_fork_runner_module_not_imported_yet(
+    project_path: Path, runner: ForkRunner
+) -> None:
+    (project_path / "test_sleepy.py").write_text(
+        _dedent(
+            """
+            def test_is_positive():
+                from sleepy import is_positive
+
+                assert not is_positive(-1)
+            """
+        )
+    )
+
+    result = runner.test_mutation(
+        _mutation(
+            project_path,
+            "n < 0",
+            lineno=7,
+            end_lineno=7,
+            col_offset=11,
+            end_col_offset=16,
+        ),
+        config=Config(project_root=project_path),
+    )
+
+    assert result.status == "killed"
+
+
+def test_fork_runner_collection_error(project_path: Path, runner: ForkRunner) -> None:
+    (project_path / "test_sleepy.py").write_text("import does_not_exist")
+
+    result = runner.run_baseline_tests(config=Config(project_root=project_path))
+
+    assert result.status == "killed"
+    assert "does_not_exist" in (result.output or "")
@@ -0,0 +1,78 @@
+import signal
+from pathlib import Path
+
+import pytest
+
+from radiation.config import Config
+from radiation.mutation import Mutation
+from radiation.runners import TempDirRunner
+from radiation.runners.limits import ResourceLimits
+from radiation.types import Context, FileContext, NodeContext
+
+from ..utils import get_node_from_expr
+
+
+def test_wrap_command() -> None:
+    assert ResourceLimits().wrap_command("pytest") == "pytest"
+    assert ResourceLimits(memory=2**30, cpu=10).wrap_command("pytest # all") == (
+        "ulimit -v 1048576 && ulimit -S -t 10 && { pytest # all\n}"
+    )
+
+
+def _mutation(path: Path, expr: str) -> Mutation:
+    return Mutation(
+        node=get_node_from_expr(expr),
+        tree=get_node_from_expr(expr),
+        context=Context(
+            node=NodeContext(lineno=1, end_lineno=1, col_offset=4, end_col_offset=5),
+            file=FileContext(path=path),
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "expr, status",
+    [
+        # loops forever
+        ("any(iter(int, 1))", "timed out"),
+        ("bytearray(2 ** 34)", "killed"),
+        ("2", "survived"),
+    ],
+)
+def test_tempdir_runner_limits(tmp_path: Path, expr: str, status: str) -> None:
+    (tmp_path / "code.py").write_text("x = 1\n")
+    runner = TempDirRunner(
+        "python code.py", limits=ResourceLimits(memory=2**30, cpu=1)
+    )
+
+    result = runner.test_mutation(
+        _mutation(tmp_path / "code.py", expr),
+        config=Config(project_root=tmp_path),
+        timeout=30,
+    )
+
+    assert result.status == status
+
+
+def test_exceeded_cpu_limit() -> None:
+    assert ResourceLimits(cpu=1).exceeded_cpu_limit(-signal.SIGXCPU)
+    assert ResourceLimits(cpu=1).exceeded_cpu_limit(128 + signal.SIGXCPU)
+    assert not ResourceLimits(cpu=1).exceeded_cpu_limit(1)
+    assert not ResourceLimits().exceeded_cpu_limit(-signal.SIGXCPU)
+
+
+def test_tempdir_runner_sigxcpu_without_cpu_limit(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("x = 1\n")
+    runner = TempDirRunner("python code.py")
+
+    result = runner.test_mutation(
+        _mutation(
+            tmp_path / "code.py",
+            "__import__('os').kill(__import__('os').getpid(),"
+            " __import__('signal').SIGXCPU)",
+        ),
+        config=Config(project_root=tmp_path),
+        timeout=30,
+    )
+
+    assert result.status == "killed"
@@ -0,0 +1,133 @@
+from pathlib import Path
+from textwrap import dedent
+from typing import Any, List, Sequence
+
+import pytest
+
+from radiation import Radiation
+from radiation.config import Config
+from radiation.runners import SchemataRunner, schemata
+from radiation.types import TestsResult as RadiationTestsResult
+
+
+def _dedent(text: str) -> str:
+    return dedent(text.lstrip("\n")).rstrip("\n")
+
+
+def test_schemata_runner(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text(
+        _dedent(
+            """
+            def is_positive(n: int) -> bool:
+                return n > 0
+            """
+        )
+    )
+    (tmp_path / "test_code.py").write_text(
+        _dedent(
+            """
+            from code import is_positive
+
+            assert is_positive(1)
+            assert not is_positive(-1)
+            """
+        )
+    )
+
+    runner = SchemataRunner("python test_code.py")
+    radiation = Radiation(runner=runner, config=Config(project_root=tmp_path))
+    mutations = list(radiation.gen_mutations(tmp_path / "code.py"))
+    runner.prepare(mutations, config=radiation.config)
+
+    assert radiation.run_baseline_tests().status == "survived"
+    assert [
+        radiation.test_mutation(mutation, timeout=10).status for mutation in mutations
+    ] == [
+        # n >= 0, n <= 0
+        "survived",
+        "killed",
+        # 0 -> -1, 0 -> 1
+        "survived",
+        "killed",
+    ]
+    assert len(runner._mutant_ids) == len(mutations)
+
+    runner.cleanup()
+    assert runner._sandbox is None
+
+
+def test_schemata_runner_regenerated_mutations(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("a = 1 + 2\n")
+
+    # only passes in the instrumented sandbox, where a mutant is active
+    runner = SchemataRunner('test -n "$RADIATION_ACTIVE_MUTANT"')
+    radiation = Radiation(runner=runner, config=Config(project_root=tmp_path))
+    runner.prepare(
+        radiation.gen_mutations(tmp_path / "code.py"), config=radiation.config
+    )
+
+    assert {
+        radiation.test_mutation(mutation, timeout=10).status
+        for mutation in radiation.gen_mutations(tmp_path / "code.py")
+    } == {"survived"}
+    runner.cleanup()
+
+
+def test_schemata_runner_select_tests_runs_baseline_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "one.py").write_text("def one():\n    return 1\n")
+    (tmp_path / "test_one.py").write_text(
+        "from one import one\n\ndef test_one():\n    assert one() == 1\n"
+    )
+    runs: List[Sequence[str]] = []
+    run_tests_in_dir = SchemataRunner._run_tests_in_dir
+
+    def record_run(
+        self: SchemataRunner, *args: Any, **kwargs: Any
+    ) -> RadiationTestsResult:
+        runs.append(kwargs.get("args", ()))
+        return run_tests_in_dir(self, *args, **kwargs)
+
+    monkeypatch.setattr(SchemataRunner, "_run_tests_in_dir", record_run)
+
+    runner = SchemataRunner("pytest -q -p no:cacheprovider", select_tests=True)
+    radiation = Radiation(runner=runner, config=Config(project_root=tmp_path))
+    mutations = list(radiation.gen_mutations(tmp_path / "one.py"))
+    runner.prepare(mutations, config=radiation.config)
+
+    assert radiation.run_baseline_tests().status == "survived"
+    assert len(runs) == 1
+    assert {
+        radiation.test_mutation(mutation, timeout=10).status for mutation in mutations
+    } == {"killed"}
+    runner.cleanup()
+
+
+def test_schemata_runner_falls_back_when_instrumenting_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "one.py").write_text("a = 1 + 2\n")
+    (tmp_path / "two.py").write_text("b = 1 + 2\n")
+
+    def build_schema(code: str, *args: Any) -> Any:
+        if code.startswith("b"):
+            raise AttributeError(code)
+        return real_build_schema(code, *args)
+
+    real_build_schema = schemata.build_schema
+    monkeypatch.setattr(schemata, "build_schema", build_schema)
+
+    runner = SchemataRunner("python -c 'import one, two; assert one.a + two.b == 6'")
+    radiation = Radiation(runner=runner, config=Config(project_root=tmp_path))
+    mutations = [
+        *radiation.gen_mutations(tmp_path / "one.py"),
+        *radiation.gen_mutations(tmp_path / "two.py"),
+    ]
+    runner.prepare(mutations, config=radiation.config)
+
+    assert {path for path, *_ in runner._mutant_ids} == {tmp_path / "one.py"}
+    assert {
+        radiation.test_mutation(mutation, timeout=10).status for mutation in mutations
+    } == {"killed"}
+    runner.cleanup()
@@ -0,0 +1,115 @@
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from radiation import Radiation
+from radiation.config import Config
+from radiation.runners import TempDirRunner, snapshot
+from radiation.runners.snapshot import materialize, snapshot_tree
+
+
+@pytest.fixture
+def project_dir(tmp_path: Path) -> Path:
+    (tmp_path / "project" / "pkg").mkdir(parents=True)
+    (tmp_path / "project" / "a.py").write_text("a = 1")
+    (tmp_path / "project" / "pkg" / "b.py").write_text("b = 2")
+    return tmp_path / "project"
+
+
+def test_snapshot_tree_copy(project_dir: Path, tmp_path: Path) -> None:
+    snapshot_tree(project_dir, tmp_path / "sandbox")
+
+    assert (tmp_path / "sandbox" / "a.py").read_text() == "a = 1"
+    assert (tmp_path / "sandbox" / "pkg" / "b.py").read_text() == "b = 2"
+    assert (tmp_path / "sandbox" / "a.py").stat().st_nlink == 1
+
+
+def test_snapshot_tree_link(project_dir: Path, tmp_path: Path) -> None:
+    snapshot_tree(project_dir, tmp_path / "sandbox", mode="link")
+
+    assert (tmp_path / "sandbox" / "a.py").read_text() == "a = 1"
+    assert (tmp_path / "sandbox" / "pkg" / "b.py").read_text() == "b = 2"
+
+    materialize(tmp_path / "sandbox" / "a.py")
+    (tmp_path / "sandbox" / "a.py").write_text("a = 2")
+
+    assert (project_dir / "a.py").read_text() == "a = 1"
+    assert (project_dir / "a.py").stat().st_nlink == 1
+
+
+def test_snapshot_tree_link_falls_back_to_copy(
+    project_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(src: str, dst: str) -> None:
+        raise OSError("not supported")
+
+    monkeypatch.setattr(snapshot, "_reflink", fail)
+    monkeypatch.setattr(os, "link", fail)
+
+    snapshot_tree(project_dir, tmp_path / "sandbox", mode="link")
+
+    assert (tmp_path / "sandbox" / "a.py").read_text() == "a = 1"
+    assert (tmp_path / "sandbox" / "a.py").stat().st_nlink == 1
+    assert (project_dir / "a.py").stat().st_nlink == 1
+
+
+def test_snapshot_tree_link_copies_caches(
+    project_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(src: str, dst: str) -> None:
+        raise OSError("not supported")
+
+    monkeypatch.setattr(snapshot, "_reflink", fail)
+    (project_dir / ".pytest_cache" / "v").mkdir(parents=True)
+    (project_dir / ".pytest_cache" / "v" / "lastfailed").write_text("{}")
+    (project_dir / "pkg" / "__pycache__").mkdir()
+    (project_dir / "pkg" / "__pycache__" / "b.pyc").write_bytes(b"")
+    (project_dir / ".coverage").write_text("")
+
+    snapshot_tree(project_dir, tmp_path / "sandbox", mode="link")
+
+    assert {
+        path.relative_to(project_dir).as_posix()
+        for path in project_dir.rglob("*")
+        if path.is_file() and path.stat().st_nlink > 1
+    } == {"a.py", "pkg/b.py"}
+
+
+def _read_tree(path: Path) -> Dict[str, bytes]:
+    return {
+        file.relative_to(path).as_posix(): file.read_bytes()
+        for file in path.rglob("*")
+        if file.is_file()
+    }
+
+
+def test_tempdir_runner_link_keeps_project_unchanged(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(src: str, dst: str) -> None:
+        raise OSError("not supported")
+
+    # hardlinks, which share the files' content with the project
+    monkeypatch.setattr(snapshot, "_reflink", fail)
+    (tmp_path / "one.py").write_text("def one():\n    return 1\n")
+    (tmp_path / "test_one.py").write_text(
+        "from one import one\n\ndef test_one():\n    assert one() == 1\n"
+    )
+    # leaves a cache the mutants' failures will change
+    (tmp_path / "test_two.py").write_text("def test_two():\n    assert False\n")
+    subprocess.run(["pytest", "-q"], cwd=tmp_path, capture_output=True)
+    (tmp_path / "test_two.py").unlink()
+    before = _read_tree(tmp_path)
+    assert any(name.startswith(".pytest_cache/") for name in before)
+
+    runner = TempDirRunner("pytest -q", snapshot="link")
+    radiation = Radiation(runner=runner, config=Config(project_root=tmp_path))
+    assert {
+        radiation.test_mutation(mutation, timeout=10).status
+        for mutation in radiation.gen_mutations(tmp_path / "one.py")
+    } == {"killed"}
+
+    assert _read_tree(tmp_path) == before
@@ -1,12 +1,17 @@
 import ast
 import datetime as dt
+import time
 from dataclasses import replace
 from pathlib import Path
 from textwrap import dedent
 
+import pytest
+
 from radiation.config import Config
+from radiation.history import KillHistory
 from radiation.mutation import Mutation
 from radiation.runners import TempDirRunner
+from radiation.runners.tempdir import add_test_args
 from radiation.types import Context, FileContext, NodeContext
 from radiation.types import TestsResult as RadiationTestsResult
 
@@ -153,6 +158,30 @@ def test_tempdir_runner_timed_out_mutant(tmp_path: Path) -> None:
     ) == RadiationTestsResult(duration=dt.timedelta(1), status="timed out", output=None)
 
 
+def test_tempdir_runner_timeout_kills_child_processes(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("1")
+
+    start = time.monotonic()
+    result = TempDirRunner("sleep 10; true").test_mutation(
+        Mutation(
+            node=get_node_from_expr("2"),
+            tree=get_node_from_expr("2"),
+            context=Context(
+                node=NodeContext(
+                    lineno=1, end_lineno=1, col_offset=0, end_col_offset=1
+                ),
+                file=FileContext(path=tmp_path / "code.py"),
+            ),
+        ),
+        config=Config(project_root=tmp_path),
+        timeout=0.1,
+    )
+
+    assert result.status == "timed out"
+    # the sleep, a child of the shell, doesn't keep the output pipes open
+    assert time.monotonic() - start < 5
+
+
 def test_tempdir_runner_not_timed_out_mutant(tmp_path: Path) -> None:
     (tmp_path / "code.py").write_text("1")
 
@@ -252,3 +281,288 @@ def test_tempdir_runner_baseline_duration(tmp_path: Path) -> None:
         ),
         duration=dt.timedelta(1),
     ).duration > dt.timedelta(seconds=0.2)
+
+
+def test_tempdir_runner_reuse_sandboxes(tmp_path: Path) -> None:
+    (tmp_path / "mod.py").write_text("a = 1")
+    runner = TempDirRunner(
+        'env -u PYTHONDONTWRITEBYTECODE python -c "import mod; print(mod.a)"',
+        reuse_sandboxes=True,
+    )
+
+    outputs = [
+        runner.test_mutation(
+            Mutation(
+                node=get_node_from_expr(value),
+                tree=get_node_from_expr(value),
+                context=Context(
+                    node=NodeContext(
+                        lineno=1, end_lineno=1, col_offset=4, end_col_offset=5
+                    ),
+                    file=FileContext(path=tmp_path / "mod.py"),
+                ),
+            ),
+            config=Config(project_root=tmp_path),
+        ).output
+        for value in ("2", "3")
+    ]
+
+    assert outputs == ["2\n", "3\n"]
+    assert runner._sandboxes.qsize() == 1
+    runner.cleanup()
+    assert runner._sandboxes.qsize() == 0
+
+
+def test_tempdir_runner_link_snapshot_keeps_original(tmp_path: Path) -> None:
+    (tmp_path / "code.py").write_text("1")
+
+    result = TempDirRunner("cat code.py", snapshot="link").test_mutation(
+        Mutation(
+            node=get_node_from_expr("2"),
+            tree=get_node_from_expr("2"),
+            context=Context(
+                node=NodeContext(
+                    lineno=1, end_lineno=1, col_offset=0, end_col_offset=1
+                ),
+                file=FileContext(path=tmp_path / "code.py"),
+            ),
+        ),
+        config=Config(project_root=tmp_path),
+    )
+
+    assert result.output == "2"
+    assert (tmp_path / "code.py").read_text() == "1"
+
+
+def test_tempdir_runner_select_tests(tmp_path: Path) -> None:
+    (tmp_path / "signs.py").write_text(
+        _dedent(
+            """
+            def is_positive(n: int) -> bool:
+                return n > 0
+
+            def is_negative(n: int) -> bool:
+                return n < 0
+
+            def is_zero(n: int) -> bool:
+                return n == 0
+            """
+        )
+    )
+    (tmp_path / "test_signs.py").write_text(
+        _dedent(
+            """
+            from signs import is_negative, is_positive
+
+            def test_is_positive():
+                assert is_positive(1)
+
+            def test_is_negative():
+                assert is_negative(-1)
+            """
+        )
+    )
+
+    def mutation(expr: str, lineno: int) -> Mutation:
+        return Mutation(
+            node=get_node_from_expr(expr),
+            tree=get_node_from_expr(expr),
+            context=Context(
+                node=NodeContext(
+                    lineno=lineno, end_lineno=lineno, col_offset=11, end_col_offset=16
+                ),
+                file=FileContext(path=tmp_path / "signs.py"),
+            ),
+        )
+
+    config = Config(project_root=tmp_path)
+    runner = TempDirRunner("pytest -q -p no:cacheprovider", select_tests=True)
+    assert runner.run_baseline_tests(config=config).status == "survived"
+
+    result = runner.test_mutation(mutation("n >= 0", 2), config=config)
+    assert result.status == "survived"
+    assert "1 passed" in (result.output or "")
+
+    assert runner.test_mutation(mutation("n <= 0", 8), config=config) == (
+        RadiationTestsResult(duration=dt.timedelta(), status="uncovered")
+    )
+
+
+@pytest.mark.parametrize(
+    "run_command, expected",
+    [
+        ("pytest tests", "pytest t.py::t"),
+        ("python -m pytest -q tests/test_a.py::test_b", "python -m pytest -q t.py::t"),
+        (
+            "pytest --rootdir tests -k tests tests",
+            "pytest --rootdir tests -k tests t.py::t",
+        ),
+        ("pytest tests && echo tests", "pytest t.py::t && echo tests"),
+        ("pytest -q missing", "pytest -q missing t.py::t"),
+        ("pytest -q", "pytest -q t.py::t"),
+        ("pytest; coverage report", "pytest t.py::t; coverage report"),
+        ("pytest 'tests'|tee log", "pytest t.py::t|tee log"),
+        ("pytest -q > log  # all", "pytest -q t.py::t > log  # all"),
+        ("cd . && make test", "cd . && make test t.py::t"),
+    ],
+)
+def test_add_test_args(tmp_path: Path, run_command: str, expected: str) -> None:
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_a.py").touch()
+    assert add_test_args(run_command, ["t.py::t"], tmp_path) == expected
+    assert add_test_args(run_command, [], tmp_path) == run_command
+
+
+def test_add_test_args_options() -> None:
+    assert add_test_args("pytest tests && echo ok", ["-x"], ".") == (
+        "pytest tests -x && echo ok"
+    )
+
+
+def test_tempdir_runner_select_tests_with_test_paths(tmp_path: Path) -> None:
+    (tmp_path / "signs.py").write_text(
+        _dedent(
+            """
+            def is_positive(n: int) -> bool:
+                return n > 0
+
+            def is_negative(n: int) -> bool:
+                return n < 0
+            """
+        )
+    )
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_signs.py").write_text(
+        _dedent(
+            """
+            from signs import is_negative, is_positive
+
+            def test_is_positive():
+                assert is_positive(1)
+
+            def test_is_negative():
+                assert is_negative(-1)
+            """
+        )
+    )
+    mutation = Mutation(
+        node=get_node_from_expr("n >= 0"),
+        tree=get_node_from_expr("n >= 0"),
+        context=Context(
+            node=NodeContext(lineno=2, end_lineno=2, col_offset=11, end_col_offset=16),
+            file=FileContext(path=tmp_path / "signs.py"),
+        ),
+    )
+
+    config = Config(project_root=tmp_path)
+    runner = TempDirRunner(
+        "PYTHONPATH=. pytest -q -p no:cacheprovider tests; echo done",
+        select_tests=True,
+    )
+    assert runner.run_baseline_tests(config=config).status == "survived"
+
+    # only the selected test runs, not the whole tests directory
+    result = runner.test_mutation(mutation, config=config)
+    assert "1 passed" in (result.output or "")
+    assert (result.output or "").endswith("done\n")
+
+
+def test_tempdir_runner_select_tests_timeout(tmp_path: Path) -> None:
+    (tmp_path / "countdown.py").write_text(
+        _dedent(
+            """
+            def countdown(n: int) -> int:
+                while n > 0:
+                    n = n - 1
+                return n
+            """
+        )
+    )
+    (tmp_path / "test_countdown.py").write_text(
+        _dedent(
+            """
+            from time import sleep
+
+            from countdown import countdown
+
+            def test_countdown():
+                assert countdown(3) == 0
+
+            def test_slow():
+                sleep(3)
+            """
+        )
+    )
+
+    config = Config(project_root=tmp_path)
+    runner = TempDirRunner(
+        "pytest -q -p no:cacheprovider", select_tests=True, timeout_floor=0.5
+    )
+    baseline = runner.run_baseline_tests(config=config)
+    assert baseline.status == "survived"
+
+    # n = n + 1 never ends, only the quick test that covers it times it
+    result = runner.test_mutation(
+        Mutation(
+            node=get_node_from_expr("n + 1"),
+            tree=get_node_from_expr("n + 1"),
+            context=Context(
+                node=NodeContext(
+                    lineno=3, end_lineno=3, col_offset=12, end_col_offset=17
+                ),
+                file=FileContext(path=tmp_path / "countdown.py"),
+            ),
+        ),
+        config=config,
+        timeout=baseline.duration.total_seconds() * 1.5,
+    )
+    assert result.status == "timed out"
+    assert result.duration < baseline.duration - dt.timedelta(seconds=1)
+
+
+def test_tempdir_runner_kill_history(tmp_path: Path) -> None:
+    (tmp_path / "signs.py").write_text(
+        _dedent(
+            """
+            def is_positive(n: int) -> bool:
+                return n > 0
+            """
+        )
+    )
+    (tmp_path / "test_signs.py").write_text(
+        _dedent(
+            """
+            from signs import is_positive
+
+            def test_one():
+                assert is_positive(1)
+
+            def test_zero():
+                assert not is_positive(0)
+            """
+        )
+    )
+
+    mutation = Mutation(
+        node=get_node_from_expr("n >= 0"),
+        tree=get_node_from_expr("n >= 0"),
+        context=Context(
+            node=NodeContext(lineno=2, end_lineno=2, col_offset=11, end_col_offset=16),
+            file=FileContext(path=tmp_path / "signs.py"),
+        ),
+    )
+    config = Config(project_root=tmp_path)
+    history = KillHistory()
+    runner = TempDirRunner(
+        "pytest -q -p no:cacheprovider", fail_fast=True, history=history
+    )
+
+    result = runner.test_mutation(mutation, config=config)
+    assert result.status == "killed"
+    assert "1 failed, 1 passed" in (result.output or "")
+    assert history.get_killers(mutation, config=config) == ["test_signs.py::test_zero"]
+
+    # only the recorded killer runs
+    result = runner.test_mutation(mutation, config=config)
+    assert result.status == "killed"
+    assert "1 failed in" in (result.output or "")
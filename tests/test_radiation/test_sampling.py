@@ -0,0 +1,91 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from radiation.config import Config
+from radiation.journal import JournalEntry
+from radiation.mutation import Mutation
+from radiation.sampling import Prioritizer, get_survival_rates
+from radiation.types import Context, FileContext, NodeContext, ResultStatus
+
+from .utils import get_node_from_expr
+
+
+def _entry(mutator: str, status: ResultStatus) -> JournalEntry:
+    return JournalEntry(
+        path="a.py",
+        lineno=1,
+        end_lineno=1,
+        col_offset=0,
+        end_col_offset=1,
+        replacement="2",
+        digest="",
+        status=status,
+        duration=0.1,
+        mutator=mutator,
+    )
+
+
+def test_get_survival_rates() -> None:
+    assert get_survival_rates(
+        [
+            _entry("flip", "survived"),
+            _entry("flip", "uncovered"),
+            _entry("swap", "killed"),
+            _entry("swap", "killed"),
+            _entry("swap", "timed out"),
+            _entry("swap", "equivalent"),
+        ]
+    ) == {"flip": 0.75, "swap": 0.25}
+
+
+def _mutation(path: Path, lineno: int, mutator: str) -> Mutation:
+    return Mutation(
+        node=get_node_from_expr("2"),
+        tree=get_node_from_expr("2"),
+        context=Context(
+            node=NodeContext(
+                lineno=lineno, end_lineno=lineno, col_offset=0, end_col_offset=1
+            ),
+            file=FileContext(path=path),
+        ),
+        mutator=mutator,
+    )
+
+
+@pytest.fixture
+def mutations(tmp_path: Path) -> List[Mutation]:
+    return [
+        _mutation(tmp_path / "a.py", 1, "swap"),
+        _mutation(tmp_path / "a.py", 2, "flip"),
+        _mutation(tmp_path / "a.py", 3, "swap"),
+        _mutation(tmp_path / "b.py", 1, "swap"),
+        _mutation(tmp_path / "b.py", 2, "other"),
+    ]
+
+
+def _locations(mutations: List[Mutation]) -> List[str]:
+    return [
+        f"{mutation.context.file.path.name}:{mutation.context.node.lineno}"
+        for mutation in mutations
+    ]
+
+
+def test_prioritizer_takes_turns_between_files(
+    tmp_path: Path, mutations: List[Mutation]
+) -> None:
+    ranked = Prioritizer(survival_rates={"flip": 0.9, "swap": 0.1}).sort(
+        mutations, config=Config(project_root=tmp_path)
+    )
+    assert _locations(ranked) == ["a.py:2", "b.py:2", "a.py:1", "b.py:1", "a.py:3"]
+
+
+def test_prioritizer_changed_lines_first(
+    tmp_path: Path, mutations: List[Mutation]
+) -> None:
+    ranked = Prioritizer(
+        changed=lambda mutation, config: mutation.context.node.lineno == 3,
+        survival_rates={"flip": 0.9, "swap": 0.1},
+    ).sort(mutations, config=Config(project_root=tmp_path))
+    assert _locations(ranked) == ["a.py:3", "b.py:2", "a.py:2", "b.py:1", "a.py:1"]
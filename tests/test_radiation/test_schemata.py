@@ -0,0 +1,89 @@
+from pathlib import Path
+from textwrap import dedent
+from typing import Any, Dict
+
+import pytest
+
+from radiation import Radiation
+from radiation.config import Config
+from radiation.schemata import ACTIVE_MUTANT_ENV, build_schema
+
+
+def _dedent(text: str) -> str:
+    return dedent(text.lstrip("\n")).rstrip("\n")
+
+
+def _exec(code: str) -> Dict[str, Any]:
+    namespace: Dict[str, Any] = {}
+    exec(compile(code, "<schema>", "exec"), namespace)
+    return namespace
+
+
+CODE = _dedent(
+    '''
+    """docstring"""
+    from __future__ import annotations
+
+    def add(a: int, b: int) -> int:
+        return a + b
+    '''
+)
+
+
+@pytest.fixture
+def radiation(tmp_path: Path) -> Radiation:
+    return Radiation(config=Config(project_root=tmp_path))
+
+
+def test_build_schema_switches_mutants(
+    radiation: Radiation, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    mutations = {
+        str(index): mutation
+        for index, mutation in enumerate(radiation.gen_mutations_str(CODE))
+    }
+
+    code, mutant_ids = build_schema(CODE, mutations)
+
+    # the docstring mutation cannot be switched at runtime
+    assert mutant_ids == set(mutations) - {"0"}
+
+    assert _exec(code)["add"](5, 3) == 8
+    assert _exec(code)["__doc__"] == "docstring"
+    monkeypatch.setenv(ACTIVE_MUTANT_ENV, "1")
+    assert _exec(code)["add"](5, 3) == 2
+
+
+def test_build_schema_skips_f_strings(radiation: Radiation) -> None:
+    code = 'a = f"{1}x"'
+    mutations = {
+        str(index): mutation
+        for index, mutation in enumerate(radiation.gen_mutations_str(code))
+    }
+
+    schema, mutant_ids = build_schema(code, mutations)
+
+    assert mutations
+    assert mutant_ids == set()
+    assert _exec(schema)["a"] == "1x"
+
+
+def test_build_schema_match_statement(radiation: Radiation) -> None:
+    code = _dedent(
+        """
+        def sign(n: int) -> int:
+            match n:
+                case 0:
+                    return 0
+            return 1 if n > 0 else -1
+        """
+    )
+    mutations = {
+        str(index): mutation
+        for index, mutation in enumerate(radiation.gen_mutations_str(code))
+    }
+
+    schema, mutant_ids = build_schema(code, mutations)
+
+    assert mutant_ids
+    assert [_exec(schema)["sign"](n) for n in (-2, 0, 2)] == [-1, 0, 1]
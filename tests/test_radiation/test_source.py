@@ -0,0 +1,164 @@
+import ast
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from radiation import Radiation
+from radiation.config import Config
+from radiation.mutation import (
+    apply_mutation_on_disk,
+    apply_mutation_on_string,
+    get_mutation_source,
+)
+from radiation.runners import TempDirRunner
+from radiation.source import (
+    SourceCache,
+    SourceLines,
+    parenthesize,
+    replace_tokens,
+    unparse,
+)
+
+from .utils import get_node_from_expr
+
+
+def test_source_lines_non_ascii_offsets() -> None:
+    source = SourceLines('s = "ñandú" + x\ny = 1\n')
+    node = ast.parse(source.text).body[0].value.right  # type: ignore
+
+    assert source.get_segment(node) == "x"
+    assert source.splice(*source.get_node_span(node), "z") == (  # type: ignore
+        's = "ñandú" + z\ny = 1\n'
+    )
+
+
+def test_replace_tokens() -> None:
+    source = SourceLines("a = (b)  +  c is not d\n")
+    node = ast.parse(source.text).body[0].value  # type: ignore
+
+    assert (
+        replace_tokens(
+            source,
+            node,
+            [(node.left.left, node.left.right, "+", "-")],
+        )
+        == "(b)  -  c is not d"
+    )
+    assert (
+        replace_tokens(source, node, [(node.left, node.comparators[0], "is not", "is")])
+        == "(b)  +  c is d"
+    )
+    assert (
+        replace_tokens(source, node, [(node.left, node.comparators[0], "in", "")])
+        is None
+    )
+    assert replace_tokens(None, node, []) is None
+
+
+def test_replace_tokens_skips_comments() -> None:
+    source = SourceLines("a = (price  # net - tax\n - discount)\n")
+    node = ast.parse(source.text).body[0].value  # type: ignore
+
+    assert (
+        replace_tokens(source, node, [(node.left, node.right, "-", "+")])
+        == "price  # net - tax\n + discount"
+    )
+
+
+def test_unparse_parenthesizes() -> None:
+    assert unparse(get_node_from_expr("a + b")) == "(a + b)"
+    assert unparse(get_node_from_expr("f(a + b)")) == "f(a + b)"
+    assert parenthesize("a", get_node_from_expr("a")) == "a"
+
+
+def _mutated_sources(code: str) -> List[str]:
+    radiation = Radiation(
+        config=Config(project_root=Path("/project")),
+        runner=TempDirRunner(run_command=""),
+    )
+    return [
+        apply_mutation_on_string(code, mutation)
+        for mutation in radiation.gen_mutations_str(code, "code.py")
+    ]
+
+
+@pytest.mark.parametrize(
+    ["code", "expected"],
+    (
+        ("x = a  +  b", "x = a  -  b"),
+        ("x = a or (b)", "x = a and (b)"),
+        ("x = a < b <= c", "x = a <= b <= c"),
+        ("x = a < b <= c", "x = a < b < c"),
+        ("x = a not  in b", "x = a in b"),
+        ("x = - a", "x = + a"),
+        ("x = (a  # a - b\n - b)", "x = (a  # a - b\n + b)"),
+        ("x = (a  # not a\n or b)", "x = (a  # not a\n and b)"),
+        ("x = ~(a + b)", "x = (a + b)"),
+        ("x = 'ñ'", "x = 'XXXñXXX'"),
+        ("x = 2", "x = 3"),
+        ("if a or b:\n    pass", "if not (a or b):\n    pass"),
+    ),
+)
+def test_mutators_produce_source(code: str, expected: str) -> None:
+    assert expected in _mutated_sources(code)
+
+
+def test_mutators_source_matches_tree() -> None:
+    code = "x = a - b * 2 if not c and d < 3 else ~e\n"
+    radiation = Radiation(
+        config=Config(project_root=Path("/project")),
+        runner=TempDirRunner(run_command=""),
+    )
+    for mutation in radiation.gen_mutations_str(code, "code.py"):
+        assert mutation.source is not None
+        assert ast.dump(ast.parse(apply_mutation_on_string(code, mutation))) == (
+            ast.dump(ast.parse(unparse(mutation.tree)))
+        ), get_mutation_source(mutation)
+
+
+def test_source_cache(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("a = 1\n")
+    cache = SourceCache()
+
+    source = cache.get_source(tmp_path / "a.py")
+    tree = cache.get_tree(tmp_path / "a.py")
+    assert source.text == "a = 1\n"
+    assert cache.get_source(tmp_path / "a.py") is source
+    assert cache.get_tree(tmp_path / "a.py") is tree
+
+    (tmp_path / "a.py").write_text("a = 12\n")
+    assert cache.get_source(tmp_path / "a.py").text == "a = 12\n"
+    assert cache.get_tree(tmp_path / "a.py") is not tree
+
+
+def test_source_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text(f"# {name}\n")
+    cache = SourceCache(max_size=2)
+
+    source_a = cache.get_source(tmp_path / "a.py")
+    source_b = cache.get_source(tmp_path / "b.py")
+    cache.get_source(tmp_path / "a.py")
+    cache.get_source(tmp_path / "c.py")
+
+    assert cache.get_source(tmp_path / "a.py") is source_a
+    assert cache.get_source(tmp_path / "b.py") is not source_b
+
+
+def test_gen_mutations_shares_source(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("a = 1 + 2\n")
+    radiation = Radiation(
+        config=Config(project_root=tmp_path),
+        runner=TempDirRunner(run_command=""),
+    )
+    mutations = list(radiation.gen_mutations(tmp_path / "a.py"))
+
+    assert {id(mutation.context.file.source) for mutation in mutations} == {
+        id(radiation.sources.get_source(tmp_path / "a.py"))
+    }
+
+    # applying doesn't read the original file again
+    (tmp_path / "a.py").rename(tmp_path / "b.py")
+    apply_mutation_on_disk(tmp_path / "b.py", mutations[0])
+    assert (tmp_path / "b.py").read_text() == "a = 0 + 2\n"
@@ -0,0 +1,55 @@
+import datetime as dt
+
+import pytest
+
+from radiation.timing import BaselineTimings, get_test_durations, get_timeout
+from radiation.types import TestsResult as RadiationTestsResult
+
+OUTPUT = """
+....                                                                     [100%]
+============================== slowest durations ===============================
+0.10s call     test_a.py::test_slow[2 3]
+0.05s call     test_a.py::test_slow[1]
+0.01s setup    test_a.py::test_slow[1]
+0.00s teardown test_a.py::test_slow[1]
+0.00s call     test_a.py::TestC::test_m
+4 passed in 0.16s
+"""
+
+
+def test_get_test_durations() -> None:
+    assert get_test_durations(OUTPUT) == {
+        "test_a.py::test_slow[2 3]": 0.1,
+        "test_a.py::test_slow[1]": pytest.approx(0.06),
+        "test_a.py::TestC::test_m": 0.0,
+    }
+    assert get_test_durations(None) == {}
+
+
+def test_get_timeout() -> None:
+    assert get_timeout(2, multiplier=1.5, floor=1) == 3
+    assert get_timeout(0.1, multiplier=1.5, floor=1) == 1
+
+
+def test_test_timings() -> None:
+    timings = BaselineTimings.from_baseline(
+        RadiationTestsResult(
+            duration=dt.timedelta(seconds=1.16), status="survived", output=OUTPUT
+        )
+    )
+
+    assert timings is not None
+    assert round(timings.overhead, 2) == 1
+    assert round(timings.get_expected(["test_a.py::test_slow[1]"]) or 0, 2) == 1.06
+    assert timings.get_expected(["test_a.py::test_new"]) is None
+
+
+def test_test_timings_without_durations() -> None:
+    assert (
+        BaselineTimings.from_baseline(
+            RadiationTestsResult(
+                duration=dt.timedelta(seconds=1), status="survived", output=""
+            )
+        )
+        is None
+    )
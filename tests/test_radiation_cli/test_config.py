@@ -23,6 +23,7 @@ def test_read_default_config_cfg(tmp_path: Path) -> None:
             tests_timeout = 2.5
             diff_command = git diff develop
             line_limit = 4
+            jobs = 8
             """
         )
     )
@@ -35,6 +36,39 @@ def test_read_default_config_cfg(tmp_path: Path) -> None:
         tests_timeout=2.5,
         diff_command="git diff develop",
         line_limit=4,
+        jobs=8,
+    )
+
+
+def test_read_default_config_cfg_flags(tmp_path: Path) -> None:
+    (tmp_path / ".radiation.cfg").write_text(
+        _dedent(
+            """
+            [settings]
+            include = .
+            tests_dir = tests
+            run_command = pytest
+            exclude =
+                build/
+                *_pb2.py
+            git_files = true
+            fail_fast = true
+            kill_history = true
+            cache = true
+            """
+        )
+    )
+
+    assert read_default_config(tmp_path) == CLIConfig(
+        include=["."],
+        project_root=tmp_path,
+        run_command="pytest",
+        tests_dir="tests",
+        exclude=["build/", "*_pb2.py"],
+        git_files=True,
+        fail_fast=True,
+        kill_history=True,
+        cache=True,
     )
 
 
@@ -116,6 +150,7 @@ def test_read_default_config_toml(tmp_path: Path) -> None:
             tests_timeout = 2.5
             diff_command = "git diff develop"
             line_limit = 4
+            jobs = 8
             """
         )
     )
@@ -128,6 +163,7 @@ def test_read_default_config_toml(tmp_path: Path) -> None:
         tests_timeout=2.5,
         diff_command="git diff develop",
         line_limit=4,
+        jobs=8,
     )
 
 
@@ -1,9 +1,15 @@
+import json
+import subprocess
+import sys
 from pathlib import Path
 from textwrap import dedent
+from typing import Any, List
 
 import pytest
 from click.testing import CliRunner
 
+from radiation.journal import Journal
+from radiation.runners import TempDirRunner
 from radiation_cli.main import cli
 
 
@@ -53,6 +59,7 @@ def project_path(tmp_path: Path) -> Path:
             include = code.py
             tests_dir = test_code.py
             run_command = python test_code.py
+            timeout_floor = 30
             """
         )
     )
@@ -62,12 +69,13 @@ def project_path(tmp_path: Path) -> Path:
 
 def test_cli_run(project_path: Path) -> None:
     cli_runner = CliRunner(mix_stderr=False)
+    # a generous timeout, so no mutation times out on a loaded machine
     result = cli_runner.invoke(cli, ["-p", str(project_path), "run"])
     assert result.stdout.rstrip("\n") == _dedent(
         """
-        Generated 9 mutations
         Running baseline tests ..
         Running tests
+        Tested 9 mutations
 
         Surviving mutant in code.py:3
         1 from typing import List
@@ -95,9 +103,9 @@ def test_cli_run_line_limit(project_path: Path) -> None:
     )
     assert result.stdout.rstrip("\n") == _dedent(
         """
-        Generated 3 mutations
         Running baseline tests ..
         Running tests
+        Tested 3 mutations
 
         Surviving mutant in code.py:3
         1 from typing import List
@@ -111,6 +119,115 @@ def test_cli_run_line_limit(project_path: Path) -> None:
     assert result.exit_code == 0
 
 
+def test_cli_run_exclude(project_path: Path) -> None:
+    (project_path / "generated").mkdir()
+    (project_path / "generated" / "code.py").write_text("a = 1\n")
+
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(
+        cli,
+        ["-p", str(project_path), "-i", ".", "-e", "generated/", "-e", "code.py"]
+        + ["--tests-dir", "test_code.py", "run"],
+    )
+    assert "Tested 0 mutations" in result.stdout
+    assert result.exit_code == 0
+
+
+def test_cli_run_sample(project_path: Path) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(cli, ["--sample", "2", "-p", str(project_path), "run"])
+    assert "Tested 2 mutations\nCovered 2 of 9 mutations (22%)\n" in result.stdout
+    assert result.exit_code == 0
+
+
+def test_cli_run_sample_changed_lines_first(project_path: Path) -> None:
+    # the project is a subdirectory of the repository, and the change is
+    # committed, as in a CI checkout of a branch
+    repo = project_path
+    project = repo / "project"
+    project.mkdir()
+    for path in list(repo.iterdir()):
+        if path != project:
+            path.rename(project / path.name)
+
+    def git(*args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=a", "-c", "user.email=a@a", *args],
+            cwd=repo,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init", "-q", "-b", "main")
+    git("add", ".")
+    git("commit", "-q", "-m", "base")
+    git("checkout", "-q", "-b", "feature")
+    code = project / "code.py"
+    code.write_text(code.read_text().replace("max(0, ", "max(0,  "))
+    git("commit", "-q", "-am", "change")
+
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(
+        cli,
+        ["--sample", "1", "--sample-base", "main", "-p", str(project), "run"],
+    )
+    assert result.exit_code == 0
+    journal = (project / ".radiation" / "journal.jsonl").read_text()
+    assert json.loads(journal)["lineno"] == 5
+
+
+def test_cli_run_sample_unknown_base(project_path: Path) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(
+        cli,
+        ["--sample", "1", "--sample-base", "nope", "-p", str(project_path), "run"],
+    )
+    assert "Warning: cannot diff against 'nope'" in result.stderr
+    assert "Tested 1 mutations" in result.stdout
+    assert result.exit_code == 0
+
+
+def test_cli_run_time_budget(project_path: Path) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(
+        cli, ["--time-budget", "0", "-p", str(project_path), "run"]
+    )
+    assert "Tested 0 mutations\nCovered 0 of 9 mutations (0%)\n" in result.stdout
+    assert result.exit_code == 0
+
+
+def test_cli_run_screen_equivalent(project_path: Path) -> None:
+    code_path = project_path / "code.py"
+    code_path.write_text('"""Finds lines."""\n' + code_path.read_text())
+
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(cli, ["-p", str(project_path), "run"])
+    assert "Tested 10 mutations\nFound 1 equivalent mutations" in result.stdout
+    assert "XXX" not in result.stdout
+    assert result.exit_code == 0
+
+    result = cli_runner.invoke(
+        cli, ["--no-screen-equivalent", "-p", str(project_path), "run"]
+    )
+    assert "equivalent" not in result.stdout
+    assert "Surviving mutant in code.py:1\n1 'XXXFinds lines.XXX'" in result.stdout
+    assert result.exit_code == 0
+
+
+@pytest.mark.skipif(
+    sys.version_info >= (3, 12), reason="f-string parts have their own positions"
+)
+def test_cli_run_removes_duplicates(project_path: Path) -> None:
+    # both "-" parts have the position of the whole f-string
+    (project_path / "code.py").write_text('def key(a, b):\n    return f"{a}-{b}-"\n')
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(
+        cli, ["-p", str(project_path), "--run-command", "true", "run"]
+    )
+    assert "Tested 1 mutations\nRemoved 1 duplicate mutations\n" in result.stdout
+    assert result.exit_code == 0
+
+
 def test_cli_run_with_diff(project_path: Path) -> None:
     cli_runner = CliRunner(mix_stderr=False)
 
@@ -129,14 +246,15 @@ def test_cli_run_with_diff(project_path: Path) -> None:
     )
 
     result = cli_runner.invoke(
-        cli, ["--diff-command", "cat patch", "-p", str(project_path), "run"]
+        cli,
+        ["--diff-command", "cat patch", "-p", str(project_path), "run"],
     )
 
     assert result.stdout.rstrip("\n") == _dedent(
         """
-        Generated 3 mutations
         Running baseline tests ..
         Running tests
+        Tested 3 mutations
         """
     )
     assert result.stderr == ""
@@ -151,7 +269,6 @@ def test_cli_run_baseline_fails(project_path: Path) -> None:
     )
     assert result.stdout.rstrip("\n") == _dedent(
         """
-        Generated 9 mutations
         Running baseline tests ..
         """
     )
@@ -164,6 +281,30 @@ def test_cli_run_baseline_fails(project_path: Path) -> None:
     assert result.exit_code == 1
 
 
+def test_cli_run_cleans_up_when_interrupted(
+    project_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cleaned_up: List[TempDirRunner] = []
+    cleanup = TempDirRunner.cleanup
+
+    def record_cleanup(runner: TempDirRunner) -> None:
+        cleaned_up.append(runner)
+        cleanup(runner)
+
+    def interrupt(*args: Any, **kwargs: Any) -> None:
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(TempDirRunner, "cleanup", record_cleanup)
+    monkeypatch.setattr(Journal, "append", interrupt)
+
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(
+        cli, ["-p", str(project_path), "--reuse-sandboxes", "run"]
+    )
+    assert result.exit_code == 1
+    assert len(cleaned_up) == 1
+
+
 def test_cli_run_timeout_is_1_5x_of_baseline_duration(project_path: Path) -> None:
     (project_path / "code.py").write_text(
         _dedent(
@@ -181,7 +322,7 @@ def test_cli_run_timeout_is_1_5x_of_baseline_duration(project_path: Path) -> Non
             from code import run_func
 
             def sleep_func(amount):
-                sleep(amount / 5)
+                sleep(amount)
                 return 5
 
             def test_run_func() -> int:
@@ -195,13 +336,13 @@ def test_cli_run_timeout_is_1_5x_of_baseline_duration(project_path: Path) -> Non
     cli_runner = CliRunner(mix_stderr=False)
     result = cli_runner.invoke(
         cli,
-        ["-p", str(project_path), "run"],
+        ["-p", str(project_path), "--timeout-floor", "0", "run"],
     )
     assert result.stdout.rstrip("\n") == _dedent(
         """
-        Generated 2 mutations
         Running baseline tests ..
         Running tests
+        Tested 2 mutations
 
         Surviving mutant in code.py:2
         1 def run_func(f):
@@ -214,3 +355,316 @@ def test_cli_run_timeout_is_1_5x_of_baseline_duration(project_path: Path) -> Non
     )
     assert result.stderr == ""
     assert result.exit_code == 0
+
+
+def test_cli_run_jobs(project_path: Path) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(
+        cli, ["--line-limit", "1", "--jobs", "2", "-p", str(project_path), "run"]
+    )
+    assert result.stdout.rstrip("\n") == _dedent(
+        """
+        Running baseline tests ..
+        Running tests
+        Tested 3 mutations
+
+        Surviving mutant in code.py:3
+        1 from typing import List
+        2 
+        3 def grep(lines: List[str], line: str, context: int = -1) -> List[str]:
+        4     index = lines.index(line)
+        5     start = max(0, index - context)
+        """  # noqa: W291
+    )
+    assert result.stderr == ""
+    assert result.exit_code == 0
+
+
+def test_cli_run_schemata(project_path: Path) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(
+        cli, ["--line-limit", "1", "--schemata", "-p", str(project_path), "run"]
+    )
+    assert result.stdout.rstrip("\n") == _dedent(
+        """
+        Running baseline tests ..
+        Running tests
+        Tested 3 mutations
+
+        Surviving mutant in code.py:3
+        1 from typing import List
+        2 
+        3 def grep(lines: List[str], line: str, context: int = -1) -> List[str]:
+        4     index = lines.index(line)
+        5     start = max(0, index - context)
+        """  # noqa: W291
+    )
+    assert result.stderr == ""
+    assert result.exit_code == 0
+
+
+def test_cli_run_fork(tmp_path: Path) -> None:
+    (tmp_path / "positive.py").write_text(
+        _dedent(
+            """
+            def is_positive(n: int) -> bool:
+                return n > 0
+            """
+        )
+    )
+    (tmp_path / "test_positive.py").write_text(
+        _dedent(
+            """
+            from positive import is_positive
+
+            def test_is_positive():
+                assert is_positive(1)
+                assert not is_positive(-1)
+            """
+        )
+    )
+
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(
+        cli,
+        [
+            "-p",
+            str(tmp_path),
+            "-i",
+            "positive.py",
+            "--run-command",
+            "pytest -q",
+            "--fork",
+            "run",
+        ],
+    )
+    assert result.stdout.rstrip("\n") == _dedent(
+        """
+        Running baseline tests ..
+        Running tests
+        Tested 4 mutations
+
+        Surviving mutant in positive.py:2
+        1 def is_positive(n: int) -> bool:
+        2     return n > -1
+
+        Surviving mutant in positive.py:2
+        1 def is_positive(n: int) -> bool:
+        2     return n >= 0
+        """
+    )
+    assert result.stderr == ""
+    assert result.exit_code == 0
+
+
+def test_cli_run_fork_requires_pytest(project_path: Path) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(cli, ["-p", str(project_path), "--fork", "run"])
+    assert result.stderr == (
+        "Error: --fork requires the run command to be a pytest invocation\n"
+    )
+    assert result.exit_code == 1
+
+
+@pytest.mark.parametrize(
+    "args, options",
+    [
+        (["--schemata"], "--schemata"),
+        (["--select-tests", "--kill-history"], "--select-tests, --kill-history"),
+        (["--reuse-sandboxes", "--snapshot", "link"], "--reuse-sandboxes, --snapshot"),
+    ],
+)
+def test_cli_run_fork_incompatible_options(
+    project_path: Path, args: List[str], options: str
+) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(
+        cli,
+        ["-p", str(project_path), "--run-command", "pytest", "--fork", *args, "run"],
+    )
+    assert result.stderr.endswith(f"Error: --fork cannot be combined with {options}\n")
+    assert result.exit_code == 2
+
+
+def test_cli_run_select_tests(tmp_path: Path) -> None:
+    (tmp_path / "signs.py").write_text(
+        _dedent(
+            """
+            def is_positive(n: int) -> bool:
+                return n > 0
+
+            def is_zero(n: int) -> bool:
+                return n == 0
+            """
+        )
+    )
+    (tmp_path / "test_signs.py").write_text(
+        _dedent(
+            """
+            from signs import is_positive
+
+            def test_is_positive():
+                assert is_positive(1)
+                assert not is_positive(0)
+            """
+        )
+    )
+
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(
+        cli,
+        [
+            "-p",
+            str(tmp_path),
+            "-i",
+            "signs.py",
+            "--run-command",
+            "pytest -q -p no:cacheprovider",
+            "--line-limit",
+            "1",
+            "--select-tests",
+            "run",
+        ],
+    )
+    assert result.stdout.rstrip("\n") == _dedent(
+        """
+        Running baseline tests ..
+        Running tests
+        Tested 2 mutations
+
+        Surviving (uncovered) mutant in signs.py:5
+        3 
+        4 def is_zero(n: int) -> bool:
+        5     return n == -1
+        """  # noqa: W291
+    )
+    assert result.stderr == ""
+    assert result.exit_code == 0
+
+
+def test_cli_run_cache(project_path: Path) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    args = ["--line-limit", "1", "--cache", "-p", str(project_path), "run"]
+
+    result = cli_runner.invoke(cli, args)
+    assert "Reused 0 cached results" in result.stdout
+    assert "Surviving mutant in code.py:3" in result.stdout
+    assert result.exit_code == 0
+
+    result = cli_runner.invoke(cli, args)
+    assert result.stdout.rstrip("\n") == _dedent(
+        """
+        Running baseline tests ..
+        Running tests
+        Tested 3 mutations
+        Reused 3 cached results
+
+        Surviving (cached) mutant in code.py:3
+        1 from typing import List
+        2 
+        3 def grep(lines: List[str], line: str, context: int = -1) -> List[str]:
+        4     index = lines.index(line)
+        5     start = max(0, index - context)
+        """  # noqa: W291
+    )
+    assert result.stderr == ""
+    assert result.exit_code == 0
+
+    (project_path / "test_code.py").write_text(
+        (project_path / "test_code.py").read_text() + "\n"
+    )
+    result = cli_runner.invoke(cli, args)
+    assert "Reused 0 cached results" in result.stdout
+
+
+def test_cli_run_resume(project_path: Path) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    args = ["--line-limit", "1", "-p", str(project_path), "run"]
+
+    expected = cli_runner.invoke(cli, args).stdout
+
+    # interrupted after the first mutation, while writing the second one
+    journal_path = project_path / ".radiation" / "journal.jsonl"
+    first, second, *_ = journal_path.read_text().splitlines(keepends=True)
+    journal_path.write_text(first + second[:10])
+
+    result = cli_runner.invoke(cli, [*args, "--resume"])
+    assert result.stdout == expected.replace(
+        "Tested 3 mutations\n",
+        "Tested 2 mutations\nSkipped 1 mutations tested before resuming\n",
+    )
+    assert result.stderr == ""
+    assert result.exit_code == 0
+    assert len(journal_path.read_text().splitlines()) == 3
+
+
+def test_cli_run_shards_and_merge(project_path: Path) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    journal_path = project_path / ".radiation" / "journal.jsonl"
+
+    tested = 0
+    for shard in ["1/2", "2/2"]:
+        result = cli_runner.invoke(
+            cli, ["-p", str(project_path), "run", "--shard", shard]
+        )
+        assert result.exit_code == 0
+        tested += int(result.stdout.split("Tested ")[1].split()[0])
+        journal_path.rename(project_path / f"journal-{shard[0]}.jsonl")
+    assert tested == 9
+
+    result = cli_runner.invoke(
+        cli,
+        ["-p", str(project_path), "merge"]
+        + [str(project_path / f"journal-{index}.jsonl") for index in [1, 2]]
+        + ["-o", str(project_path / "merged.jsonl")],
+    )
+    assert result.stdout.rstrip("\n") == _dedent(
+        """
+        Merged 2 journals
+        Tested 9 mutations
+
+        Surviving mutant in code.py:3
+        1 from typing import List
+        2 
+        3 def grep(lines: List[str], line: str, context: int = -1) -> List[str]:
+        4     index = lines.index(line)
+        5     start = max(0, index - context)
+
+        Surviving mutant in code.py:3
+        1 from typing import List
+        2 
+        3 def grep(lines: List[str], line: str, context: int = 1) -> List[str]:
+        4     index = lines.index(line)
+        5     start = max(0, index - context)
+        """  # noqa: W291
+    )
+    assert result.stderr == ""
+    assert result.exit_code == 0
+    assert len((project_path / "merged.jsonl").read_text().splitlines()) == 9
+
+
+def test_cli_merge_incomplete_shards(project_path: Path) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(cli, ["-p", str(project_path), "run", "--shard", "1/2"])
+    assert result.exit_code == 0
+    journal_path = project_path / ".radiation" / "journal.jsonl"
+    assert all(
+        entry["shard"] == "1/2" for entry in map(json.loads, journal_path.open())
+    )
+
+    result = cli_runner.invoke(
+        cli, ["-p", str(project_path), "merge", str(journal_path), str(journal_path)]
+    )
+    assert result.stderr == (
+        "Warning: shard 1/2 is in 2 journals\n"
+        "Warning: no results of shard 2/2, the report is incomplete unless they"
+        " had no mutations\n"
+    )
+    assert result.exit_code == 0
+
+
+def test_cli_run_invalid_shard(project_path: Path) -> None:
+    cli_runner = CliRunner(mix_stderr=False)
+    result = cli_runner.invoke(cli, ["-p", str(project_path), "run", "--shard", "3/2"])
+    assert "Invalid value for '--shard'" in result.stderr
+    assert result.exit_code == 2